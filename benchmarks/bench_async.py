@@ -0,0 +1,92 @@
+"""
+Benchmark per-call tracking overhead inside a busy asyncio loop.
+
+Runs 10k concurrent fake LLM calls that each record a metric through
+``send_metric``, once with the asyncio-native client and once with the
+thread-based client, and reports the caller-side cost per call plus the
+worst event-loop stall observed by a ticker task.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_async.py [concurrency]
+"""
+import asyncio
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from bench_batching import _StubHandler
+
+from spend_hawk.async_client import get_async_client
+from spend_hawk.client import client
+from spend_hawk.config import config
+from spend_hawk.providers.base import send_metric
+
+
+async def _fake_call(overheads: list):
+    await asyncio.sleep(0.001)  # Stand-in for the provider round trip
+    start = time.perf_counter_ns()
+    send_metric("openai", "gpt-4o", 120, 30, 250)
+    overheads.append(time.perf_counter_ns() - start)
+
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    interval = 0.001
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - expected)
+
+
+async def _run(concurrency: int):
+    overheads: list = []
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(_fake_call(overheads) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    async_client = get_async_client()
+    if config.async_transport:
+        await async_client.flush()
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, client.flush)
+    
+    stop.set()
+    await ticker
+    overheads.sort()
+    return elapsed, overheads, max(lags) if lags else 0.0
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config.api_key = "bench"
+    config.api_endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    config.max_queue_size = 0
+    
+    # Warm up pricing so both runs measure steady state
+    send_metric("openai", "gpt-4o", 1, 1, 1)
+    client.flush()
+    
+    print(f"{concurrency} concurrent calls per run")
+    for label, use_async in (("thread client", False), ("asyncio client", True)):
+        config.async_transport = use_async
+        elapsed, overheads, max_lag = asyncio.run(_run(concurrency))
+        p50 = overheads[len(overheads) // 2] / 1000
+        p99 = overheads[int(len(overheads) * 0.99)] / 1000
+        print(
+            f"  {label:<15} total {elapsed * 1000:7.1f} ms  "
+            f"send_metric p50 {p50:6.1f} us  p99 {p99:7.1f} us  "
+            f"max loop stall {max_lag * 1000:6.2f} ms"
+        )
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
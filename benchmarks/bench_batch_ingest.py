@@ -0,0 +1,139 @@
+"""
+Benchmark ingestion of batch result files.
+
+Writes synthetic OpenAI Batch API and Anthropic Message Batches result
+files (a few percent of requests failed) and ingests each with
+``ingest_batch_results``. The client's queue is replaced by a sink that
+discards records, so the numbers cover reading, parsing, pricing and
+record creation, not export. Peak RSS is reported to show that memory
+stays flat however long the file is.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_batch_ingest.py [lines]
+"""
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from spend_hawk import pricing
+from spend_hawk.batches import ingest_batch_results
+from spend_hawk.client import client
+from spend_hawk.config import config
+
+OPENAI_MODELS = ["gpt-4o-mini-2024-07-18", "gpt-4o-2024-08-06", "text-embedding-3-small"]
+ANTHROPIC_MODELS = ["claude-3-5-haiku-20241022", "claude-3-5-sonnet-20241022"]
+TEXT = "The quick brown fox jumps over the lazy dog. " * 8
+
+
+class _Sink:
+    """Queue stand-in that drops everything put on it."""
+
+    def put(self, item, block=True, timeout=None):
+        pass
+
+    put_nowait = put
+
+
+def _openai_line(rng: random.Random, i: int) -> dict:
+    if rng.random() < 0.02:
+        return {"id": f"batch_req_{i}", "custom_id": f"request-{i}",
+                "response": {"status_code": 429, "body": {}}, "error": None}
+    prompt, completion = rng.randrange(50, 4000), rng.randrange(1, 800)
+    return {
+        "id": f"batch_req_{i}",
+        "custom_id": f"request-{i}",
+        "response": {
+            "status_code": 200,
+            "request_id": f"req_{i:032x}",
+            "body": {
+                "id": f"chatcmpl-{i}",
+                "object": "chat.completion",
+                "created": 1760000000,
+                "model": rng.choice(OPENAI_MODELS),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": TEXT},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt,
+                    "completion_tokens": completion,
+                    "total_tokens": prompt + completion,
+                    "prompt_tokens_details": {"cached_tokens": rng.choice((0, 0, 1024)), "audio_tokens": 0},
+                    "completion_tokens_details": {"reasoning_tokens": 0, "audio_tokens": 0},
+                },
+            },
+        },
+        "error": None,
+    }
+
+
+def _anthropic_line(rng: random.Random, i: int) -> dict:
+    if rng.random() < 0.02:
+        return {"custom_id": f"request-{i}", "result": {"type": "expired"}}
+    return {
+        "custom_id": f"request-{i}",
+        "result": {
+            "type": "succeeded",
+            "message": {
+                "id": f"msg_{i:024x}",
+                "type": "message",
+                "role": "assistant",
+                "model": rng.choice(ANTHROPIC_MODELS),
+                "content": [{"type": "text", "text": TEXT}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": rng.randrange(50, 4000),
+                    "output_tokens": rng.randrange(1, 800),
+                    "cache_creation_input_tokens": 0,
+                    "cache_read_input_tokens": rng.choice((0, 0, 2048)),
+                },
+            },
+        },
+    }
+
+
+def _write(path: str, make_line, lines: int):
+    rng = random.Random(0)
+    with open(path, "w") as f:
+        for i in range(lines):
+            f.write(json.dumps(make_line(rng, i)))
+            f.write("\n")
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    config.api_key = "bench"
+    client.queue = _Sink()
+    client.start_worker = lambda: None  # Measure ingestion only, not sending
+    pricing.init_pricing(background=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_line in (("openai", _openai_line), ("anthropic", _anthropic_line)):
+            path = os.path.join(tmp, f"{name}.jsonl")
+            _write(path, make_line, lines)
+            size_mb = os.path.getsize(path) / 1e6
+            rss_before = _peak_rss_mb()
+
+            start = time.perf_counter()
+            stats = ingest_batch_results(path)
+            elapsed = time.perf_counter() - start
+
+            print(f"{name:9} {lines} lines ({size_mb:.0f} MB): {elapsed:6.2f} s, "
+                  f"{lines / elapsed / 1000:6.0f}k lines/s, "
+                  f"{stats['tracked']} tracked, ${stats['cost']:.2f}, "
+                  f"peak RSS +{_peak_rss_mb() - rss_before:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
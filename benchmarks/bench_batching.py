@@ -0,0 +1,91 @@
+"""
+Benchmark MetricsClient throughput against a local stub backend.
+
+Compares one POST per metric (batch_size=1) with batched uploads.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_batching.py [num_metrics]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from spend_hawk.client import MetricsClient
+from spend_hawk.config import config
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Accepts metric POSTs and counts how many metrics arrived."""
+    
+    protocol_version = "HTTP/1.1"
+    received = 0
+    lock = threading.Lock()
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        count = len(body["metrics"]) if "metrics" in body else 1
+        with _StubHandler.lock:
+            _StubHandler.received += count
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _metric(i: int) -> dict:
+    return {
+        "provider": "openai",
+        "model": "gpt-4o",
+        "input_tokens": 100 + i % 50,
+        "output_tokens": 20,
+        "cost": 0.0008,
+        "latency_ms": 420,
+        "timestamp": "2026-01-01T00:00:00+00:00",
+        "project_id": "bench",
+        "agent": "bench",
+    }
+
+
+def run(num_metrics: int, batch_size: int) -> float:
+    """Queue ``num_metrics`` and return metrics/sec until fully flushed."""
+    _StubHandler.received = 0
+    config.batch_size = batch_size
+    config.linger_ms = 50
+    
+    client = MetricsClient()
+    start = time.perf_counter()
+    for i in range(num_metrics):
+        client.send_async(_metric(i))
+    client.flush()
+    elapsed = time.perf_counter() - start
+    client.shutdown()
+    
+    assert _StubHandler.received == num_metrics, _StubHandler.received
+    return num_metrics / elapsed
+
+
+def main():
+    num_metrics = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    config.api_key = "bench"
+    config.api_endpoint = endpoint
+    
+    print(f"{num_metrics} metrics against {endpoint}")
+    for batch_size in (1, 10, 100, 500):
+        rate = run(num_metrics, batch_size)
+        print(f"  batch_size={batch_size:<4} {rate:>12,.0f} metrics/sec")
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark bulk cost calculation against a loop over calculate_cost.
+
+Builds synthetic usage columns over a realistic model mix (dated ids,
+aliases, a long-context tiered model and unknown models) and re-costs
+them both ways. With NumPy installed the bulk path is vectorized; without
+it the pure-Python fallback is measured.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_bulk_costs.py [rows]
+"""
+import random
+import sys
+import time
+
+from spend_hawk import bulk, pricing
+
+MODELS = [
+    "gpt-4o", "gpt-4o-2024-08-06", "gpt-4o-mini", "gpt-4o-mini-2024-07-18",
+    "gpt-4-turbo", "gpt-3.5-turbo-0125", "claude-3-5-sonnet-20241022",
+    "claude-3-5-haiku-latest", "claude-3-opus-20240229", "gemini-1.5-pro",
+    "models/gemini-1.5-flash-002", "my-finetune", None,
+]
+
+
+def _columns(rows: int):
+    rng = random.Random(0)
+    models = [rng.choice(MODELS) for _ in range(rows)]
+    inputs = [rng.randrange(10, 200_000) for _ in range(rows)]
+    outputs = [rng.randrange(1, 4_000) for _ in range(rows)]
+    return models, inputs, outputs
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    pricing.init_pricing(background=False)
+    models, inputs, outputs = _columns(rows)
+    np = bulk._numpy()
+    
+    start = time.perf_counter()
+    scalar = [pricing.calculate_cost(m, i, o) for m, i, o in zip(models, inputs, outputs)]
+    scalar_s = time.perf_counter() - start
+    
+    columns = (models, inputs, outputs)
+    if np is not None:
+        columns = (np.array(models, dtype=object), np.array(inputs), np.array(outputs))
+    
+    start = time.perf_counter()
+    costs = bulk.calculate_costs(*columns)
+    bulk_s = time.perf_counter() - start
+    
+    # np.round and round() may break ties differently in the 6th decimal
+    mismatches = sum(1 for a, b in zip(scalar, costs) if abs(a - b) > 1.5e-6)
+    mode = "numpy" if np is not None else "pure python"
+    print(f"{rows:,} rows, {len(MODELS)} distinct models")
+    print(f"  calculate_cost loop  {scalar_s:8.2f} s  {scalar_s / rows * 1e9:7.1f} ns/row")
+    print(f"  calculate_costs      {bulk_s:8.2f} s  {bulk_s / rows * 1e9:7.1f} ns/row  ({mode})")
+    print(f"  speedup              {scalar_s / bulk_s:8.1f}x, {mismatches} mismatched rows")
+
+
+if __name__ == "__main__":
+    main()
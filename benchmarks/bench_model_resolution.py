@@ -0,0 +1,64 @@
+"""
+Benchmark model-name resolution against a large pricing table.
+
+Builds a synthetic table of several thousand models, then resolves a mix
+of exact, dated, path-prefixed and unknown names. The first pass measures
+uncached resolution (normalize, suffix strip, trie walk); later passes
+are served from the LRU cache.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_model_resolution.py [table_size]
+"""
+import sys
+import time
+
+from spend_hawk.model_index import ModelIndex
+
+
+def _table(size: int):
+    table = {}
+    for i in range(size):
+        table[f"vendor{i % 50}-model-{i}"] = {"input": 0.001, "output": 0.002}
+        table[f"vendor{i % 50}-model-{i}-20240101"] = {"input": 0.001, "output": 0.002}
+    return table
+
+
+def _names(size: int):
+    names = []
+    for i in range(0, size, 7):
+        names.append(f"vendor{i % 50}-model-{i}")
+        names.append(f"vendor{i % 50}-model-{i}-2024-08-06")
+        names.append(f"models/vendor{i % 50}-model-{i}-002")
+        names.append(f"unknown-{i}")
+    return names
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    table = _table(size)
+    names = _names(size)
+    
+    start = time.perf_counter()
+    index = ModelIndex(table, cache_size=len(names) * 2)
+    build = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for name in names:
+        index.resolve(name)
+    cold = (time.perf_counter() - start) / len(names)
+    
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            index.resolve(name)
+    warm = (time.perf_counter() - start) / (len(names) * rounds)
+    
+    print(f"{len(table)} pricing entries, {len(names)} distinct names")
+    print(f"  index build       {build * 1000:8.1f} ms")
+    print(f"  uncached resolve  {cold * 1e6:8.2f} us/lookup")
+    print(f"  cached resolve    {warm * 1e6:8.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
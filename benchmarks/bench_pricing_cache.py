@@ -0,0 +1,63 @@
+"""
+Benchmark loading the on-disk pricing cache at process start.
+
+Writes a synthetic table in the JSON format of earlier releases and in the
+current binary format, then times reading each back, and building the
+full snapshot (read-only table and model index) from the binary cache.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pricing_cache.py [models]
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from spend_hawk import pricing
+
+
+def _table(size: int):
+    return {
+        f"vendor{i % 20}-model-{i}": {"input": 0.001 * (i % 7 + 1), "output": 0.002, "cached_input": 0.0005}
+        for i in range(size)
+    }
+
+
+def _time(fn, rounds: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    table = _table(size)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pricing.CACHE_DIR = tmp
+        pricing.CACHE_FILE = tmp / "pricing.bin"
+        pricing.LEGACY_CACHE_FILE = tmp / "pricing.json"
+        
+        pricing.LEGACY_CACHE_FILE.write_text(
+            json.dumps({"pricing": table, "cached_at": time.time()}, indent=2)
+        )
+        json_read = _time(pricing._read_cache_file)
+        
+        pricing._save_pricing_to_cache(pricing.PricingSnapshot(table, "backend", time.time()))
+        binary_read = _time(pricing._read_cache_file)
+        snapshot = _time(lambda: pricing._snapshot_from_cache(pricing._read_cache_file()), rounds=50)
+        
+        json_size = pricing.LEGACY_CACHE_FILE.stat().st_size
+        binary_size = pricing.CACHE_FILE.stat().st_size
+    
+    print(f"{size} models")
+    print(f"  json cache     {json_size / 1024:8.1f} KiB  read {json_read * 1e6:8.1f} us")
+    print(f"  binary cache   {binary_size / 1024:8.1f} KiB  read {binary_read * 1e6:8.1f} us")
+    print(f"  binary cache -> snapshot (table + index)  {snapshot * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the first calculate_cost() in a fresh process.
+
+Each scenario runs in a new interpreter with an empty HOME (no disk cache)
+and the pricing API pointed at a local stub that takes ``delay`` seconds
+to answer, mimicking a slow or firewalled network.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pricing_cold_start.py [delay_seconds]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHILD = """
+import time, sys
+start = time.perf_counter()
+from spend_hawk import pricing
+pricing.PRICING_API_URL = sys.argv[1]
+if sys.argv[2] == "blocking":
+    pricing.init_pricing(background=False)
+pricing.calculate_cost("gpt-4o", 1000, 1000)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+class _SlowPricingHandler(BaseHTTPRequestHandler):
+    delay = 2.0
+    
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = json.dumps({"gpt-4o": {"input": 0.0025, "output": 0.01}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _first_call_ms(url: str, mode: str) -> float:
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "HOME": home}
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, url, mode],
+            env=env, capture_output=True, text=True, check=True
+        )
+    return float(out.stdout.strip())
+
+
+def main():
+    _SlowPricingHandler.delay = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowPricingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/pricing"
+    
+    print(f"pricing API answering after {_SlowPricingHandler.delay:.1f}s, no disk cache")
+    for mode in ("blocking", "background"):
+        print(f"  {mode:<10} first calculate_cost after {_first_call_ms(url, mode):8.1f} ms")
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark per-call overhead of the provider wrappers.
+
+Calls the sync and async OpenAI chat and embeddings wrappers around a fake
+``create`` that returns a canned response immediately, so the difference from calling the
+fake directly is the SDK's own overhead (timing, usage extraction, costing
+and enqueueing the metric). No network I/O happens.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_providers.py [iterations]
+"""
+import asyncio
+import sys
+import time
+from queue import Queue
+from types import SimpleNamespace
+
+from spend_hawk.async_client import get_async_client
+from spend_hawk.client import client
+from spend_hawk.config import config
+from spend_hawk.pricing import get_pricing
+from spend_hawk.providers import openai as openai_provider
+
+RESPONSE = SimpleNamespace(
+    model="gpt-4o",
+    usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+)
+
+EMBEDDING = SimpleNamespace(
+    model="text-embedding-3-small",
+    usage=SimpleNamespace(prompt_tokens=64, total_tokens=64),
+)
+
+
+def _fake_create(self, *args, **kwargs):
+    return RESPONSE
+
+
+async def _fake_async_create(self, *args, **kwargs):
+    return RESPONSE
+
+
+def _bench_sync(n: int) -> float:
+    """Return wrapper overhead per call in microseconds."""
+    patched_create = openai_provider.CHAT.wrap(_fake_create)
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        _fake_create(None)
+    raw = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        patched_create(None)
+    wrapped = time.perf_counter() - start
+    
+    return (wrapped - raw) / n * 1e6
+
+
+async def _bench_async(n: int) -> float:
+    """Return wrapper overhead per call in microseconds."""
+    patched_create = openai_provider.CHAT.wrap(_fake_async_create, is_async=True)
+    get_async_client().transport.post = None  # Never flushed during the run
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        await _fake_async_create(None)
+    raw = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        await patched_create(None)
+    wrapped = time.perf_counter() - start
+    
+    return (wrapped - raw) / n * 1e6
+
+
+def _fake_embed(self, *args, **kwargs):
+    return EMBEDDING
+
+
+async def _fake_async_embed(self, *args, **kwargs):
+    return EMBEDDING
+
+
+def _bench_embeddings(n: int) -> float:
+    """Return embeddings wrapper overhead per call in microseconds."""
+    wrapped_embed = openai_provider.EMBEDDINGS.wrap(_fake_embed)
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        _fake_embed(None)
+    raw = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        wrapped_embed(None)
+    wrapped = time.perf_counter() - start
+    
+    return (wrapped - raw) / n * 1e6
+
+
+async def _bench_async_embeddings(n: int) -> float:
+    """Return async embeddings wrapper overhead per call in microseconds."""
+    wrapped_embed = openai_provider.EMBEDDINGS.wrap(_fake_async_embed, is_async=True)
+    get_async_client().transport.post = None
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        await _fake_async_embed(None)
+    raw = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(n):
+        await wrapped_embed(None)
+    wrapped = time.perf_counter() - start
+    
+    return (wrapped - raw) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    config.api_key = "bench"
+    config.max_queue_size = 0
+    config.batch_size = n + 1
+    config.linger_ms = 3_600_000
+    client.queue = Queue()
+    client.start_worker = lambda: None  # Measure enqueue only, not sending
+    get_pricing()
+    
+    print(f"{n} calls per path")
+    print(f"  sync  wrapper overhead {_bench_sync(n):6.2f} us/call")
+    print(f"  async wrapper overhead {asyncio.run(_bench_async(n)):6.2f} us/call")
+    print(f"  sync  embeddings overhead {_bench_embeddings(n):6.2f} us/call")
+    print(f"  async embeddings overhead {asyncio.run(_bench_async_embeddings(n)):6.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure memory held by queued metrics.
+
+Queues N metrics the way send_metric did before (a 9-key dict with an
+ISO timestamp string and a fresh model string per call) and the way it
+does now (a MetricRecord with __slots__), and reports traced memory and
+bytes per queued metric.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_record_memory.py [num_metrics]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from spend_hawk.context import capture_context, set_context
+from spend_hawk.records import MetricRecord
+from spend_hawk.utils import get_timestamp
+
+
+def _model_name() -> str:
+    # Provider SDKs decode a new string object for every response
+    return "".join(["gpt-4o-", "2024-08-06"])
+
+
+def _dict_metric(i: int):
+    return {
+        "provider": "openai",
+        "model": _model_name(),
+        "input_tokens": 100 + i % 1000,
+        "output_tokens": 20 + i % 500,
+        "cost": 0.00065,
+        "latency_ms": 420 + i % 100,
+        "timestamp": get_timestamp(),
+        "project_id": "bench",
+        "agent": "bench",
+    }
+
+
+def _record_metric(i: int):
+    return MetricRecord(
+        "openai",
+        _model_name(),
+        100 + i % 1000,
+        20 + i % 500,
+        420 + i % 100,
+        capture_context(),
+    )
+
+
+def _measure(factory, n: int):
+    gc.collect()
+    tracemalloc.start()
+    queue = deque()
+    start = time.perf_counter()
+    for i in range(n):
+        queue.append(factory(i))
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return current, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    set_context(project_id="bench", agent="bench")
+    
+    print(f"{n:,} queued metrics")
+    for label, factory in (("dict (before)", _dict_metric), ("MetricRecord", _record_metric)):
+        current, elapsed = _measure(factory, n)
+        print(
+            f"  {label:<14} {current / 2**20:8.1f} MiB  "
+            f"{current / n:6.0f} B/metric  built in {elapsed:5.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
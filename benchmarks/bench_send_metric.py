@@ -0,0 +1,67 @@
+"""
+Microbenchmark the caller-side cost of recording one metric.
+
+Compares building the full metric on the calling thread (context dict,
+cost lookup, ISO timestamp, payload dict) with what ``send_metric`` does
+now: capture a raw MetricRecord and enqueue it. The background worker is
+disabled, so only the caller's share is measured.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_send_metric.py [iterations]
+"""
+import sys
+import time
+from queue import Queue
+
+from spend_hawk.client import client
+from spend_hawk.config import config
+from spend_hawk.context import get_context, set_context
+from spend_hawk.pricing import get_pricing
+from spend_hawk.providers.base import send_metric
+from spend_hawk.utils import calculate_cost, get_timestamp
+
+
+def _eager_send_metric(provider, model, input_tokens, output_tokens, latency_ms, **extra_fields):
+    """The caller-side work send_metric used to do before enqueueing."""
+    ctx = get_context()
+    cost = calculate_cost(provider, model, input_tokens, output_tokens)
+    metric = {
+        "provider": provider,
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost": cost,
+        "latency_ms": latency_ms,
+        "timestamp": get_timestamp(),
+        "project_id": ctx.get('project_id') or config.project_id,
+        "agent": ctx.get('agent') or config.agent,
+        **extra_fields
+    }
+    client.send_async(metric)
+
+
+def _per_call_ns(fn, n: int) -> float:
+    client.queue = Queue()
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        fn("openai", "gpt-4o", 120, 30, 250)
+    return (time.perf_counter_ns() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    
+    config.api_key = "bench"
+    client.start_worker = lambda: None  # Measure the caller thread only
+    set_context(project_id="bench", agent="bench", team="perf")
+    get_pricing()
+    
+    eager = _per_call_ns(_eager_send_metric, n)
+    deferred = _per_call_ns(send_metric, n)
+    print(f"{n} calls")
+    print(f"  eager build on caller   {eager / 1000:6.2f} us/call")
+    print(f"  deferred raw record     {deferred / 1000:6.2f} us/call  ({eager / deferred:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
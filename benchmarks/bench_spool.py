@@ -0,0 +1,46 @@
+"""
+Benchmark spool append throughput.
+
+Appends N records to a fresh spool in a temp directory (buffered writes,
+4 MiB segments) and reports appends/sec and time per append, with and
+without a flush after every 100 records as the worker would do.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_spool.py [num_records]
+"""
+import sys
+import tempfile
+import time
+
+from spend_hawk.records import MetricRecord
+from spend_hawk.spool import Spool
+
+
+def _run(n: int, flush_every: int) -> float:
+    records = [
+        MetricRecord("openai", "gpt-4o", 100 + i % 1000, 20, 300, ("bench", "bench", {}))
+        for i in range(n)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        spool = Spool(directory, segment_bytes=4 * 1024 * 1024, max_bytes=1024 ** 3)
+        start = time.perf_counter()
+        for i, record in enumerate(records):
+            spool.append(record)
+            if flush_every and i % flush_every == 0:
+                spool.flush()
+        spool.flush()
+        elapsed = time.perf_counter() - start
+        spool.close()
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(f"{n:,} appends")
+    for label, flush_every in (("buffered", 0), ("flush/100", 100)):
+        elapsed = _run(n, flush_every)
+        print(f"  {label:<10} {n / elapsed:>12,.0f} appends/sec  {elapsed / n * 1e6:5.2f} us/append")
+
+
+if __name__ == "__main__":
+    main()
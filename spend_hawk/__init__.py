@@ -3,12 +3,12 @@
 """
 Spend Hawk SDK - LLM Cost Tracking
 
-Track your OpenAI, Anthropic, and Google Generative AI costs automatically with minimal overhead.
+Track your OpenAI, Anthropic, Google Generative AI, Mistral and Cohere costs automatically with minimal overhead.
 
 Usage:
     import spend_hawk
     
-    # Initialize (patches OpenAI, Anthropic, and Google)
+    # Initialize (patches OpenAI, Anthropic, Google, Mistral and Cohere)
     spend_hawk.patch_all()
     
     # Set context (optional)
@@ -26,10 +26,44 @@ Usage:
 
 __version__ = "0.1.2"
 
-from .patch import patch_all, unpatch_all
 from .context import set_context, get_context, context
 from .config import config
-from .pricing import init_pricing, get_pricing, calculate_cost, refresh_pricing
+
+# Everything else is imported on first access, so ``import spend_hawk``
+# stays cheap: the HTTP stack, provider modules and the background client
+# load only when patching, pricing or sending actually needs them
+_LAZY_EXPORTS = {
+    'patch_all': '.patch',
+    'unpatch_all': '.patch',
+    'init_pricing': '.pricing',
+    'get_pricing': '.pricing',
+    'get_pricing_snapshot': '.pricing',
+    'calculate_cost': '.pricing',
+    'refresh_pricing': '.pricing',
+    'resolve_model': '.pricing',
+    'calculate_costs': '.bulk',
+    'ingest_batch_results': '.batches',
+    'get_stats': '.client',
+    'aflush': '.async_client',
+    'get_latency_quantiles': '.sketch',
+    'get_telemetry': '.telemetry',
+    'render_prometheus': '.telemetry',
+    'start_metrics_server': '.telemetry',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     'patch_all',
@@ -40,6 +74,16 @@ __all__ = [
     'config',
     'init_pricing',
     'get_pricing',
+    'get_pricing_snapshot',
     'calculate_cost',
+    'calculate_costs',
+    'ingest_batch_results',
     'refresh_pricing',
+    'resolve_model',
+    'get_stats',
+    'aflush',
+    'get_latency_quantiles',
+    'get_telemetry',
+    'render_prometheus',
+    'start_metrics_server',
 ]
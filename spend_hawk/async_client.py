@@ -0,0 +1,266 @@
+"""Asyncio-native metrics client for applications running an event loop."""
+import asyncio
+import logging
+import os
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Set
+
+from .config import config
+from .records import as_payload
+from .sketch import latency_sketches
+from .telemetry import batch_sizes, export_seconds
+from .client import SENT, REJECTED, RETRY, CircuitBreaker, _backoff, _parse_retry_after, get_client
+from .transport import AsyncTransport, TransportError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMetricsClient:
+    """
+    Batches metrics on the running event loop and flushes them with a
+    non-blocking transport.
+
+    ``send`` only appends to an in-memory buffer and, at most, schedules a
+    task, so calling it from a coroutine never blocks the loop. A batch is
+    flushed once it reaches ``config.batch_size`` or ``config.linger_ms``
+    after its first metric.
+
+    One instance belongs to one event loop; use ``get_async_client()``.
+    The client only holds a weak reference to its loop, so that it never
+    keeps its own ``_clients`` entry alive.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = weakref.ref(loop)
+        self.transport = AsyncTransport()
+        self.buffer: List[Any] = []
+        self._linger_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight = 0
+        self.breaker = CircuitBreaker(
+            config.circuit_failure_threshold,
+            config.circuit_reset_timeout_s
+        )
+
+        # Backpressure counters, read through stats()
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop this client belongs to."""
+        loop = self._loop()
+        if loop is None:
+            raise RuntimeError("Event loop of this metrics client is gone")
+        return loop
+
+    def send(self, metric):
+        """
+        Buffer a metric for sending. Must be called on the client's loop.
+
+        Args:
+            metric: MetricRecord or metric dict to send
+        """
+        if not config.is_configured():
+            logger.debug("Spend Hawk not configured, skipping metric")
+            return
+
+        if config.max_queue_size > 0 and len(self.buffer) + self._in_flight >= config.max_queue_size:
+            self.dropped += 1
+            return
+
+        self.buffer.append(metric)
+        self.enqueued += 1
+
+        if len(self.buffer) >= config.batch_size:
+            self._flush_buffer()
+        elif self._linger_handle is None:
+            self._linger_handle = self.loop.call_later(
+                config.linger_ms / 1000.0, self._flush_buffer
+            )
+
+    def _flush_buffer(self):
+        """Hand the current buffer to a background send task."""
+        if self._linger_handle is not None:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+
+        if not self.buffer:
+            return
+
+        batch, self.buffer = self.buffer, []
+        self._in_flight += len(batch)
+        task = self.loop.create_task(self._send_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, records: List[Any]):
+        """
+        Record latency, price, enrich and send a batch, retrying with
+        backoff by sleeping on the loop.
+
+        Args:
+            records: Buffered MetricRecords or metric dicts
+        """
+        try:
+            latency_sketches.add_records(records)
+            batch = [as_payload(record) for record in records]
+            attempt = 0
+            while True:
+                if not self.breaker.allow():
+                    await asyncio.sleep(self.breaker.time_until_probe())
+                    continue
+
+                outcome, retry_after = await self._send_once(batch)
+
+                if outcome == SENT:
+                    self.breaker.record_success()
+                    self.sent += len(batch)
+                    return
+                if outcome == REJECTED:
+                    self.failed += len(batch)
+                    return
+
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt >= config.max_retries:
+                    logger.error(f"Failed to send {len(batch)} metric(s) after {attempt} attempts")
+                    self.failed += len(batch)
+                    return
+
+                self.retries += 1
+                await asyncio.sleep(retry_after if retry_after is not None else _backoff(attempt - 1))
+        except Exception as e:
+            logger.error(f"Error in async metrics sender: {e}", exc_info=True)
+        finally:
+            self._in_flight -= len(records)
+
+    async def _send_once(self, batch: List[Dict[str, Any]]):
+        """
+        Make a single send attempt.
+
+        Args:
+            batch: Metrics to send
+
+        Returns:
+            Tuple of (outcome, retry_after) as in ``MetricsClient._send_once``
+        """
+        try:
+            started = time.perf_counter()
+            response = await self.transport.post(
+                "/api/v1/metrics/batch", {"metrics": batch}, timeout=5.0
+            )
+            export_seconds.observe(time.perf_counter() - started)
+            batch_sizes.observe(len(batch))
+
+            if response.status_code == 200 or response.status_code == 201:
+                logger.debug(f"Successfully sent {len(batch)} metric(s)")
+                return SENT, None
+            elif response.status_code == 401:
+                logger.error("Invalid Spend Hawk API key")
+                return REJECTED, None  # Don't retry auth errors
+            elif response.status_code in (429, 503):
+                logger.warning(f"Backend throttling metrics: HTTP {response.status_code}")
+                return RETRY, _parse_retry_after(response.headers.get("Retry-After"))
+            else:
+                logger.warning(f"Failed to send metrics: HTTP {response.status_code}")
+                return RETRY, None
+
+        except TransportError as e:
+            logger.warning(f"Network error sending metrics: {e}")
+            return RETRY, None
+        except Exception as e:
+            logger.error(f"Unexpected error sending metrics: {e}", exc_info=True)
+            return REJECTED, None  # Don't retry unexpected errors
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get buffer depth and backpressure counters.
+
+        Returns:
+            Dictionary with the same counter names as ``MetricsClient.stats``
+        """
+        return {
+            "queue_depth": len(self.buffer) + self._in_flight,
+            "queue_max_size": config.max_queue_size,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "circuit_state": self.breaker.state,
+        }
+
+    async def flush(self):
+        """Send everything buffered and wait for in-flight batches."""
+        self._flush_buffer()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def aclose(self):
+        """Flush remaining metrics and close the transport."""
+        await self.flush()
+        await self.transport.aclose()
+
+
+# One client per event loop; entries go away with their loop, and are
+# pruned once it is closed, whichever comes first
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMetricsClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# A forked child has none of the parent's loops running
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clients.clear)
+
+
+def get_async_client() -> Optional[AsyncMetricsClient]:
+    """
+    Get the async client for the running event loop.
+
+    Returns:
+        The loop's AsyncMetricsClient, or None when no loop is running in
+        this thread
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    async_client = _clients.get(loop)
+    if async_client is None:
+        _prune_closed_loops()
+        async_client = _clients[loop] = AsyncMetricsClient(loop)
+    return async_client
+
+
+def _prune_closed_loops():
+    """
+    Drop the clients of closed loops, handing their unsent metrics to the
+    background thread.
+
+    A loop that closed with a linger timer still pending (e.g. at the end
+    of ``asyncio.run``) never flushed its buffer, and stays referenced by
+    that timer, so its entry would otherwise outlive it.
+    """
+    for loop in [loop for loop in list(_clients.keys()) if loop.is_closed()]:
+        async_client = _clients.pop(loop, None)
+        if async_client is None:
+            continue
+        if async_client._linger_handle is not None:
+            async_client._linger_handle.cancel()
+            async_client._linger_handle = None
+        batch, async_client.buffer = async_client.buffer, []
+        for metric in batch:
+            get_client().send_async(metric)
+
+
+async def aflush():
+    """Flush metrics buffered on the running event loop."""
+    async_client = get_async_client()
+    if async_client is not None:
+        await async_client.flush()
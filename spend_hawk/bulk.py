@@ -0,0 +1,144 @@
+"""Column-wise cost calculation for backfills and offline recompute."""
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .pricing import get_pricing_snapshot
+from .rates import rate_schedule
+
+# (input rate, output rate, tiers) per token, as from rate_schedule
+Schedule = Tuple[float, float, List[Tuple[int, float, float]]]
+
+_NO_RATES: Schedule = (0.0, 0.0, [])
+
+
+def _numpy():
+    """NumPy, if installed; imported on first use to keep SDK import cheap."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _schedules(models: Iterable[Any]) -> Dict[Any, Schedule]:
+    """Resolve each distinct model string once to its rates."""
+    index = get_pricing_snapshot().index
+    return {
+        model: rate_schedule(index.lookup(model)) if isinstance(model, str) else _NO_RATES
+        for model in models
+    }
+
+
+def _is_arrow(column: Any) -> bool:
+    return type(column).__module__.startswith("pyarrow")
+
+
+def _encode_models(np, models: Any):
+    """
+    Factorize the model column.
+
+    Returns:
+        Tuple of (distinct models, row codes into them)
+    """
+    if _is_arrow(models):
+        if hasattr(models, "combine_chunks"):
+            models = models.combine_chunks()
+        encoded = models.dictionary_encode()
+        uniques = encoded.dictionary.to_pylist()
+        # Null models get their own code past the end of the dictionary
+        codes = encoded.indices.fill_null(len(uniques)).to_numpy(zero_copy_only=False)
+        return uniques + [None], codes.astype(np.intp, copy=False)
+
+    lookup: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (lookup.setdefault(model, len(lookup)) for model in models),
+        dtype=np.intp,
+        count=len(models),
+    )
+    return list(lookup), codes
+
+
+def _token_column(np, column: Any):
+    if _is_arrow(column):
+        column = column.fill_null(0).to_numpy(zero_copy_only=False)
+    return np.asarray(column, dtype=np.float64)
+
+
+def _costs_numpy(np, models, input_tokens, output_tokens):
+    uniques, codes = _encode_models(np, models)
+    inputs = _token_column(np, input_tokens)
+    outputs = _token_column(np, output_tokens)
+    if not len(codes) == len(inputs) == len(outputs):
+        raise ValueError("models, input_tokens and output_tokens must have the same length")
+
+    schedules = _schedules(uniques)
+    table = [schedules[model] for model in uniques]
+    input_rates = np.array([rates[0] for rates in table], dtype=np.float64)[codes]
+    output_rates = np.array([rates[1] for rates in table], dtype=np.float64)[codes]
+
+    for code, (_, _, tiers) in enumerate(table):
+        if not tiers:
+            continue
+        rows = codes == code
+        # Lowest threshold first so higher tiers overwrite it
+        for above, tier_input, tier_output in reversed(tiers):
+            mask = rows & (inputs > above)
+            input_rates[mask] = tier_input
+            output_rates[mask] = tier_output
+
+    return np.round(inputs * input_rates + outputs * output_rates, 6)
+
+
+def _costs_python(models, input_tokens, output_tokens) -> List[float]:
+    if _is_arrow(models):
+        models = models.to_pylist()
+    if _is_arrow(input_tokens):
+        input_tokens = input_tokens.fill_null(0).to_pylist()
+    if _is_arrow(output_tokens):
+        output_tokens = output_tokens.fill_null(0).to_pylist()
+    if not len(models) == len(input_tokens) == len(output_tokens):
+        raise ValueError("models, input_tokens and output_tokens must have the same length")
+
+    schedules = _schedules(set(models))
+    costs: List[float] = []
+    append = costs.append
+    for model, inputs, outputs in zip(models, input_tokens, output_tokens):
+        input_rate, output_rate, tiers = schedules[model]
+        for above, tier_input, tier_output in tiers:
+            if inputs > above:
+                input_rate, output_rate = tier_input, tier_output
+                break
+        append(round(inputs * input_rate + outputs * output_rate, 6))
+    return costs
+
+
+def calculate_costs(models: Any, input_tokens: Any, output_tokens: Any) -> Any:
+    """
+    Calculate costs for many calls at once.
+
+    Takes columns rather than rows: lists, NumPy arrays or PyArrow arrays
+    of equal length. Each distinct model string is resolved once (see
+    ``resolve_model``) and the rates are applied to whole columns, so
+    re-costing millions of historical rows after a price change is a
+    single vectorized pass when NumPy is installed.
+
+    Input and output tokens are priced with the same rates and
+    long-context tiers as ``calculate_cost``; usage breakdowns (cached,
+    audio or batch tokens) need the scalar function.
+
+    Args:
+        models: Model name per row; unknown or null models cost 0.0
+        input_tokens: Input tokens per row
+        output_tokens: Output tokens per row
+
+    Returns:
+        Cost in USD per row, as a float64 NumPy array when NumPy is
+        installed, otherwise a list. Costs are rounded to 6 decimals
+        like ``calculate_cost``; NumPy may round a tie the other way.
+
+    Raises:
+        ValueError: If the columns differ in length
+    """
+    np = _numpy()
+    if np is None:
+        return _costs_python(models, input_tokens, output_tokens)
+    return _costs_numpy(np, models, input_tokens, output_tokens)
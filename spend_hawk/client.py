@@ -1,119 +1,958 @@
 """HTTP client for sending metrics to Spend Hawk backend."""
+import atexit
+import heapq
+import json
 import logging
+import os
+import random
 import time
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 import threading
-from queue import Queue
-import requests
+from queue import Queue, Empty, Full
+
+try:
+    import fcntl
+except ImportError:  # Windows: spill files of exited processes aren't adopted
+    fcntl = None  # type: ignore[assignment]
 
 from .config import config
+from .records import MetricRecord, as_payload
+from .rollup import Aggregator
+from .sketch import latency_sketches
+from .telemetry import batch_sizes, export_seconds
+from .collector import CollectorSender
+from .spool import Spool
+from .transport import transport
 
 logger = logging.getLogger(__name__)
 
+# Overflow policies applied when the queue is full
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+SPILL = "spill"
+
+# Outcomes of a single send attempt
+SENT = "sent"
+REJECTED = "rejected"
+RETRY = "retry"
+
+
+def _backoff(attempt: int) -> float:
+    """
+    Jittered exponential backoff delay for a retry.
+    
+    Half of the exponential delay is fixed and half is random, so retries
+    from many processes spread out instead of arriving together.
+    
+    Args:
+        attempt: Number of attempts already made (0-based)
+        
+    Returns:
+        Delay in seconds
+    """
+    ceiling = min(
+        config.retry_max_backoff_ms,
+        config.retry_backoff_ms * (2 ** attempt)
+    ) / 1000.0
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+    
+    Args:
+        value: Raw header value
+        
+    Returns:
+        Delay in seconds, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        import email.utils
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Stops sending while the backend is failing.
+    
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    every send is skipped for ``reset_timeout`` seconds. It then lets a
+    single probe through (half-open); success closes it, failure reopens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+    
+    def allow(self) -> bool:
+        """Check whether a send may be attempted now."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        return True
+    
+    def time_until_probe(self) -> float:
+        """Seconds until the open breaker lets a probe through."""
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+    
+    def record_success(self):
+        """Close the breaker after a successful send."""
+        self.state = self.CLOSED
+        self.failures = 0
+    
+    def record_failure(self):
+        """Count a failure, opening the breaker at the threshold."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Spend Hawk backend unavailable, pausing metric sends")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
 
 class MetricsClient:
     """Client for sending metrics to Spend Hawk backend."""
     
-    def __init__(self):
-        self.queue: Queue = Queue()
+    def __init__(self, forward_to_collector: bool = True):
+        """
+        Args:
+            forward_to_collector: Send records to the local collector when
+                ``config.collector_socket`` is set. The collector itself
+                exports with this disabled.
+        """
+        self.forward_to_collector = forward_to_collector
+        self._init_state()
+        if self.spool is not None:
+            atexit.register(self._flush_spool)
+    
+    def _init_state(self):
+        """Create the queue, locks, counters and spool. Also used after fork."""
+        self.queue: Queue = Queue(maxsize=max(config.max_queue_size, 0))
         self.worker_thread: Optional[threading.Thread] = None
         self.running = False
         
+        # Backpressure counters, read through stats()
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.sent = 0
+        self.failed = 0
+        
+        self.retries = 0
+        
+        # Overflow spill file (SPILL policy only), kept open and flock'd for
+        # the process's lifetime so siblings can tell it from an orphan
+        self._spill_lock = threading.Lock()
+        self._spill_pending = 0
+        self._spill_file = None
+        self._spill_file_path: Optional[Path] = None
+        self._spill_name = f"spill-{os.getpid()}-{time.time_ns():x}.jsonl"
+        self._spill_adopted = False
+        
+        # Delay queue of (due, seq, attempt, batch, spool segments) for
+        # failed sends, only touched by the worker thread
+        self._retry_heap: List[Tuple[float, int, int, List[Dict[str, Any]], Optional[List[int]]]] = []
+        self._retry_seq = 0
+        self.breaker = CircuitBreaker(
+            config.circuit_failure_threshold,
+            config.circuit_reset_timeout_s
+        )
+        
+        # Optional write-ahead spool for crash recovery
+        self.spool: Optional[Spool] = None
+        self._spool_replayed = False
+        if config.spool_enabled:
+            self.spool = Spool(
+                config.spool_dir,
+                config.spool_segment_bytes,
+                config.spool_max_bytes
+            )
+        
+        # Sender for the per-host collector, created on first use
+        self._collector: Optional[CollectorSender] = None
+        
+        # Per-window rollups for projects in config.rollup_projects; the
+        # flag asks the worker to release open windows early (flush)
+        self.rollups = Aggregator(config.rollup_window_s)
+        self.rolled_up = 0
+        self._rollup_flush = threading.Event()
+        
+        # Next time latency sketches are exported (config.sketch_export_s)
+        self._next_sketch_export = time.monotonic() + config.sketch_export_s
+    
+    def _flush_spool(self):
+        """Push buffered spool appends to the OS (at exit and before fork)."""
+        if self.spool is not None:
+            try:
+                self.spool.flush()
+            except Exception:
+                pass
+    
+    def _reset_after_fork(self):
+        """
+        Start from a clean state in a forked child.
+        
+        The parent's queue, locks and worker thread don't carry over
+        usefully: locks may have been held mid-fork, the thread doesn't
+        exist in the child, and queued metrics are the parent's to send.
+        The worker restarts on the child's first metric.
+        """
+        self._init_state()
+    
     def start_worker(self):
         """Start background worker thread for sending metrics."""
         if self.worker_thread is None or not self.worker_thread.is_alive():
             self.running = True
             self.worker_thread = threading.Thread(target=self._worker, daemon=True)
             self.worker_thread.start()
+            
+            if self.spool is not None and not self._spool_replayed:
+                self._spool_replayed = True
+                threading.Thread(
+                    target=self._replay_spool,
+                    name="spend-hawk-spool-replay",
+                    daemon=True
+                ).start()
+    
+    def _replay_spool(self):
+        """Queue metrics left in the spool by processes that have exited."""
+        try:
+            self.spool.replay(self._put_replayed)
+        except Exception as e:
+            logger.error(f"Error replaying metrics spool: {e}", exc_info=True)
+    
+    def _put_replayed(self, record: MetricRecord):
+        """Queue a replayed record, waiting for room rather than dropping it."""
+        self.queue.put(record)
+        self._count("enqueued")
     
     def _worker(self):
         """Background worker that processes the metrics queue."""
+        if not self._spill_adopted:
+            self._spill_adopted = True
+            self._adopt_spill()
+        
         while self.running:
             try:
-                # Get metric from queue (with timeout to allow checking running flag)
+                if self.spool is not None:
+                    self.spool.flush()
+                
+                if self._spill_pending:
+                    self._reload_spill()
+                
+                # Retries are due before fresh metrics, but never block them
+                self._run_due_retries()
+                self._send_rollups()
+                self._send_sketches()
+                
+                # Get metric from queue (with timeout to allow checking running
+                # flag and waking up for the next scheduled retry)
                 try:
-                    metric = self.queue.get(timeout=1.0)
-                except:
+                    metric = self.queue.get(timeout=self._next_wait())
+                except Empty:
                     continue
                 
-                # Send metric with retries
-                self._send_with_retry(metric)
-                self.queue.task_done()
+                if config.batch_size <= 1:
+                    records = [metric]
+                else:
+                    records = self._drain_batch(metric)
+                
+                # Pricing, enrichment and latency sketches happen here, off
+                # the caller's thread
+                self._record_latency(records)
+                raw = self._roll_up(records)
+                payloads = (self._to_payload(record) for record in raw)
+                self._attempt(
+                    [m for m in payloads if m is not None],
+                    0,
+                    self._spool_segments(raw)
+                )
+                for _ in records:
+                    self.queue.task_done()
                 
             except Exception as e:
                 logger.error(f"Error in metrics worker: {e}", exc_info=True)
     
-    def _send_with_retry(self, metric: Dict[str, Any], max_retries: int = 3):
+    def _drain_batch(self, first: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Send metric with exponential backoff retry logic.
+        Collect a batch starting with ``first``.
+        
+        Pulls metrics off the queue until ``config.batch_size`` is reached or
+        ``config.linger_ms`` has elapsed since the first metric, whichever
+        comes first.
         
         Args:
-            metric: Metric data to send
-            max_retries: Maximum number of retry attempts
+            first: Metric already taken off the queue
+            
+        Returns:
+            List of metrics to send in one request
         """
-        for attempt in range(max_retries):
+        batch = [first]
+        max_size = config.batch_size
+        deadline = time.monotonic() + config.linger_ms / 1000.0
+        
+        while len(batch) < max_size:
+            # Take whatever is already queued without waiting
             try:
-                response = requests.post(
-                    f"{config.api_endpoint}/api/v1/metrics",
-                    json=metric,
-                    headers={
-                        "Authorization": f"Bearer {config.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=5.0
-                )
-                
-                if response.status_code == 200 or response.status_code == 201:
-                    logger.debug(f"Successfully sent metric: {metric}")
-                    return
-                elif response.status_code == 401:
-                    logger.error("Invalid Spend Hawk API key")
-                    return  # Don't retry auth errors
-                else:
-                    logger.warning(
-                        f"Failed to send metric (attempt {attempt + 1}/{max_retries}): "
-                        f"HTTP {response.status_code}"
-                    )
-                    
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout sending metric (attempt {attempt + 1}/{max_retries})")
-            except requests.exceptions.RequestException as e:
-                logger.warning(
-                    f"Network error sending metric (attempt {attempt + 1}/{max_retries}): {e}"
-                )
-            except Exception as e:
-                logger.error(f"Unexpected error sending metric: {e}", exc_info=True)
-                return  # Don't retry unexpected errors
+                batch.append(self.queue.get_nowait())
+                continue
+            except Empty:
+                pass
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except Empty:
+                break
+        
+        return batch
+    
+    def _record_latency(self, records: List[Any]):
+        """Feed record latencies into the per-model quantile sketches."""
+        try:
+            latency_sketches.add_records(records)
+        except Exception as e:
+            logger.error(f"Error recording latency: {e}", exc_info=True)
+    
+    def _send_sketches(self):
+        """Export latency sketches once per ``config.sketch_export_s``."""
+        if config.sketch_export_s <= 0 or time.monotonic() < self._next_sketch_export:
+            return
+        self._next_sketch_export = time.monotonic() + config.sketch_export_s
+        sketches = latency_sketches.take_interval()
+        if sketches:
+            self._attempt(sketches, 0)
+    
+    def _roll_up(self, records: List[Any]) -> List[Any]:
+        """
+        Fold records of rollup-mode projects into their window's rollup.
+        
+        Args:
+            records: Records taken off the queue
+            
+        Returns:
+            Records to send individually
+        """
+        if not config.rollup_projects:
+            return records
+        
+        raw = []
+        for record in records:
+            if isinstance(record, MetricRecord) and config.rollup_enabled_for(record.context[0]):
+                try:
+                    self.rollups.add(record)
+                    self._count("rolled_up")
+                except Exception as e:
+                    logger.error(f"Error rolling up metric: {e}", exc_info=True)
+                    self._count("failed")
+            else:
+                raw.append(record)
+        return raw
+    
+    def _send_rollups(self):
+        """Send rollups whose window has closed (all of them when flushing)."""
+        force = self._rollup_flush.is_set()
+        if not force and not len(self.rollups):
+            return
+        
+        rollups = self.rollups.drain(time.time(), force=force)
+        if force:
+            self._rollup_flush.clear()
+        if not rollups:
+            return
+        
+        window_s = self.rollups.window_s
+        segments = [segment for rollup in rollups for segment in rollup.spool_segments()]
+        self._attempt(
+            [rollup.to_dict(window_s) for rollup in rollups],
+            0,
+            segments if self.spool is not None else None
+        )
+    
+    def _to_payload(self, metric) -> Optional[Dict[str, Any]]:
+        """Enrich one queued record, dropping it if enrichment fails."""
+        try:
+            return as_payload(metric)
+        except Exception as e:
+            logger.error(f"Error building metric payload: {e}", exc_info=True)
+            self._count("failed")
+            return None
+    
+    def _spool_segments(self, records: List[Any]) -> Optional[List[int]]:
+        """Spool segments of records that need acknowledging, if spooling."""
+        if self.spool is None:
+            return None
+        return [
+            record.spool_segment for record in records
+            if isinstance(record, MetricRecord) and record.spool_segment is not None
+        ]
+    
+    def _ack(self, segments: Optional[List[int]]):
+        """Tell the spool these records no longer need to survive a crash."""
+        if self.spool is not None and segments:
+            self.spool.ack(segments)
+    
+    def _attempt(
+        self,
+        batch: List[Dict[str, Any]],
+        attempt: int,
+        segments: Optional[List[int]] = None
+    ):
+        """
+        Try to send a batch once, scheduling a retry on retryable failure.
+        
+        Batches that still fail after ``config.max_retries`` attempts are
+        not acknowledged in the spool, so they are replayed on next startup.
+        
+        Args:
+            batch: Metrics to send
+            attempt: Number of attempts already made for this batch
+            segments: Spool segments of the batch's records
+        """
+        if not batch:
+            self._ack(segments)
+            return
+        
+        if not self.breaker.allow():
+            # Backend is considered down; park the batch without using up
+            # an attempt until the breaker lets a probe through
+            self._schedule_retry(batch, attempt, self.breaker.time_until_probe(), segments)
+            return
+        
+        outcome, retry_after = self._send_once(batch)
+        
+        if outcome == SENT:
+            self.breaker.record_success()
+            self._count("sent", len(batch))
+            self._ack(segments)
+        elif outcome == REJECTED:
+            self._count("failed", len(batch))
+            self._ack(segments)
+        elif attempt + 1 >= config.max_retries:
+            self.breaker.record_failure()
+            logger.error(f"Failed to send {len(batch)} metric(s) after {attempt + 1} attempts")
+            self._count("failed", len(batch))
+        else:
+            self.breaker.record_failure()
+            delay = retry_after if retry_after is not None else _backoff(attempt)
+            self._schedule_retry(batch, attempt + 1, delay, segments)
+            self._count("retries")
+    
+    def _send_once(self, batch: List[Dict[str, Any]]) -> Tuple[str, Optional[float]]:
+        """
+        Make a single send attempt without sleeping.
+        
+        A one-element batch in per-metric mode goes to the single-metric
+        endpoint; anything else goes to the bulk endpoint.
+        
+        Args:
+            batch: Metrics to send
+            
+        Returns:
+            Tuple of (outcome, retry_after) where outcome is SENT, REJECTED
+            (don't retry) or RETRY, and retry_after is the server-requested
+            delay in seconds, if any
+        """
+        if config.batch_size <= 1 and len(batch) == 1:
+            path, payload = "/api/v1/metrics", batch[0]
+        else:
+            path, payload = "/api/v1/metrics/batch", {"metrics": batch}
+        
+        # Loaded with the HTTP stack on first send, not at SDK import
+        from requests.exceptions import RequestException, Timeout
+        
+        try:
+            started = time.perf_counter()
+            response = transport.post(path, payload, timeout=5.0)
+            export_seconds.observe(time.perf_counter() - started)
+            batch_sizes.observe(len(batch))
             
-            # Exponential backoff (0.5s, 1s, 2s)
-            if attempt < max_retries - 1:
-                time.sleep(0.5 * (2 ** attempt))
+            if response.status_code == 200 or response.status_code == 201:
+                logger.debug(f"Successfully sent {len(batch)} metric(s)")
+                return SENT, None
+            elif response.status_code == 401:
+                logger.error("Invalid Spend Hawk API key")
+                return REJECTED, None  # Don't retry auth errors
+            elif response.status_code in (429, 503):
+                logger.warning(f"Backend throttling metrics: HTTP {response.status_code}")
+                return RETRY, _parse_retry_after(response.headers.get("Retry-After"))
+            else:
+                logger.warning(f"Failed to send metrics: HTTP {response.status_code}")
+                return RETRY, None
+                
+        except Timeout:
+            logger.warning("Timeout sending metrics")
+        except RequestException as e:
+            logger.warning(f"Network error sending metrics: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error sending metrics: {e}", exc_info=True)
+            return REJECTED, None  # Don't retry unexpected errors
         
-        logger.error(f"Failed to send metric after {max_retries} attempts")
+        return RETRY, None
     
-    def send_async(self, metric: Dict[str, Any]):
+    def _schedule_retry(
+        self,
+        batch: List[Dict[str, Any]],
+        attempt: int,
+        delay: float,
+        segments: Optional[List[int]] = None
+    ):
+        """
+        Park a batch in the delay queue until it is due again.
+        
+        Args:
+            batch: Metrics to resend
+            attempt: Attempt number the retry will count as
+            delay: Seconds to wait before resending
+            segments: Spool segments of the batch's records
+        """
+        if len(self._retry_heap) >= config.max_retry_batches:
+            logger.warning("Retry queue full, dropping metrics")
+            self._count("dropped", len(batch))
+            return
+        self._retry_seq += 1
+        heapq.heappush(
+            self._retry_heap,
+            (time.monotonic() + delay, self._retry_seq, attempt, batch, segments)
+        )
+    
+    def _run_due_retries(self):
+        """Resend every batch whose retry delay has expired."""
+        now = time.monotonic()
+        while self._retry_heap and self._retry_heap[0][0] <= now:
+            _, _, attempt, batch, segments = heapq.heappop(self._retry_heap)
+            self._attempt(batch, attempt, segments)
+    
+    def _next_wait(self) -> float:
+        """Seconds the worker may block on the queue before a retry or rollup is due."""
+        wait = 1.0
+        if self._retry_heap:
+            wait = min(wait, max(0.0, self._retry_heap[0][0] - time.monotonic()))
+        close = self.rollups.next_close()
+        if close is not None:
+            wait = min(wait, max(0.0, close - time.time()))
+        return wait
+    
+    def send_async(self, metric):
         """
         Send metric asynchronously (non-blocking).
         
         Args:
-            metric: Metric data to send
+            metric: MetricRecord or metric dict to send
         """
         if not config.is_configured():
             logger.debug("Spend Hawk not configured, skipping metric")
             return
         
+        # Hand records to the per-host collector when one is configured;
+        # fall back to exporting from this process if it isn't reachable
+        if (
+            config.collector_socket
+            and self.forward_to_collector
+            and isinstance(metric, MetricRecord)
+        ):
+            if self._collector is None:
+                self._collector = CollectorSender(config.collector_socket)
+            if self._collector.send(metric):
+                self._count("enqueued")
+                return
+        
         # Start worker if not running
         self.start_worker()
         
-        # Add to queue
-        self.queue.put(metric)
+        # Write ahead so the metric survives a crash before it is exported
+        if self.spool is not None and isinstance(metric, MetricRecord):
+            try:
+                self.spool.append(metric)
+            except Exception as e:
+                logger.warning(f"Failed to write metric to spool: {e}")
+        
+        # Add to queue, applying the overflow policy if it is full
+        try:
+            self.queue.put_nowait(metric)
+        except Full:
+            self._handle_overflow(metric)
+            return
+        self._count("enqueued")
+    
+    def send_many(self, metrics: List[MetricRecord]):
+        """
+        Send many records at once, waiting for queue room rather than dropping.
+        
+        For offline producers such as batch result ingestion, which can
+        create records far faster than they are exported: the bounded queue
+        throttles the producer instead of the overflow policy discarding
+        its records.
+        
+        Args:
+            metrics: Records to send
+        """
+        if not metrics:
+            return
+        if not config.is_configured():
+            logger.debug("Spend Hawk not configured, skipping metrics")
+            return
+        
+        if config.collector_socket and self.forward_to_collector:
+            if self._collector is None:
+                self._collector = CollectorSender(config.collector_socket)
+            remaining = [metric for metric in metrics if not self._collector.send(metric)]
+            self._count("enqueued", len(metrics) - len(remaining))
+            metrics = remaining
+            if not metrics:
+                return
+        
+        self.start_worker()
+        
+        if self.spool is not None:
+            try:
+                for metric in metrics:
+                    self.spool.append(metric)
+            except Exception as e:
+                logger.warning(f"Failed to write metrics to spool: {e}")
+        
+        put = self.queue.put
+        for metric in metrics:
+            put(metric)
+        self._count("enqueued", len(metrics))
+    
+    def _handle_overflow(self, metric):
+        """
+        Apply ``config.overflow_policy`` to a metric that didn't fit.
+        
+        Args:
+            metric: Metric that could not be queued
+        """
+        policy = config.overflow_policy
+        
+        if policy == DROP_OLDEST:
+            try:
+                evicted = self.queue.get_nowait()
+                self.queue.task_done()
+                self._count("dropped")
+                self._ack(self._spool_segments([evicted]))
+            except Empty:
+                pass
+            try:
+                self.queue.put_nowait(metric)
+                self._count("enqueued")
+            except Full:
+                self._count("dropped")
+                self._ack(self._spool_segments([metric]))
+        elif policy == BLOCK:
+            try:
+                self.queue.put(metric, timeout=config.block_timeout_ms / 1000.0)
+                self._count("enqueued")
+            except Full:
+                self._count("dropped")
+                self._ack(self._spool_segments([metric]))
+        elif policy == SPILL:
+            self._spill(metric)
+        else:
+            self._count("dropped")
+            self._ack(self._spool_segments([metric]))
+    
+    def _spill_path(self) -> Path:
+        """
+        This process's spill file.
+        
+        Named by pid and start time so forked workers don't interleave
+        writes and a restarted process reusing a pid starts a new file.
+        """
+        return Path(config.spill_dir) / self._spill_name
+    
+    def _open_spill(self):
+        """Open and lock the spill file on first use. Spill lock held."""
+        if self._spill_file is None:
+            path = self._spill_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Lock before the file appears under its final name, so a
+            # sibling adopting orphans never sees it unlocked
+            pending = path.with_name(path.name + ".tmp")
+            spill_file = open(pending, "a+")
+            if fcntl is not None:
+                fcntl.flock(spill_file, fcntl.LOCK_EX)
+            os.rename(pending, path)
+            self._spill_file = spill_file
+            self._spill_file_path = path
+        return self._spill_file
+    
+    def _close_spill(self):
+        """Delete the emptied spill file and release its lock. Spill lock held."""
+        spill_file, self._spill_file = self._spill_file, None
+        if spill_file is None:
+            return
+        # Truncate first: a sibling may already have it open to adopt
+        spill_file.truncate(0)
+        try:
+            self._spill_file_path.unlink()
+        except FileNotFoundError:
+            pass
+        spill_file.close()
+    
+    def _write_spill(self, lines: List[str]) -> int:
+        """
+        Append lines to the spill file, up to ``config.spill_max_bytes``.
+        Spill lock held.
+        
+        Returns:
+            Number of lines written
+        """
+        spill_file = self._open_spill()
+        size = os.fstat(spill_file.fileno()).st_size
+        written = 0
+        for line in lines:
+            if size >= config.spill_max_bytes:
+                break
+            spill_file.write(line)
+            size += len(line)
+            written += 1
+        spill_file.flush()
+        self._spill_pending += written
+        return written
+    
+    def _spill(self, metric):
+        """
+        Append an overflowing metric to the on-disk spill file.
+        
+        Args:
+            metric: Metric that could not be queued
+        """
+        try:
+            line = json.dumps(as_payload(metric), separators=(",", ":")) + "\n"
+            with self._spill_lock:
+                written = self._write_spill([line])
+            if not written:
+                self._count("dropped")
+                return
+            self._count("spilled")
+            self._ack(self._spool_segments([metric]))
+        except Exception as e:
+            logger.warning(f"Failed to spill metric to disk: {e}")
+            self._count("dropped")
+    
+    def _reload_spill(self):
+        """Move spilled metrics back into the queue once it has room."""
+        room = self.queue.maxsize - self.queue.qsize() if self.queue.maxsize else self._spill_pending
+        # Wait until the queue is at most half full to avoid thrashing
+        if room < self.queue.maxsize // 2:
+            return
+        
+        with self._spill_lock:
+            spill_file = self._spill_file
+            if spill_file is None:
+                self._spill_pending = 0
+                return
+            spill_file.seek(0)
+            lines = spill_file.readlines()
+            
+            reloaded = 0
+            for line in lines[:room]:
+                try:
+                    self.queue.put_nowait(json.loads(line))
+                except Full:
+                    break
+                except ValueError:
+                    pass  # Skip lines torn by a crash mid-write
+                reloaded += 1
+            
+            remaining = lines[reloaded:]
+            if remaining:
+                spill_file.seek(0)
+                spill_file.truncate()
+                spill_file.writelines(remaining)
+                spill_file.flush()
+            else:
+                self._close_spill()
+            self._spill_pending = len(remaining)
+    
+    def _adopt_spill(self):
+        """
+        Take over spill files left by processes that have exited.
+        
+        A live process holds an flock on its spill file, so a file that can
+        be locked has no owner. Its metrics are appended to this process's
+        spill file, to be reloaded like our own, and the orphan is deleted.
+        Delivery is at-least-once: a crash mid-adoption can resend some.
+        """
+        directory = Path(config.spill_dir)
+        if fcntl is None or not directory.is_dir():
+            return
+        adopted = dropped = 0
+        for path in sorted(directory.glob("spill-*.jsonl")):
+            if path.name == self._spill_name:
+                continue
+            try:
+                with open(path, "r") as orphan:
+                    try:
+                        fcntl.flock(orphan, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue  # Owned by a running sibling
+                    if os.fstat(orphan.fileno()).st_nlink == 0:
+                        continue  # Emptied and deleted by its owner meanwhile
+                    # A line without its newline was torn by the crash
+                    lines = [line for line in orphan if line.endswith("\n")]
+                    with self._spill_lock:
+                        written = self._write_spill(lines)
+                    adopted += written
+                    dropped += len(lines) - written
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Error adopting spill file {path.name}: {e}", exc_info=True)
+        
+        if dropped:
+            self._count("dropped", dropped)
+            logger.warning(f"Spill file full, dropped {dropped} metric(s) left by exited processes")
+        if adopted:
+            logger.info(f"Adopted {adopted} spilled metric(s) left by exited processes")
+    
+    def _count(self, name: str, n: int = 1):
+        """Increment a backpressure counter."""
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + n)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and backpressure counters.
+        
+        Returns:
+            Dictionary with queue_depth, queue_max_size, enqueued, dropped,
+            spilled, spill_pending, spool_bytes, sent, failed, retries,
+            retry_pending, rolled_up and rollup_pending counts plus the
+            circuit breaker state
+        """
+        with self._stats_lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "queue_max_size": self.queue.maxsize,
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "spilled": self.spilled,
+                "spill_pending": self._spill_pending,
+                "spool_bytes": self.spool.size_bytes() if self.spool is not None else 0,
+                "sent": self.sent,
+                "failed": self.failed,
+                "retries": self.retries,
+                "retry_pending": len(self._retry_heap),
+                "rolled_up": self.rolled_up,
+                "rollup_pending": len(self.rollups),
+                "circuit_state": self.breaker.state,
+            }
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued, spilled and retrying metric has been processed.
+        
+        Open rollup windows are sent early rather than waited for.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if the queue drained, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (
+            self.queue.unfinished_tasks
+            or self._spill_pending
+            or self._retry_heap
+            or len(self.rollups)
+        ):
+            if len(self.rollups) and not self.queue.unfinished_tasks:
+                self._rollup_flush.set()
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
     
     def shutdown(self):
         """Shutdown the worker thread gracefully."""
         self.running = False
         if self.worker_thread:
             self.worker_thread.join(timeout=5.0)
+        if self.spool is not None:
+            self.spool.close()
+        transport.close()
+
+
+# Global client instance, created on first use by get_client()
+_client: Optional[MetricsClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MetricsClient:
+    """
+    Get the global metrics client, creating it on first use.
+    
+    Returns:
+        The process-wide MetricsClient
+    """
+    global _client
+    
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MetricsClient()
+    return _client
+
+
+def __getattr__(name):
+    # ``client`` is kept as a module attribute for existing imports
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _before_fork():
+    if _client is not None:
+        _client._flush_spool()
 
 
-# Global client instance
-client = MetricsClient()
+def _after_fork_in_child():
+    global _client_lock
+    
+    _client_lock = threading.Lock()
+    if _client is not None:
+        _client._reset_after_fork()
+    transport.reset_after_fork()
+
+
+# Forked workers (gunicorn, uwsgi, Celery prefork) get fresh state
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Get backpressure counters for the global metrics client.
+    
+    Returns:
+        Dictionary of queue depth and enqueued/dropped/sent counters
+    """
+    return get_client().stats()
@@ -0,0 +1,175 @@
+"""Per-host collector that batches and exports metrics for many processes."""
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Optional
+
+from .records import MetricRecord
+
+logger = logging.getLogger(__name__)
+
+# Largest datagram the collector reads; a record is a few hundred bytes
+MAX_DATAGRAM = 64 * 1024
+
+# Reused encoder; json.dumps with custom separators builds a new one per call
+# Custom tag values that aren't JSON types are sent as strings
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+class CollectorSender:
+    """
+    Sends records to the local collector over a Unix datagram socket.
+
+    A send is a single non-blocking ``sendto`` of the record's compact raw
+    form. It never waits: if the collector isn't running or its receive
+    buffer is full, ``send`` returns False and the caller exports the
+    record itself.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+
+    def send(self, record: MetricRecord) -> bool:
+        """
+        Hand a record to the collector.
+
+        Args:
+            record: Record to send
+
+        Returns:
+            True if the collector accepted the datagram
+        """
+        try:
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                sock.setblocking(False)
+                self._sock = sock
+            self._sock.sendto(_encode(record.to_raw()).encode("utf-8"), self.path)
+            return True
+        except OSError as e:
+            logger.debug(f"Collector at {self.path} unavailable: {e}")
+            return False
+
+    def close(self):
+        """Close the socket. A new one is opened on next send."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class Collector:
+    """
+    Receives records from local processes and exports them in batches.
+
+    Application processes only pay for one datagram per metric; pricing,
+    batching, retries and the HTTP connection live in this one process,
+    using the same ``MetricsClient`` pipeline as in-process export.
+    """
+
+    def __init__(self, path: str):
+        # Imported here: the client imports this module for CollectorSender
+        from .client import MetricsClient
+
+        self.path = path
+        self.client = MetricsClient(forward_to_collector=False)
+        self.received = 0
+        self._sock: Optional[socket.socket] = None
+        self._stopping = threading.Event()
+
+    def bind(self):
+        """Bind the socket, replacing a stale one left by a previous run."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.path)
+        sock.settimeout(0.5)
+        self._sock = sock
+        logger.info(f"Spend Hawk collector listening on {self.path}")
+
+    def serve_forever(self):
+        """Receive and queue records until ``stop`` is called."""
+        if self._sock is None:
+            self.bind()
+        while not self._stopping.is_set():
+            try:
+                data = self._sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._stopping.is_set():
+                    break
+                raise
+            self.handle(data)
+
+    def handle(self, data: bytes):
+        """
+        Decode one datagram and queue it for export.
+
+        Args:
+            data: Datagram sent by a ``CollectorSender``
+        """
+        try:
+            record = MetricRecord.from_raw(json.loads(data))
+        except (ValueError, TypeError, IndexError) as e:
+            logger.warning(f"Discarding malformed collector datagram: {e}")
+            return
+        self.received += 1
+        self.client.send_async(record)
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """
+        Stop receiving, flush queued metrics and remove the socket.
+
+        Args:
+            timeout: Maximum seconds to wait for the flush
+        """
+        self._stopping.set()
+        self.client.flush(timeout=timeout)
+        self.client.shutdown()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def main(argv=None):
+    """Run a collector: ``python -m spend_hawk.collector --socket PATH``."""
+    import argparse
+    import signal
+
+    from .config import config
+
+    parser = argparse.ArgumentParser(description="Spend Hawk local metrics collector")
+    parser.add_argument(
+        "--socket",
+        default=config.collector_socket,
+        help="Unix socket path (default: $SPEND_HAWK_COLLECTOR_SOCKET)"
+    )
+    args = parser.parse_args(argv)
+    if not args.socket:
+        parser.error("--socket or SPEND_HAWK_COLLECTOR_SOCKET is required")
+
+    logging.basicConfig(level=logging.INFO)
+    collector = Collector(args.socket)
+    collector.bind()
+
+    def _shutdown(signum, frame):
+        collector._stopping.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    collector.serve_forever()
+    collector.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """Configuration module for Spend Hawk SDK."""
 import os
-from typing import Optional
+from typing import Optional, Set
 
 
 class Config:
@@ -16,9 +16,94 @@ class Config:
         self.agent: Optional[str] = os.getenv("SPEND_HAWK_AGENT")
         self.enabled: bool = os.getenv("SPEND_HAWK_ENABLED", "true").lower() != "false"
         
+        # Batching: ship up to batch_size metrics per request, waiting at most
+        # linger_ms for a batch to fill. batch_size of 1 sends one POST per metric.
+        self.batch_size: int = int(os.getenv("SPEND_HAWK_BATCH_SIZE", "100"))
+        self.linger_ms: int = int(os.getenv("SPEND_HAWK_LINGER_MS", "200"))
+        
+        # Transport: keep-alive connection pool size and optional gzip bodies
+        self.pool_size: int = int(os.getenv("SPEND_HAWK_POOL_SIZE", "10"))
+        self.gzip: bool = os.getenv("SPEND_HAWK_GZIP", "false").lower() == "true"
+        
+        # Backpressure: bounded queue plus what to do when it is full
+        # (drop_newest, drop_oldest, block or spill)
+        self.max_queue_size: int = int(os.getenv("SPEND_HAWK_MAX_QUEUE_SIZE", "10000"))
+        self.overflow_policy: str = os.getenv("SPEND_HAWK_OVERFLOW_POLICY", "drop_newest")
+        self.block_timeout_ms: int = int(os.getenv("SPEND_HAWK_BLOCK_TIMEOUT_MS", "50"))
+        self.spill_dir: str = os.getenv(
+            "SPEND_HAWK_SPILL_DIR",
+            os.path.join(os.path.expanduser("~"), ".spend_hawk", "spill")
+        )
+        self.spill_max_bytes: int = int(os.getenv("SPEND_HAWK_SPILL_MAX_BYTES", str(64 * 1024 * 1024)))
+        
+        # Durable spool: write every metric to a local log before export and
+        # replay unacknowledged metrics after a crash or restart
+        self.spool_enabled: bool = os.getenv("SPEND_HAWK_SPOOL", "false").lower() == "true"
+        self.spool_dir: str = os.getenv(
+            "SPEND_HAWK_SPOOL_DIR",
+            os.path.join(os.path.expanduser("~"), ".spend_hawk", "spool")
+        )
+        self.spool_segment_bytes: int = int(os.getenv("SPEND_HAWK_SPOOL_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+        self.spool_max_bytes: int = int(os.getenv("SPEND_HAWK_SPOOL_MAX_BYTES", str(256 * 1024 * 1024)))
+        
+        # Local collector: send records over this Unix socket to one
+        # per-host process that batches and exports for every worker
+        self.collector_socket: Optional[str] = os.getenv("SPEND_HAWK_COLLECTOR_SOCKET")
+        
+        # Retries: jittered exponential backoff between attempts, a cap on
+        # batches waiting to be retried, and a circuit breaker for outages
+        self.max_retries: int = int(os.getenv("SPEND_HAWK_MAX_RETRIES", "3"))
+        self.retry_backoff_ms: int = int(os.getenv("SPEND_HAWK_RETRY_BACKOFF_MS", "500"))
+        self.retry_max_backoff_ms: int = int(os.getenv("SPEND_HAWK_RETRY_MAX_BACKOFF_MS", "30000"))
+        self.max_retry_batches: int = int(os.getenv("SPEND_HAWK_MAX_RETRY_BATCHES", "100"))
+        self.circuit_failure_threshold: int = int(os.getenv("SPEND_HAWK_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.circuit_reset_timeout_s: float = float(os.getenv("SPEND_HAWK_CIRCUIT_RESET_TIMEOUT_S", "30"))
+        
+        # Rollups: for these project ids ("*" for all), send one aggregate
+        # per rollup_window_s window and key instead of one record per call
+        self.rollup_projects: Set[str] = {
+            p.strip() for p in os.getenv("SPEND_HAWK_ROLLUP_PROJECTS", "").split(",") if p.strip()
+        }
+        self.rollup_window_s: float = float(os.getenv("SPEND_HAWK_ROLLUP_WINDOW_S", "10"))
+        
+        # Latency sketches: export the per-model quantile sketches every
+        # sketch_export_s seconds (0 keeps them local only)
+        self.sketch_export_s: float = float(os.getenv("SPEND_HAWK_SKETCH_EXPORT_S", "0"))
+        
+        # Serve SDK telemetry for Prometheus on this local port (unset = off)
+        metrics_port = os.getenv("SPEND_HAWK_METRICS_PORT")
+        self.metrics_port: Optional[int] = int(metrics_port) if metrics_port else None
+        
+        # patch_all() patches each provider SDK when it is first imported
+        # instead of importing all of them up front
+        self.lazy_patching: bool = os.getenv("SPEND_HAWK_LAZY_PATCH", "false").lower() == "true"
+        
+        # Use the asyncio-native client when a call is made on a running loop.
+        # Off by default: a loop that ends without aflush() (asyncio.run in
+        # a CLI, task or handler) would leave its last metrics unsent
+        self.async_transport: bool = os.getenv("SPEND_HAWK_ASYNC_TRANSPORT", "false").lower() == "true"
+        
+        # Add stream_options={"include_usage": True} to OpenAI streams so the
+        # final chunk reports usage. The extra usage-only chunk is read by
+        # the SDK and not passed on to the caller.
+        self.stream_include_usage: bool = os.getenv("SPEND_HAWK_STREAM_INCLUDE_USAGE", "true").lower() != "false"
+        
     def is_configured(self) -> bool:
         """Check if SDK is properly configured."""
         return self.api_key is not None and self.enabled
+    
+    def rollup_enabled_for(self, project_id: Optional[str]) -> bool:
+        """
+        Check whether a project's metrics are sent as rollups.
+        
+        Args:
+            project_id: Project from context, or None for the default project
+        """
+        if not self.rollup_projects:
+            return False
+        if "*" in self.rollup_projects:
+            return True
+        return (project_id or self.project_id) in self.rollup_projects
 
 
 # Global config instance
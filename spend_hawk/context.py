@@ -1,6 +1,6 @@
 """Context management for dynamic tagging."""
 from contextvars import ContextVar
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from contextlib import contextmanager
 
 
@@ -47,6 +47,19 @@ def get_context() -> Dict[str, Any]:
     }
 
 
+def capture_context() -> Tuple[Optional[str], Optional[str], Dict[str, Any]]:
+    """
+    Capture the current context without building a new dict.
+    
+    The custom tags dict is never mutated in place (``set_context`` always
+    replaces it), so holding a reference to it is safe.
+    
+    Returns:
+        Tuple of (project_id, agent, custom_tags)
+    """
+    return _project_id_var.get(), _agent_var.get(), _custom_tags_var.get()
+
+
 @contextmanager
 def context(**kwargs):
     """
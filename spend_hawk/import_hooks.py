@@ -0,0 +1,126 @@
+"""Run callbacks when a module is first imported (post-import hooks)."""
+import logging
+import sys
+import threading
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+# Module name -> callbacks waiting for it to be imported
+_pending: Dict[str, List[Callable[[], None]]] = {}
+
+# Modules whose lookup is in progress on this thread (see _Finder)
+_searching = threading.local()
+
+
+def _run(name: str):
+    """Run and forget the callbacks registered for ``name``."""
+    with _lock:
+        callbacks = _pending.pop(name, [])
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            # Never break the user's import
+            logger.error(f"Error in import hook for {name}: {e}", exc_info=True)
+
+
+class _Loader:
+    """Wraps a module's real loader to run hooks once the module has executed."""
+
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Hand the module its real loader so it never sees this wrapper
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._loader.exec_module(module)
+        _run(self._name)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _Finder:
+    """
+    Meta path finder that watches for modules with pending hooks.
+
+    It finds nothing itself: it asks the finders after it for the spec and
+    wraps the spec's loader, so the module loads exactly as it otherwise
+    would.
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in _pending:
+            return None
+        searching = getattr(_searching, "names", None)
+        if searching is None:
+            searching = _searching.names = set()
+        if fullname in searching:
+            return None
+
+        searching.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            searching.discard(fullname)
+
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _Loader(spec.loader, fullname)
+        return spec
+
+
+_finder = _Finder()
+
+
+def when_imported(name: str, callback: Callable[[], None]):
+    """
+    Call ``callback`` once ``name`` has been imported.
+
+    Runs it immediately if the module is already loaded; otherwise a
+    meta path hook runs it right after the user's code first imports the
+    module. Nothing is imported on the callback's behalf.
+
+    Args:
+        name: Fully qualified module name (e.g. "google.generativeai")
+        callback: Function called with no arguments, once
+    """
+    with _lock:
+        loaded = name in sys.modules
+        if not loaded:
+            _pending.setdefault(name, []).append(callback)
+            if _finder not in sys.meta_path:
+                sys.meta_path.insert(0, _finder)
+
+    if loaded:
+        callback()
+
+
+def clear_import_hooks():
+    """Drop every pending callback and remove the meta path hook."""
+    with _lock:
+        _pending.clear()
+        if _finder in sys.meta_path:
+            sys.meta_path.remove(_finder)
+
+
+def pending_imports() -> List[str]:
+    """Names of modules that still have callbacks waiting."""
+    with _lock:
+        return sorted(_pending)
@@ -0,0 +1,164 @@
+"""Resolve model names reported by providers to pricing table entries."""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .rates import Evaluator, compile_rate_card
+
+# Default number of raw model strings whose resolution is memoized
+RESOLVE_CACHE_SIZE = 4096
+
+# Vendor prefixes used by Bedrock-style ids ("anthropic.claude-3-...")
+_VENDOR_PREFIXES = ("anthropic.", "openai.", "google.", "meta.", "mistral.", "cohere.", "amazon.")
+
+# Bedrock version tags ("-v1:0", "-v2")
+_BEDROCK_VERSION = re.compile(r"-v\d+(?::\d+)?$")
+
+# One trailing version component: a date (2024-08-06, 20240806), a short
+# release number (0613, 002), or a moving alias
+_VERSION_SUFFIX = re.compile(r"-(?:\d{4}-\d{2}-\d{2}|\d{8}|\d{4}|\d{3}|latest|exp)$")
+
+# Characters that may follow a prefix match; "gpt-4" must not match "gpt-4o"
+_BOUNDARIES = "-_:"
+
+
+def normalize_model_name(model: str) -> str:
+    """
+    Reduce a provider's model id to a comparable base form.
+
+    Lower-cases and strips resource paths ("models/gemini-1.5-pro"),
+    fine-tune wrappers ("ft:gpt-4o-mini:org::id"), Bedrock vendor prefixes
+    and version tags, and Vertex "@" version separators.
+
+    Args:
+        model: Model id as reported by the provider
+
+    Returns:
+        Normalized name
+    """
+    name = model.strip().lower()
+    if name.startswith("ft:"):
+        name = name[3:].split(":", 1)[0]
+    name = name.rsplit("/", 1)[-1]
+    for prefix in _VENDOR_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    name = _BEDROCK_VERSION.sub("", name)
+    return name.replace("@", "-")
+
+
+def strip_version(name: str) -> str:
+    """Remove one trailing version component, if there is one."""
+    return _VERSION_SUFFIX.sub("", name)
+
+
+class ModelIndex:
+    """
+    Precomputed lookup from reported model names to pricing keys.
+
+    Built once per pricing table. A name resolves, in order, by:
+
+    1. Exact key
+    2. Normalized name (case, paths, vendor prefixes)
+    3. Stripping version suffixes one at a time, also matching dated
+       table keys by their undated name (newest date wins)
+    4. Longest table key that is a prefix of the name, ending at a ``-``,
+       ``_`` or ``:`` boundary, found by walking a character trie
+
+    Results, including misses, are memoized in a bounded LRU cache keyed
+    by the raw string, so repeated lookups are a single dict hit.
+    """
+
+    def __init__(self, pricing: Dict[str, Any], cache_size: int = RESOLVE_CACHE_SIZE):
+        self.pricing = pricing
+        self._names: Dict[str, str] = {}
+        self._trie: Dict[str, Any] = {}
+
+        for key in pricing:
+            self._names.setdefault(normalize_model_name(key), key)
+
+        # Undated aliases of dated keys; sorted so the newest date wins
+        aliases: Dict[str, str] = {}
+        for key in sorted(pricing):
+            name = normalize_model_name(key)
+            stripped = strip_version(name)
+            while stripped != name:
+                aliases[stripped] = key
+                name, stripped = stripped, strip_version(stripped)
+        for alias, key in aliases.items():
+            self._names.setdefault(alias, key)
+
+        for name, key in self._names.items():
+            node = self._trie
+            for char in name:
+                node = node.setdefault(char, {})
+            node[""] = key
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+        # Compiled rate cards by pricing key, built on first use
+        self._evaluators: Dict[Optional[str], Evaluator] = {}
+
+    def _resolve(self, model: str) -> Optional[str]:
+        """Uncached resolution; see the class docstring."""
+        if model in self.pricing:
+            return model
+
+        name = normalize_model_name(model)
+        key = self._names.get(name)
+        if key is not None:
+            return key
+
+        stripped = strip_version(name)
+        while stripped != name:
+            key = self._names.get(stripped)
+            if key is not None:
+                return key
+            name, stripped = stripped, strip_version(stripped)
+
+        return self._longest_prefix(normalize_model_name(model))
+
+    def _longest_prefix(self, name: str) -> Optional[str]:
+        """Longest indexed name that prefixes ``name`` at a boundary."""
+        node = self._trie
+        best = None
+        for i, char in enumerate(name):
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            if "" in node and (i + 1 == len(name) or name[i + 1] in _BOUNDARIES):
+                best = node[""]
+        return best
+
+    def lookup(self, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the pricing entry for a reported model name.
+
+        Args:
+            model: Model id as reported by the provider
+
+        Returns:
+            The table entry, or None if nothing matches
+        """
+        key = self.resolve(model)
+        return self.pricing.get(key) if key is not None else None
+
+    def evaluator(self, model: str) -> Evaluator:
+        """
+        Get the compiled cost function for a reported model name.
+
+        Args:
+            model: Model id as reported by the provider
+
+        Returns:
+            Evaluator from ``compile_rate_card`` (always 0.0 if unknown)
+        """
+        key = self.resolve(model)
+        evaluator = self._evaluators.get(key)
+        if evaluator is None:
+            evaluator = self._evaluators[key] = compile_rate_card(
+                self.pricing.get(key) if key is not None else None
+            )
+        return evaluator
@@ -1,24 +1,44 @@
 """Main patching module."""
 import logging
+from typing import Optional
 
+from .config import config
+from .import_hooks import clear_import_hooks, when_imported
+from .telemetry import start_metrics_server
 from .providers import patch_openai, patch_anthropic, patch_google, unpatch_openai, unpatch_anthropic, unpatch_google
+from .providers import patch_mistral, patch_cohere, unpatch_mistral, unpatch_cohere
 
 logger = logging.getLogger(__name__)
 
 _patched = False
 
 
-def patch_all():
+def patch_all(lazy: Optional[bool] = None):
     """
     Patch all supported LLM providers.
     
     This will monkey-patch:
-    - OpenAI (openai.ChatCompletion.create)
-    - Anthropic (anthropic.Anthropic.messages.create)
-    - Google Generative AI (google.generativeai.GenerativeModel.generate_content)
+    - OpenAI (chat.completions.create, embeddings.create, responses.create
+      and legacy completions.create on OpenAI and AsyncOpenAI)
+    - Anthropic (messages.create on Anthropic and AsyncAnthropic)
+    - Google Generative AI (GenerativeModel.generate_content and
+      generate_content_async)
+    - Mistral AI (chat.complete, chat.stream and embeddings.create, sync
+      and async)
+    - Cohere (v2 chat, chat_stream and embed on ClientV2 and
+      AsyncClientV2)
     
     The patches are non-blocking and will not crash your code if metrics
     fail to send.
+    
+    In lazy mode no provider SDK is imported here. SDKs that are already
+    loaded are patched immediately; the rest are patched by an import hook
+    the moment your code first imports them, so SDKs you never use are
+    never loaded.
+    
+    Args:
+        lazy: Patch on import instead of importing every SDK now
+            (defaults to ``config.lazy_patching``)
     """
     global _patched
     
@@ -28,13 +48,30 @@ def patch_all():
     
     logger.info("Patching LLM providers...")
     
-    # Patch each provider
-    patch_openai()
-    patch_anthropic()
-    patch_google()
+    if lazy is None:
+        lazy = config.lazy_patching
+    
+    if lazy:
+        when_imported("openai", patch_openai)
+        when_imported("anthropic", patch_anthropic)
+        when_imported("google.generativeai", patch_google)
+        when_imported("mistralai", patch_mistral)
+        when_imported("cohere", patch_cohere)
+    else:
+        patch_openai()
+        patch_anthropic()
+        patch_google()
+        patch_mistral()
+        patch_cohere()
+    
+    if config.metrics_port is not None:
+        start_metrics_server(config.metrics_port)
     
     _patched = True
-    logger.info("All providers patched successfully")
+    if lazy:
+        logger.info("Providers will be patched when imported")
+    else:
+        logger.info("All providers patched successfully")
 
 
 def unpatch_all():
@@ -46,9 +83,12 @@ def unpatch_all():
     
     logger.info("Unpatching LLM providers...")
     
+    clear_import_hooks()
     unpatch_openai()
     unpatch_anthropic()
     unpatch_google()
+    unpatch_mistral()
+    unpatch_cohere()
     
     _patched = False
     logger.info("All providers unpatched")
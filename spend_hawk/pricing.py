@@ -1,48 +1,232 @@
 """Dynamic pricing module for Spend Hawk SDK."""
+import hashlib
 import json
+import logging
+import marshal
 import os
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
-from urllib.request import urlopen, Request
-from urllib.error import URLError
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process cache lock
+    fcntl = None  # type: ignore[assignment]
 
-# Hardcoded fallback pricing (per 1K tokens)
-FALLBACK_PRICING = {
+from .model_index import ModelIndex
+from .transport import transport
+
+logger = logging.getLogger(__name__)
+
+
+# Hardcoded fallback pricing (per 1K tokens). Besides input and output, an
+# entry may set cached_input / cache_write (prompt caching), image_input,
+# audio_input, audio_output, batch_discount and long-context tiers; see
+# rates.compile_rate_card.
+FALLBACK_PRICING: Dict[str, Dict[str, Dict[str, Any]]] = {
     "openai": {
         "gpt-4": {"input": 0.03, "output": 0.06},
         "gpt-4-turbo": {"input": 0.01, "output": 0.03},
         "gpt-4-turbo-preview": {"input": 0.01, "output": 0.03},
-        "gpt-4o": {"input": 0.005, "output": 0.015},
-        "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},
+        "gpt-4o": {"input": 0.005, "output": 0.015, "cached_input": 0.0025},
+        "gpt-4o-mini": {"input": 0.00015, "output": 0.0006, "cached_input": 0.000075},
+        "gpt-4o-audio-preview": {
+            "input": 0.0025, "output": 0.01, "audio_input": 0.04, "audio_output": 0.08
+        },
         "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
         "gpt-3.5-turbo-16k": {"input": 0.003, "output": 0.004},
+        "gpt-3.5-turbo-instruct": {"input": 0.0015, "output": 0.002},
+        "davinci-002": {"input": 0.002, "output": 0.002},
+        "babbage-002": {"input": 0.0004, "output": 0.0004},
+        "text-embedding-3-small": {"input": 0.00002, "output": 0.0},
+        "text-embedding-3-large": {"input": 0.00013, "output": 0.0},
+        "text-embedding-ada-002": {"input": 0.0001, "output": 0.0},
     },
     "anthropic": {
-        "claude-3-opus-20240229": {"input": 0.015, "output": 0.075},
+        "claude-3-opus-20240229": {
+            "input": 0.015, "output": 0.075, "cached_input": 0.0015, "cache_write": 0.01875
+        },
         "claude-3-sonnet-20240229": {"input": 0.003, "output": 0.015},
-        "claude-3-haiku-20240307": {"input": 0.00025, "output": 0.00125},
-        "claude-3-5-sonnet-20241022": {"input": 0.003, "output": 0.015},
-        "claude-3-5-haiku-20241022": {"input": 0.001, "output": 0.005},
+        "claude-3-haiku-20240307": {
+            "input": 0.00025, "output": 0.00125, "cached_input": 0.00003, "cache_write": 0.0003
+        },
+        "claude-3-5-sonnet-20241022": {
+            "input": 0.003, "output": 0.015, "cached_input": 0.0003, "cache_write": 0.00375
+        },
+        "claude-3-5-haiku-20241022": {
+            "input": 0.001, "output": 0.005, "cached_input": 0.0001, "cache_write": 0.00125
+        },
     },
     "google": {
         "gemini-pro": {"input": 0.0005, "output": 0.0015},
         "gemini-pro-vision": {"input": 0.0025, "output": 0.0075},
-        "gemini-1.5-pro": {"input": 0.00075, "output": 0.003},
-        "gemini-1.5-flash": {"input": 0.000075, "output": 0.0003},
-    }
+        "gemini-1.5-pro": {
+            "input": 0.00075, "output": 0.003,
+            "tiers": [{"above": 128000, "input": 0.0015, "output": 0.006}]
+        },
+        "gemini-1.5-flash": {
+            "input": 0.000075, "output": 0.0003,
+            "tiers": [{"above": 128000, "input": 0.00015, "output": 0.0006}]
+        },
+    },
+    "mistral": {
+        "mistral-large-latest": {"input": 0.002, "output": 0.006},
+        "mistral-small-latest": {"input": 0.0002, "output": 0.0006},
+        "open-mistral-nemo": {"input": 0.00015, "output": 0.00015},
+        "codestral-latest": {"input": 0.0003, "output": 0.0009},
+        "mistral-embed": {"input": 0.0001, "output": 0.0},
+    },
+    "cohere": {
+        "command-a-03-2025": {"input": 0.0025, "output": 0.01},
+        "command-r-plus": {"input": 0.0025, "output": 0.01},
+        "command-r": {"input": 0.00015, "output": 0.0006},
+        "command-r7b-12-2024": {"input": 0.0000375, "output": 0.00015},
+        "embed-english-v3.0": {"input": 0.0001, "output": 0.0},
+        "embed-multilingual-v3.0": {"input": 0.0001, "output": 0.0},
+    },
 }
 
 # Cache configuration
 CACHE_DIR = Path.home() / ".spend_hawk"
-CACHE_FILE = CACHE_DIR / "pricing.json"
+CACHE_FILE = CACHE_DIR / "pricing.bin"
 CACHE_TTL_DAYS = 7
 PRICING_API_URL = "https://spendhawk-backend.vercel.app/api/v1/pricing"
 
-# Global pricing cache
-_pricing_cache: Optional[Dict] = None
-_cache_loaded_at: Optional[float] = None
+# JSON cache written by earlier releases; read once if there is no binary cache
+LEGACY_CACHE_FILE = CACHE_DIR / "pricing.json"
+
+# Binary cache header: magic, then the marshal format version
+_CACHE_MAGIC = b"SHPC"
+
+# Instance-manipulation (RFC 3229) the SDK accepts for delta responses
+DELTA_IM = "spendhawk-delta"
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of a JSON-like value (dicts become mapping proxies)."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain dict/list copy of a frozen value, for serializing or patching."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def pricing_version(pricing: Mapping) -> str:
+    """
+    Content hash identifying a pricing table.
+    
+    Identical tables get the same version in every process, so metrics
+    from different workers can be grouped by the prices they were costed
+    with.
+    
+    Args:
+        pricing: Model -> rate card table
+        
+    Returns:
+        12 hex digit version string
+    """
+    canonical = json.dumps(_thaw(pricing), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+class PricingSnapshot:
+    """
+    One immutable version of the pricing table.
+    
+    The table (including every rate card) is a read-only copy and the model
+    resolution index is built before the snapshot is published. Updates
+    build a new snapshot and swap it in with a single assignment, so a
+    reader holding a snapshot sees one consistent table for as long as it
+    uses it.
+    """
+    
+    __slots__ = ("table", "version", "source", "updated_at", "etag", "index")
+    
+    table: Mapping[str, Any]
+    version: str
+    source: str
+    updated_at: Optional[float]
+    etag: Optional[str]
+    index: ModelIndex
+    
+    def __init__(
+        self,
+        pricing: Mapping,
+        source: str,
+        updated_at: Optional[float] = None,
+        etag: Optional[str] = None,
+        version: Optional[str] = None
+    ):
+        """
+        Args:
+            pricing: Model -> rate card table (copied)
+            source: "backend", "cache" or "fallback"
+            updated_at: When the data was fetched from the backend
+            etag: Backend ETag of the table, for conditional refreshes
+            version: Known content version (computed if omitted)
+        """
+        table = _freeze(pricing)
+        set_slot = object.__setattr__
+        set_slot(self, "table", table)
+        set_slot(self, "version", version or pricing_version(table))
+        set_slot(self, "source", source)
+        set_slot(self, "updated_at", updated_at)
+        set_slot(self, "etag", etag)
+        set_slot(self, "index", ModelIndex(table))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("PricingSnapshot is immutable")
+    
+    def renewed(self, updated_at: float) -> "PricingSnapshot":
+        """Same table confirmed current by the backend at ``updated_at``."""
+        snapshot = object.__new__(PricingSnapshot)
+        for name in self.__slots__:
+            object.__setattr__(snapshot, name, getattr(self, name))
+        object.__setattr__(snapshot, "source", "backend")
+        object.__setattr__(snapshot, "updated_at", updated_at)
+        return snapshot
+    
+    def __repr__(self) -> str:
+        return f"PricingSnapshot(version={self.version!r}, source={self.source!r}, models={len(self.table)})"
+
+
+# Current snapshot; replaced as a whole, never modified
+_snapshot: Optional[PricingSnapshot] = None
+
+# Snapshot of FALLBACK_PRICING, built on first use
+_fallback: Optional[PricingSnapshot] = None
+
+# Single-flight guards: one initialization and one backend fetch at a time
+_init_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+
+# Background refresh started by init_pricing()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _reset_locks_after_fork():
+    """Locks held by other threads at fork time would never be released."""
+    global _init_lock, _refresh_lock, _refresh_thread
+    
+    _init_lock = threading.Lock()
+    _refresh_lock = threading.Lock()
+    _refresh_thread = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
 
 
 def _ensure_cache_dir():
@@ -50,165 +234,418 @@ def _ensure_cache_dir():
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _fetch_pricing_from_backend() -> Optional[Dict]:
+@contextmanager
+def _host_lock():
+    """
+    Hold an exclusive lock shared by every process using this cache dir.
+    
+    Lets one worker on a host refresh the cache while the others wait and
+    then reuse its result. A no-op where file locks are unavailable.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        _ensure_cache_dir()
+        lock_file = open(CACHE_DIR / "pricing.lock", "a")
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _apply_delta(table: Mapping, delta: Dict) -> Dict:
+    """
+    Apply a delta response to a table.
+    
+    Args:
+        table: Table the delta was computed against
+        delta: {"changed": {model: rate card}, "removed": [model, ...]}
+        
+    Returns:
+        New plain table
+    """
+    pricing = _thaw(table)
+    pricing.update(delta.get("changed") or {})
+    for model in delta.get("removed") or ():
+        pricing.pop(model, None)
+    return pricing
+
+
+def _fetch_pricing_from_backend(current: Optional[PricingSnapshot] = None) -> Optional[PricingSnapshot]:
     """
     Fetch pricing data from backend API.
     
+    When ``current`` came from the backend, the request is conditional on
+    its ETag: the backend answers 304 if nothing changed, or 226 with only
+    the changed and removed models (RFC 3229 delta encoding), instead of
+    resending the whole table.
+    
+    Args:
+        current: Snapshot in use, if any
+        
     Returns:
-        Dict of pricing data, or None if fetch fails
+        New snapshot (``current`` renewed if unchanged), or None if the
+        fetch fails
     """
+    headers = {}
+    if current is not None and current.etag:
+        headers["If-None-Match"] = current.etag
+        headers["A-IM"] = DELTA_IM
+    
     try:
-        req = Request(PRICING_API_URL, headers={"User-Agent": "spend-hawk-sdk/0.1.2"})
-        with urlopen(req, timeout=5) as response:
-            if response.status == 200:
-                data = json.loads(response.read().decode("utf-8"))
-                return data
-    except (URLError, json.JSONDecodeError, Exception):
+        response = transport.get(PRICING_API_URL, headers=headers or None, timeout=5)
+        if current is not None and response.status_code == 304 and headers:
+            return current.renewed(time.time())
+        if current is not None and response.status_code == 226 and headers:
+            pricing = _apply_delta(current.table, response.json())
+        elif response.status_code == 200:
+            pricing = response.json()
+        else:
+            return None
+        
+        etag = response.headers.get("ETag")
+        return PricingSnapshot(
+            pricing, "backend", time.time(), etag if isinstance(etag, str) else None
+        )
+    except Exception:
         pass
     
     return None
 
 
-def _save_pricing_to_cache(pricing: Dict):
+def _save_pricing_to_cache(snapshot: PricingSnapshot):
     """
-    Save pricing data to local cache file.
+    Save a snapshot to the local cache file.
+    
+    The cache is a marshal-encoded dict (compact, loads without JSON
+    parsing). It is written to a temp file and renamed into place, so other
+    processes reading it concurrently see the old or the new file, never a
+    partial one.
     
     Args:
-        pricing: Pricing data to cache
+        snapshot: Pricing snapshot to cache
     """
     try:
         _ensure_cache_dir()
-        cache_data = {
-            "pricing": pricing,
-            "cached_at": time.time()
-        }
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache_data, f, indent=2)
+        blob = _CACHE_MAGIC + bytes([marshal.version]) + marshal.dumps({
+            "pricing": _thaw(snapshot.table),
+            "cached_at": snapshot.updated_at or time.time(),
+            "etag": snapshot.etag,
+            "version": snapshot.version,
+        })
+        import tempfile
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".pricing-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
     except Exception:
         pass  # Fail silently if cache write fails
 
 
-def _load_pricing_from_cache() -> Optional[Dict]:
+def _read_cache_file() -> Optional[Dict]:
     """
-    Load pricing data from local cache if not expired.
+    Read the local cache file regardless of its age.
+    
+    Falls back to the JSON cache of earlier releases if there is no
+    binary cache yet.
     
     Returns:
-        Dict of pricing data, or None if cache is invalid/expired
+        Dict with "pricing", "cached_at" and optionally "etag" and
+        "version", or None if missing/unreadable
     """
     try:
-        if not CACHE_FILE.exists():
+        with open(CACHE_FILE, "rb") as f:
+            blob = f.read()
+        header = len(_CACHE_MAGIC)
+        if blob[:header] == _CACHE_MAGIC and blob[header:header + 1] == bytes([marshal.version]):
+            data = marshal.loads(blob[header + 1:])
+            if isinstance(data, dict):
+                return data
+    except Exception:
+        pass
+    
+    try:
+        if not LEGACY_CACHE_FILE.exists():
             return None
         
-        with open(CACHE_FILE, "r") as f:
-            cache_data = json.load(f)
-        
-        cached_at = cache_data.get("cached_at", 0)
-        age_seconds = time.time() - cached_at
-        age_days = age_seconds / (24 * 3600)
-        
-        # Check if cache is still valid
-        if age_days < CACHE_TTL_DAYS:
-            return cache_data.get("pricing")
+        with open(LEGACY_CACHE_FILE, "r") as f:
+            return json.load(f)
     except Exception:
-        pass
+        return None
+
+
+def _cache_is_fresh(cache_data: Dict) -> bool:
+    """Check whether cached pricing is younger than CACHE_TTL_DAYS."""
+    cached_at = cache_data.get("cached_at", 0)
+    age_days = (time.time() - cached_at) / (24 * 3600)
+    return age_days < CACHE_TTL_DAYS
+
+
+def _snapshot_from_cache(cache_data: Dict) -> Optional[PricingSnapshot]:
+    """Build a snapshot from cache file contents, if they hold a table."""
+    if not cache_data.get("pricing"):
+        return None
+    return PricingSnapshot(
+        cache_data["pricing"],
+        "cache",
+        cache_data.get("cached_at"),
+        cache_data.get("etag"),
+        cache_data.get("version")
+    )
+
+
+def _fallback_pricing() -> Dict:
+    """Flatten FALLBACK_PRICING into a model -> prices table."""
+    pricing = {}
+    for provider, models in FALLBACK_PRICING.items():
+        for model, prices in models.items():
+            pricing[model] = prices
+    return pricing
+
+
+def _fallback_snapshot() -> PricingSnapshot:
+    """Snapshot of the hardcoded fallback table."""
+    global _fallback
     
-    return None
+    if _fallback is None:
+        _fallback = PricingSnapshot(_fallback_pricing(), "fallback")
+    return _fallback
+
+
+def _install(snapshot: PricingSnapshot):
+    """Publish a snapshot; a single reference swap readers can't observe halfway."""
+    global _snapshot
+    
+    _snapshot = snapshot
+
+
+def _refresh_in_background():
+    """Start a daemon thread that fetches fresh pricing, if none is running."""
+    global _refresh_thread
+    
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return
+    
+    _refresh_thread = threading.Thread(
+        target=_background_refresh,
+        name="spend-hawk-pricing-refresh",
+        daemon=True
+    )
+    _refresh_thread.start()
+
+
+def _background_refresh():
+    """
+    Refresh the table, sharing the work with other local processes.
+    
+    Waits for the host-wide cache lock; if another process refreshed the
+    cache in the meantime, its table is adopted instead of fetching again.
+    Otherwise the fetch is conditional on the table's ETag, so checking an
+    unchanged table costs a 304.
+    """
+    with _host_lock():
+        current = _snapshot
+        cache_data = _read_cache_file()
+        if cache_data and _cache_is_fresh(cache_data):
+            known = current.updated_at if current is not None and current.updated_at else 0
+            if cache_data.get("cached_at", 0) > known:
+                snapshot = _snapshot_from_cache(cache_data)
+                if snapshot is not None:
+                    _install(snapshot)
+                    return
+        refresh_pricing()
 
 
-def init_pricing():
+def init_pricing(background: bool = True):
     """
     Initialize pricing data on SDK startup.
     
-    Tries in order:
+    By default this never waits on the network: the local cache (even if
+    stale) or the hardcoded fallback is used immediately, and a background
+    thread checks the backend for a newer table and swaps it in when it
+    arrives. The check is conditional, so price changes reach a running
+    fleet on its next start without a cache younger than 7 days costing
+    more than a 304.
+    
+    With ``background=False`` it tries in order:
     1. Fetch from backend API
     2. Load from local cache (if < 7 days old)
     3. Use hardcoded fallback
     
+    Initialization is single-flight: concurrent blocking callers wait for
+    the one fetch in progress, and non-blocking callers that find another
+    thread initializing return at once (lookups use the fallback table
+    until the snapshot is published).
+    
     This is called automatically on first use.
-    """
-    global _pricing_cache, _cache_loaded_at
     
-    if _pricing_cache is not None:
+    Args:
+        background: Refresh from the backend without blocking the caller
+    """
+    if _snapshot is not None:
         return  # Already initialized
     
-    # Try to fetch from backend
-    pricing = _fetch_pricing_from_backend()
-    if pricing:
-        _pricing_cache = pricing
-        _cache_loaded_at = time.time()
-        _save_pricing_to_cache(pricing)
-        return
+    if not _init_lock.acquire(blocking=not background):
+        return  # Another thread is initializing
+    try:
+        if _snapshot is not None:
+            return
+        
+        if background:
+            cache_data = _read_cache_file()
+            snapshot = _snapshot_from_cache(cache_data) if cache_data else None
+            if snapshot is not None:
+                _install(snapshot)
+            else:
+                _install(_fallback_snapshot())
+            
+            _refresh_in_background()
+            return
+        
+        # Try to fetch from backend
+        if refresh_pricing():
+            return
+        
+        # Try to load from cache
+        cache_data = _read_cache_file()
+        if cache_data and _cache_is_fresh(cache_data):
+            snapshot = _snapshot_from_cache(cache_data)
+            if snapshot is not None:
+                _install(snapshot)
+                return
+        
+        # Fall back to hardcoded pricing
+        _install(_fallback_snapshot())
+    finally:
+        _init_lock.release()
+
+
+def get_pricing_snapshot() -> PricingSnapshot:
+    """
+    Get the current pricing snapshot, initializing pricing if needed.
     
-    # Try to load from cache
-    pricing = _load_pricing_from_cache()
-    if pricing:
-        _pricing_cache = pricing
-        _cache_loaded_at = time.time()
-        return
+    Hold on to the returned snapshot to cost several calls against the
+    same table and report its ``version``.
     
-    # Fall back to hardcoded pricing
-    _pricing_cache = {}
-    for provider, models in FALLBACK_PRICING.items():
-        for model, prices in models.items():
-            _pricing_cache[model] = prices
-    _cache_loaded_at = time.time()
+    Returns:
+        Current PricingSnapshot
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        init_pricing()
+        snapshot = _snapshot or _fallback_snapshot()
+    return snapshot
 
 
-def get_pricing() -> Dict:
+def get_pricing() -> Mapping:
     """
     Get current pricing data.
     
     Returns:
-        Dict mapping model name to {"input": float, "output": float}
+        Read-only mapping of model name to {"input": float, "output": float}
     """
-    if _pricing_cache is None:
-        init_pricing()
+    return get_pricing_snapshot().table
+
+
+def resolve_model(model: str) -> Optional[str]:
+    """
+    Find the pricing table entry for a model name as reported by a provider.
     
-    return _pricing_cache or {}
+    Handles dated and versioned ids ("gpt-4o-2024-08-06"), resource paths
+    ("models/gemini-1.5-pro-002") and other aliases of known models.
+    
+    Args:
+        model: Model name from the response
+        
+    Returns:
+        Key of the matching pricing entry, or None if unknown
+    """
+    if not isinstance(model, str):
+        return None
+    return get_pricing_snapshot().index.resolve(model)
 
 
 def calculate_cost(
     model: str,
     input_tokens: int,
-    output_tokens: int
+    output_tokens: int,
+    usage: Optional[Dict[str, Any]] = None,
+    snapshot: Optional[PricingSnapshot] = None
 ) -> float:
     """
     Calculate cost for an API call.
     
     Args:
-        model: Model name (e.g., "gpt-4", "claude-3-opus-20240229")
-        input_tokens: Number of input tokens
-        output_tokens: Number of output tokens
+        model: Model name (e.g., "gpt-4", "gpt-4o-2024-08-06"), resolved
+            through ``resolve_model``
+        input_tokens: Number of input tokens, including any cached, cache
+            write, image and audio tokens
+        output_tokens: Number of output tokens, including audio output
+        usage: Optional breakdown (``cached_input_tokens``,
+            ``cache_write_tokens``, ``image_input_tokens``,
+            ``audio_input_tokens``, ``audio_output_tokens``, ``batch``)
+            priced by the model's rate card
+        snapshot: Pricing snapshot to use (defaults to the current one)
         
     Returns:
         Cost in USD
     """
-    pricing = get_pricing()
-    model_pricing = pricing.get(model, {})
-    
-    if not model_pricing:
+    if not isinstance(model, str):
         return 0.0
-    
-    # Pricing is per 1K tokens
-    input_cost = (input_tokens / 1000) * model_pricing.get("input", 0)
-    output_cost = (output_tokens / 1000) * model_pricing.get("output", 0)
-    
-    return round(input_cost + output_cost, 6)
+    snapshot = snapshot or get_pricing_snapshot()
+    return snapshot.index.evaluator(model)(input_tokens, output_tokens, usage)
 
 
 def refresh_pricing():
     """
     Force refresh pricing data from backend.
     
-    This bypasses the cache and fetches fresh data from the API.
-    """
-    global _pricing_cache, _cache_loaded_at
+    This bypasses the cache and asks the backend for fresh data, sending
+    the current ETag so an unchanged table costs a 304 and a changed one
+    only its delta. Concurrent calls share one fetch. The new snapshot
+    replaces the old one in a single assignment, so concurrent readers see
+    either the old or the new table, never a mix.
     
-    pricing = _fetch_pricing_from_backend()
-    if pricing:
-        _pricing_cache = pricing
-        _cache_loaded_at = time.time()
-        _save_pricing_to_cache(pricing)
+    Returns:
+        True if fresh pricing was loaded
+    """
+    with _refresh_lock:
+        snapshot = _fetch_pricing_from_backend(_snapshot)
+        if snapshot is None:
+            return False
+        
+        _install(snapshot)
+        _save_pricing_to_cache(snapshot)
+        logger.debug(f"Pricing refreshed from backend (version {snapshot.version})")
         return True
+
+
+def pricing_status() -> Dict:
+    """
+    Describe the pricing table currently in use, without loading one.
     
-    return False
+    Returns:
+        Dict with source ("backend", "cache", "fallback" or None if not
+        loaded yet), version, number of models, and age_seconds of the
+        data (None for the hardcoded fallback)
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        return {"source": None, "version": None, "models": 0, "age_seconds": None}
+    updated_at = snapshot.updated_at
+    return {
+        "source": snapshot.source,
+        "version": snapshot.version,
+        "models": len(snapshot.table),
+        "age_seconds": time.time() - updated_at if updated_at is not None else None,
+    }
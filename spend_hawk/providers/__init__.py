@@ -1,7 +1,33 @@
 """Provider patching modules."""
-from .openai import patch_openai, unpatch_openai
-from .anthropic import patch_anthropic, unpatch_anthropic
-from .google import patch_google, unpatch_google
+
+# Provider modules are imported when first used (i.e. when patched)
+_LAZY_EXPORTS = {
+    'patch_openai': '.openai',
+    'unpatch_openai': '.openai',
+    'patch_anthropic': '.anthropic',
+    'unpatch_anthropic': '.anthropic',
+    'patch_google': '.google',
+    'unpatch_google': '.google',
+    'patch_mistral': '.mistral',
+    'unpatch_mistral': '.mistral',
+    'patch_cohere': '.cohere',
+    'unpatch_cohere': '.cohere',
+    'Adapter': '.registry',
+    'register_provider': '.registry',
+    'patch_provider': '.registry',
+    'unpatch_provider': '.registry',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'patch_openai',
@@ -10,4 +36,12 @@ __all__ = [
     'unpatch_anthropic',
     'patch_google',
     'unpatch_google',
+    'patch_mistral',
+    'unpatch_mistral',
+    'patch_cohere',
+    'unpatch_cohere',
+    'Adapter',
+    'register_provider',
+    'patch_provider',
+    'unpatch_provider',
 ]
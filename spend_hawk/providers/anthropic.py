@@ -1,94 +1,51 @@
 """Anthropic provider patching."""
-import logging
-from functools import wraps
-
-from ..utils import Timer
-from .base import send_metric
-
-logger = logging.getLogger(__name__)
-
-_original_create = None
-_patched = False
+from .base import nonzero, token_count
+from .registry import STREAM_KWARG, Adapter, patch_provider, register_provider, unpatch_provider
+from .streaming import StreamUsage
+
+# Anthropic reports prompt-cache reads and writes separately from
+# input_tokens; the SDK counts them as part of the input, with the
+# breakdown priced by the rate card
+_CACHE_DETAILS = {
+    "cached_input_tokens": "cache_read_input_tokens",
+    "cache_write_tokens": "cache_creation_input_tokens",
+}
+
+
+def _extract_stream_event(event, usage: StreamUsage):
+    """Read model and usage from Anthropic stream events."""
+    event_type = event.type
+    if event_type == "message_start":
+        message = event.message
+        usage.model = message.model
+        cache_read = token_count(message.usage, "cache_read_input_tokens")
+        cache_write = token_count(message.usage, "cache_creation_input_tokens")
+        usage.input_tokens = message.usage.input_tokens + cache_read + cache_write
+        usage.output_tokens = message.usage.output_tokens
+        usage.details = nonzero(cached_input_tokens=cache_read, cache_write_tokens=cache_write)
+    elif event_type == "message_delta":
+        # Cumulative output token count for the message
+        usage.output_tokens = event.usage.output_tokens
+
+
+MESSAGES = Adapter(
+    "anthropic", "anthropic.resources.messages",
+    methods=("Messages.create",),
+    async_methods=("AsyncMessages.create",),
+    details=_CACHE_DETAILS,
+    input_includes=tuple(_CACHE_DETAILS),
+    stream=STREAM_KWARG,
+    stream_extractor=_extract_stream_event,
+)
+
+register_provider("anthropic", "Anthropic", (MESSAGES,))
 
 
 def patch_anthropic():
     """Patch Anthropic API to intercept responses."""
-    global _original_create, _patched
-    
-    if _patched:
-        logger.debug("Anthropic already patched")
-        return
-    
-    try:
-        from anthropic.resources.messages import Messages
-        
-        # Patch create method
-        _original_create = Messages.create
-        Messages.create = _patched_create
-        
-        logger.info("Successfully patched Anthropic")
-        _patched = True
-        
-    except ImportError:
-        logger.warning("Anthropic library not installed, skipping patch")
-    except Exception as e:
-        logger.error(f"Failed to patch Anthropic: {e}", exc_info=True)
-
-
-def _patched_create(self, *args, **kwargs):
-    """Patched version of Anthropic create method."""
-    timer = Timer()
-    timer.start()
-    
-    try:
-        # Call original method
-        response = _original_create(self, *args, **kwargs)
-        
-        # Extract metrics from response
-        latency_ms = timer.stop()
-        
-        try:
-            model = response.model
-            usage = response.usage
-            
-            if usage:
-                input_tokens = usage.input_tokens
-                output_tokens = usage.output_tokens
-                
-                # Send metric
-                send_metric(
-                    provider="anthropic",
-                    model=model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    latency_ms=latency_ms
-                )
-        except Exception as e:
-            logger.error(f"Error extracting Anthropic metrics: {e}", exc_info=True)
-        
-        return response
-        
-    except Exception as e:
-        # If original call fails, still track the latency
-        timer.stop()
-        raise
+    patch_provider("anthropic")
 
 
 def unpatch_anthropic():
     """Restore original Anthropic methods."""
-    global _original_create, _patched
-    
-    if not _patched:
-        return
-    
-    try:
-        from anthropic.resources.messages import Messages
-        
-        if _original_create:
-            Messages.create = _original_create
-        
-        _patched = False
-        logger.info("Anthropic unpatched")
-        
-    except Exception as e:
-        logger.error(f"Error unpatching Anthropic: {e}", exc_info=True)
+    unpatch_provider("anthropic")
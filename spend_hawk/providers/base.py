@@ -1,58 +1,114 @@
 """Base patching logic shared across providers."""
 import logging
-from typing import Dict, Any, Optional
-
-from ..client import client
-from ..context import get_context
+import time
+from typing import Any, Dict, Optional
+from ..client import get_client
+from ..async_client import get_async_client
+from ..context import capture_context
 from ..config import config
-from ..utils import calculate_cost, get_timestamp
+from ..records import MetricRecord
+from ..telemetry import send_metric_seconds, wrapper_overhead_seconds
+from ..utils import overhead_us
 
 logger = logging.getLogger(__name__)
 
 
+def token_count(obj: Any, *path: str) -> int:
+    """
+    Read a nested token count from a provider usage object.
+    
+    Args:
+        obj: Usage object
+        *path: Attribute names to follow (e.g. "prompt_tokens_details",
+            "cached_tokens")
+        
+    Returns:
+        The count, or 0 when any attribute is missing or not an integer
+    """
+    for name in path:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return 0
+    return obj if isinstance(obj, int) and not isinstance(obj, bool) else 0
+
+
+def nonzero(**counts: int) -> Dict[str, int]:
+    """Keep only the usage breakdown fields that were actually reported."""
+    return {name: n for name, n in counts.items() if n}
+
+
 def send_metric(
     provider: str,
     model: str,
     input_tokens: int,
     output_tokens: int,
-    latency_ms: int,
+    latency_ms: float,
+    sdk_overhead_us: Optional[int] = None,
+    returned_ns: Optional[int] = None,
+    before_call_ns: int = 0,
     **extra_fields
 ):
     """
     Send metric to backend asynchronously.
     
+    Only a raw record is captured here, on the caller's thread. Cost,
+    context defaults and the timestamp string are filled in by the export
+    pipeline when the metric is sent.
+    
     Args:
         provider: Provider name (openai, anthropic)
         model: Model name
         input_tokens: Number of input tokens
         output_tokens: Number of output tokens
-        latency_ms: Latency in milliseconds
-        **extra_fields: Additional fields to include
+        latency_ms: Provider call latency in milliseconds (fractional
+            values keep microsecond resolution)
+        sdk_overhead_us: Time spent in the SDK's own wrapper around the call
+        returned_ns: ``perf_counter_ns()`` reading when the provider call
+            returned (or a stream ended). When given, ``sdk_overhead_us``
+            is measured here, right before the record is handed off, so it
+            includes building the record and capturing context.
+        before_call_ns: Wrapper time spent before the provider call, added
+            to the measured overhead
+        **extra_fields: Additional fields to include, including the usage
+            breakdown priced by rate cards (``cached_input_tokens``,
+            ``cache_write_tokens``, ``image_input_tokens``,
+            ``audio_input_tokens``, ``audio_output_tokens``, ``batch``)
     """
+    started = time.perf_counter_ns()
     try:
-        # Get context
-        ctx = get_context()
-        
-        # Calculate cost
-        cost = calculate_cost(provider, model, input_tokens, output_tokens)
-        
-        # Build metric payload
-        metric = {
-            "provider": provider,
-            "model": model,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "cost": cost,
-            "latency_ms": latency_ms,
-            "timestamp": get_timestamp(),
-            "project_id": ctx.get('project_id') or config.project_id,
-            "agent": ctx.get('agent') or config.agent,
-            **extra_fields
-        }
+        metric = MetricRecord(
+            provider,
+            model,
+            input_tokens,
+            output_tokens,
+            latency_ms,
+            capture_context(),
+            extra_fields,
+            sdk_overhead_us
+        )
         
-        # Send asynchronously
-        client.send_async(metric)
+        # Send asynchronously: to the local collector when configured (a
+        # non-blocking datagram), on the running event loop when there is
+        # one, otherwise through the background worker thread, which also
+        # builds rollups and writes the durable spool
+        use_loop = (
+            config.async_transport
+            and not config.collector_socket
+            and not config.spool_enabled
+            and not config.rollup_enabled_for(metric.context[0])
+        )
+        async_client = get_async_client() if use_loop else None
+        if returned_ns is not None:
+            sdk_overhead_us = metric.sdk_overhead_us = overhead_us(before_call_ns, returned_ns)
+        if async_client is not None:
+            async_client.send(metric)
+        else:
+            get_client().send_async(metric)
         
     except Exception as e:
         # Never crash user code
         logger.error(f"Error sending metric: {e}", exc_info=True)
+    finally:
+        send_metric_seconds.observe((time.perf_counter_ns() - started) / 1e9)
+        if sdk_overhead_us is not None:
+            wrapper_overhead_seconds.observe(sdk_overhead_us / 1e6)
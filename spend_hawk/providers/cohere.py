@@ -0,0 +1,47 @@
+"""Cohere provider patching (v2 client, cohere >= 5.10)."""
+from .registry import STREAM_ALWAYS, Adapter, patch_provider, register_provider, unpatch_provider
+
+# Cohere responses don't name the model, so it is read from the call, and
+# costs follow billed_units (what Cohere charges for) rather than tokens
+CHAT = Adapter(
+    "cohere", "cohere.v2.client",
+    methods=("V2Client.chat",),
+    async_methods=("AsyncV2Client.chat",),
+    model="kwargs.model",
+    input_tokens="billed_units.input_tokens",
+    output_tokens="billed_units.output_tokens",
+)
+
+# The message-end event's delta carries the usage
+CHAT_STREAM = Adapter(
+    "cohere", "cohere.v2.client",
+    methods=("V2Client.chat_stream",),
+    async_methods=("AsyncV2Client.chat_stream",),
+    model="kwargs.model",
+    stream=STREAM_ALWAYS,
+    chunk_usage="delta.usage",
+    input_tokens="billed_units.input_tokens",
+    output_tokens="billed_units.output_tokens",
+)
+
+EMBED = Adapter(
+    "cohere", "cohere.v2.client",
+    methods=("V2Client.embed",),
+    async_methods=("AsyncV2Client.embed",),
+    model="kwargs.model",
+    usage="meta",
+    input_tokens="billed_units.input_tokens",
+    output_tokens=None,
+)
+
+register_provider("cohere", "Cohere", (CHAT, CHAT_STREAM, EMBED))
+
+
+def patch_cohere():
+    """Patch Cohere v2 chat, streaming chat and embed."""
+    patch_provider("cohere")
+
+
+def unpatch_cohere():
+    """Restore original Cohere methods."""
+    unpatch_provider("cohere")
@@ -1,97 +1,57 @@
 """Google Generative AI provider patching."""
-import logging
-from functools import wraps
-
-from ..utils import Timer
-from .base import send_metric
-
-logger = logging.getLogger(__name__)
-
-_original_generate_content = None
-_patched = False
+from collections.abc import Sequence
+
+from .base import nonzero, token_count
+from .registry import Adapter, patch_provider, register_provider, unpatch_provider
+
+
+def _modality_counts(details) -> dict:
+    """Sum ModalityTokenCount entries by modality name (IMAGE, AUDIO, ...)."""
+    counts: dict = {}
+    # proto-plus returns a RepeatedComposite here, not a list
+    if not isinstance(details, Sequence) or isinstance(details, str):
+        return counts
+    for entry in details:
+        modality = getattr(entry, "modality", None)
+        modality = str(getattr(modality, "name", modality)).upper()
+        for name in ("IMAGE", "AUDIO"):
+            if name in modality:
+                counts[name] = counts.get(name, 0) + token_count(entry, "token_count")
+    return counts
+
+
+def _usage_details(usage) -> dict:
+    """Cached-content and per-modality token counts from usage_metadata."""
+    prompt = _modality_counts(getattr(usage, "prompt_tokens_details", None))
+    candidates = _modality_counts(getattr(usage, "candidates_tokens_details", None))
+    return nonzero(
+        cached_input_tokens=token_count(usage, "cached_content_token_count"),
+        image_input_tokens=prompt.get("IMAGE", 0),
+        audio_input_tokens=prompt.get("AUDIO", 0),
+        audio_output_tokens=candidates.get("AUDIO", 0),
+    )
+
+
+GENERATE_CONTENT = Adapter(
+    "google", "google.generativeai.generative_models",
+    methods=("GenerativeModel.generate_content",),
+    async_methods=("GenerativeModel.generate_content_async",),
+    # The response doesn't name the model; the GenerativeModel does
+    model="self.model_name",
+    usage="usage_metadata",
+    input_tokens="prompt_token_count",
+    output_tokens="candidates_token_count",
+    details=_usage_details,
+)
+
+register_provider("google", "Google Generative AI", (GENERATE_CONTENT,))
 
 
 def patch_google():
     """Patch Google Generative AI API to intercept responses."""
-    global _original_generate_content, _patched
-    
-    if _patched:
-        logger.debug("Google Generative AI already patched")
-        return
-    
-    try:
-        from google.generativeai.generative_models import GenerativeModel
-        
-        # Patch generate_content method
-        _original_generate_content = GenerativeModel.generate_content
-        GenerativeModel.generate_content = _patched_generate_content
-        
-        logger.info("Successfully patched Google Generative AI")
-        _patched = True
-        
-    except ImportError:
-        logger.warning("Google Generative AI library not installed, skipping patch")
-    except Exception as e:
-        logger.error(f"Failed to patch Google Generative AI: {e}", exc_info=True)
-
-
-def _patched_generate_content(self, *args, **kwargs):
-    """Patched version of Google GenerativeModel.generate_content method."""
-    timer = Timer()
-    timer.start()
-    
-    try:
-        # Call original method
-        response = _original_generate_content(self, *args, **kwargs)
-        
-        # Extract metrics from response
-        latency_ms = timer.stop()
-        
-        try:
-            model = self.model_name
-            
-            # Extract token counts from usage_metadata
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                usage = response.usage_metadata
-                input_tokens = usage.prompt_token_count or 0
-                output_tokens = usage.candidates_token_count or 0
-                
-                # Send metric
-                send_metric(
-                    provider="google",
-                    model=model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    latency_ms=latency_ms
-                )
-            else:
-                logger.debug("No usage_metadata found in Google Generative AI response")
-        except Exception as e:
-            logger.error(f"Error extracting Google Generative AI metrics: {e}", exc_info=True)
-        
-        return response
-        
-    except Exception as e:
-        # If original call fails, still track the latency
-        timer.stop()
-        raise
+    patch_provider("google")
 
 
 def unpatch_google():
     """Restore original Google Generative AI methods."""
-    global _original_generate_content, _patched
-    
-    if not _patched:
-        return
-    
-    try:
-        from google.generativeai.generative_models import GenerativeModel
-        
-        if _original_generate_content:
-            GenerativeModel.generate_content = _original_generate_content
-        
-        _patched = False
-        logger.info("Google Generative AI unpatched")
-        
-    except Exception as e:
-        logger.error(f"Error unpatching Google Generative AI: {e}", exc_info=True)
+    unpatch_provider("google")
@@ -0,0 +1,47 @@
+"""Mistral AI provider patching (mistralai >= 1.0)."""
+from .registry import STREAM_ALWAYS, Adapter, patch_provider, register_provider, unpatch_provider
+
+# mistralai 1.x defines the resources at the top level; later versions
+# moved them under mistralai.client
+_CHAT_MODULES = ("mistralai.chat", "mistralai.client.chat")
+_EMBEDDINGS_MODULES = ("mistralai.embeddings", "mistralai.client.embeddings")
+
+CHAT = Adapter(
+    "mistral", _CHAT_MODULES,
+    methods=("Chat.complete",),
+    async_methods=("Chat.complete_async",),
+    input_tokens="prompt_tokens",
+    output_tokens="completion_tokens",
+)
+
+# chat.stream() yields CompletionEvents; the last one's chunk has usage
+CHAT_STREAM = Adapter(
+    "mistral", _CHAT_MODULES,
+    methods=("Chat.stream",),
+    async_methods=("Chat.stream_async",),
+    stream=STREAM_ALWAYS,
+    chunk_model="data.model",
+    chunk_usage="data.usage",
+    input_tokens="prompt_tokens",
+    output_tokens="completion_tokens",
+)
+
+EMBEDDINGS = Adapter(
+    "mistral", _EMBEDDINGS_MODULES,
+    methods=("Embeddings.create",),
+    async_methods=("Embeddings.create_async",),
+    input_tokens="prompt_tokens",
+    output_tokens=None,
+)
+
+register_provider("mistral", "Mistral", (CHAT, CHAT_STREAM, EMBEDDINGS))
+
+
+def patch_mistral():
+    """Patch Mistral AI chat, streaming chat and embeddings."""
+    patch_provider("mistral")
+
+
+def unpatch_mistral():
+    """Restore original Mistral AI methods."""
+    unpatch_provider("mistral")
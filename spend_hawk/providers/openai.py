@@ -1,98 +1,106 @@
 """OpenAI provider patching."""
-import logging
-from typing import Any
-from functools import wraps
+from ..config import config
+from .registry import STREAM_KWARG, Adapter, patch_provider, register_provider, unpatch_provider
 
-from ..utils import Timer
-from .base import send_metric
+# Cached and audio token counts on chat and legacy completion usage
+_USAGE_DETAILS = {
+    "cached_input_tokens": "prompt_tokens_details.cached_tokens",
+    "audio_input_tokens": "prompt_tokens_details.audio_tokens",
+    "audio_output_tokens": "completion_tokens_details.audio_tokens",
+}
 
-logger = logging.getLogger(__name__)
 
-_original_create = None
-_original_async_create = None
-_patched = False
+def _is_usage_chunk(chunk) -> bool:
+    """The final chunk of an include_usage stream: usage and no choices."""
+    return not getattr(chunk, "choices", None) and getattr(chunk, "usage", None) is not None
+
+
+def _prepare_stream_kwargs(kwargs):
+    """
+    Ask OpenAI for a final usage chunk on streams, unless the caller chose.
+
+    Returns:
+        ``_is_usage_chunk`` when the SDK added the option, so that the
+        chunk the caller didn't ask for is hidden from them
+    """
+    if not kwargs.get("stream") or not config.stream_include_usage:
+        return None
+    options = kwargs.get("stream_options")
+    if options is None:
+        options = {}
+    elif not isinstance(options, dict) or "include_usage" in options:
+        return None
+    kwargs["stream_options"] = {**options, "include_usage": True}
+    return _is_usage_chunk
+
+
+CHAT = Adapter(
+    "openai", "openai.resources.chat.completions",
+    methods=("Completions.create",),
+    async_methods=("AsyncCompletions.create",),
+    input_tokens="prompt_tokens",
+    output_tokens="completion_tokens",
+    details=_USAGE_DETAILS,
+    # Only the final chunk carries usage (with include_usage, added by
+    # _prepare_stream_kwargs)
+    stream=STREAM_KWARG,
+    chunk_model="model",
+    prepare=_prepare_stream_kwargs,
+)
+
+# Embeddings are cheap calls made in bulk: no breakdown, no streaming and
+# no prepare hook, so they get the leanest generated wrapper
+EMBEDDINGS = Adapter(
+    "openai", "openai.resources.embeddings",
+    methods=("Embeddings.create",),
+    async_methods=("AsyncEmbeddings.create",),
+    input_tokens="prompt_tokens",
+    output_tokens=None,
+)
+
+RESPONSES = Adapter(
+    "openai", "openai.resources.responses",
+    methods=("Responses.create",),
+    async_methods=("AsyncResponses.create",),
+    details={
+        "cached_input_tokens": "input_tokens_details.cached_tokens",
+        "reasoning_tokens": "output_tokens_details.reasoning_tokens",
+    },
+    # response.created, response.completed, ... events carry the response;
+    # only the terminal event's response has usage
+    stream=STREAM_KWARG,
+    chunk_model="response.model",
+    chunk_usage="response.usage",
+)
+
+COMPLETIONS = Adapter(
+    "openai", "openai.resources.completions",
+    methods=("Completions.create",),
+    async_methods=("AsyncCompletions.create",),
+    input_tokens="prompt_tokens",
+    output_tokens="completion_tokens",
+    details=_USAGE_DETAILS,
+    stream=STREAM_KWARG,
+    chunk_model="model",
+    prepare=_prepare_stream_kwargs,
+)
+
+# Azure OpenAI clients share these resource classes, so they are covered too
+register_provider("openai", "OpenAI", (CHAT, EMBEDDINGS, RESPONSES, COMPLETIONS))
 
 
 def patch_openai():
-    """Patch OpenAI API to intercept responses."""
-    global _original_create, _original_async_create, _patched
-    
-    if _patched:
-        logger.debug("OpenAI already patched")
-        return
-    
-    try:
-        import openai
-        from openai import OpenAI
-        from openai.resources.chat import completions
-        
-        # Patch sync create
-        _original_create = completions.Completions.create
-        completions.Completions.create = _patched_create
-        
-        logger.info("Successfully patched OpenAI")
-        _patched = True
-        
-    except ImportError:
-        logger.warning("OpenAI library not installed, skipping patch")
-    except Exception as e:
-        logger.error(f"Failed to patch OpenAI: {e}", exc_info=True)
-
-
-def _patched_create(self, *args, **kwargs):
-    """Patched version of OpenAI create method."""
-    timer = Timer()
-    timer.start()
-    
-    try:
-        # Call original method
-        response = _original_create(self, *args, **kwargs)
-        
-        # Extract metrics from response
-        latency_ms = timer.stop()
-        
-        try:
-            model = response.model
-            usage = response.usage
-            
-            if usage:
-                input_tokens = usage.prompt_tokens
-                output_tokens = usage.completion_tokens
-                
-                # Send metric
-                send_metric(
-                    provider="openai",
-                    model=model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    latency_ms=latency_ms
-                )
-        except Exception as e:
-            logger.error(f"Error extracting OpenAI metrics: {e}", exc_info=True)
-        
-        return response
-        
-    except Exception as e:
-        # If original call fails, still track the latency
-        timer.stop()
-        raise
+    """
+    Patch OpenAI API to intercept responses.
+
+    Covers chat completions, embeddings, the Responses API and legacy
+    completions on both sync and async clients; endpoints missing from
+    the installed SDK version (e.g. ``responses`` before openai 1.66) are
+    skipped.
+    """
+    patch_provider("openai")
 
 
 def unpatch_openai():
     """Restore original OpenAI methods."""
-    global _original_create, _patched
-    
-    if not _patched:
-        return
-    
-    try:
-        from openai.resources.chat import completions
-        
-        if _original_create:
-            completions.Completions.create = _original_create
-        
-        _patched = False
-        logger.info("OpenAI unpatched")
-        
-    except Exception as e:
-        logger.error(f"Error unpatching OpenAI: {e}", exc_info=True)
+    unpatch_provider("openai")
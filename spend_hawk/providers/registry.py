@@ -0,0 +1,540 @@
+"""Declarative provider adapters and the wrappers generated from them."""
+import inspect
+import logging
+import time
+from functools import wraps
+from importlib import import_module
+from types import MappingProxyType, ModuleType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .base import send_metric
+from .streaming import AsyncTrackedStream, ChunkFilter, Extractor, StreamUsage, TrackedStream
+
+logger = logging.getLogger(__name__)
+
+# Stream handling modes
+STREAM_KWARG = "kwarg"  # Streams when called with stream=True
+STREAM_ALWAYS = "always"  # Method only ever returns a stream
+
+# (usage object) -> (input tokens, output tokens, usage breakdown)
+UsageReader = Callable[[Any], Tuple[int, int, Mapping[str, int]]]
+
+
+def _path_getter(path: str) -> Callable[[Any], Any]:
+    """
+    Compile a dotted attribute path into a getter.
+
+    Missing attributes anywhere along the path give None, via
+    ``getattr`` defaults rather than ``hasattr`` checks or exceptions.
+    """
+    names = path.split(".") if path else []
+    if not names:
+        return lambda obj: obj
+    if len(names) == 1:
+        (name,) = names
+        return lambda obj: getattr(obj, name, None)
+    if len(names) == 2:
+        first, second = names
+        return lambda obj: getattr(getattr(obj, first, None), second, None)
+
+    def get(obj):
+        for name in names:
+            obj = getattr(obj, name, None)
+        return obj
+    return get
+
+
+def _as_count(value: Any) -> int:
+    """
+    A token count as an int; anything else reads as 0.
+
+    Some SDKs (Cohere's billed units) type counts as floats, so integral
+    floats are accepted too.
+    """
+    if type(value) is int:
+        return value
+    if type(value) is float and value.is_integer():
+        return int(value)
+    return 0
+
+
+def _count_getter(path: Optional[str]) -> Callable[[Any], int]:
+    """Compile a path to a token count; see ``_as_count``."""
+    if not path:
+        return lambda obj: 0
+    names = path.split(".")
+    if len(names) == 1:
+        (name,) = names
+        return lambda obj: _as_count(getattr(obj, name, None))
+    if len(names) == 2:
+        first, second = names
+        return lambda obj: _as_count(getattr(getattr(obj, first, None), second, None))
+
+    get = _path_getter(path)
+    return lambda obj: _as_count(get(obj))
+
+
+def _model_getter(path: str) -> Callable[[Any, Dict[str, Any], Any], Any]:
+    """
+    Compile a model path rooted at ``response``, ``self`` or ``kwargs``.
+
+    Returns:
+        Function of (instance, call kwargs, response) returning the model
+    """
+    root, _, rest = path.partition(".")
+    if root == "kwargs":
+        key, _, rest = rest.partition(".")
+        if not rest:
+            return lambda instance, kwargs, response: kwargs.get(key)
+        get = _path_getter(rest)
+        return lambda instance, kwargs, response: get(kwargs.get(key))
+    if root not in ("response", "self"):
+        raise ValueError(f"Model path must start with response., self. or kwargs.: {path!r}")
+
+    if "." not in rest:
+        # The common case, a plain attribute, in a single getattr
+        if root == "response":
+            return lambda instance, kwargs, response: getattr(response, rest, None)
+        return lambda instance, kwargs, response: getattr(instance, rest, None)
+    get = _path_getter(rest)
+    if root == "response":
+        return lambda instance, kwargs, response: get(response)
+    return lambda instance, kwargs, response: get(instance)
+
+
+# Breakdown of endpoints that report none; shared, so read-only
+_NO_DETAILS: Mapping[str, int] = MappingProxyType({})
+
+
+class Adapter:
+    """
+    Declarative description of how to instrument one SDK endpoint.
+
+    An adapter names the methods to wrap and where usage lives on what
+    they return; ``wrap`` generates the instrumented method from that.
+    Every attribute path is compiled to a getter once, when the adapter
+    is built, so a call only pays for the lookups it needs.
+
+    Example (Mistral chat)::
+
+        Adapter(
+            "mistral", "mistralai.chat",
+            methods=("Chat.complete",),
+            async_methods=("Chat.complete_async",),
+            input_tokens="prompt_tokens",
+            output_tokens="completion_tokens",
+        )
+    """
+
+    __slots__ = (
+        "provider", "modules", "methods", "async_methods", "model", "usage",
+        "stream", "prepare", "read_usage", "track", "extract_chunk",
+        "_stream_model",
+    )
+
+    def __init__(
+        self,
+        provider: str,
+        module: Union[str, Sequence[str]],
+        methods: Sequence[str] = (),
+        async_methods: Sequence[str] = (),
+        model: str = "response.model",
+        usage: str = "usage",
+        input_tokens: str = "input_tokens",
+        output_tokens: Optional[str] = "output_tokens",
+        details: Union[Dict[str, str], Callable[[Any], Dict[str, int]], None] = None,
+        input_includes: Sequence[str] = (),
+        stream: Optional[str] = None,
+        chunk_model: Optional[str] = None,
+        chunk_usage: Optional[str] = None,
+        stream_extractor: Optional[Extractor] = None,
+        prepare: Optional[Callable[[Dict[str, Any]], Optional[ChunkFilter]]] = None,
+    ):
+        """
+        Args:
+            provider: Provider name recorded on metrics
+            module: Module that defines the classes to patch, or several
+                tried in order, for SDKs that moved it between versions
+            methods: Sync methods to wrap, as "Class.method"
+            async_methods: Coroutine or async generator methods to wrap,
+                as "Class.method"
+            model: Where the model name comes from, as a path rooted at
+                ``response``, ``self`` (the client resource) or ``kwargs``
+            usage: Path to the usage object on the response; calls whose
+                response has none are not recorded
+            input_tokens: Path to the input token count on the usage object
+            output_tokens: Path to the output token count, or None for
+                endpoints without output (embeddings)
+            details: Usage breakdown (``cached_input_tokens``, ...) as a
+                mapping of field to path on the usage object, or a function
+                of the usage object returning the non-zero fields
+            input_includes: Breakdown fields the provider reports apart
+                from ``input_tokens`` that count as input
+            stream: None, ``STREAM_KWARG`` or ``STREAM_ALWAYS``
+            chunk_model: Path to the model name on stream chunks
+            chunk_usage: Path to the usage object on stream chunks, read
+                with the same token paths as ``usage``
+            stream_extractor: Custom chunk extractor, for providers whose
+                usage is spread over several events
+            prepare: Hook that may adjust call kwargs before the call. For
+                a stream it may return a predicate for chunks to hide from
+                the caller (chunks only the SDK asked for); they are still
+                read for usage
+        """
+        if stream not in (None, STREAM_KWARG, STREAM_ALWAYS):
+            raise ValueError(f"Unknown stream mode: {stream!r}")
+        self.provider = provider
+        self.modules = (module,) if isinstance(module, str) else tuple(module)
+        self.methods = tuple(methods)
+        self.async_methods = tuple(async_methods)
+        self.model = _model_getter(model)
+        self.usage = _path_getter(usage)
+        self.stream = stream
+        self.prepare = prepare
+        self.read_usage = self._compile_usage_reader(
+            input_tokens, output_tokens, details, input_includes
+        )
+        self.track = self._compile_tracker(usage)
+        # Models not found on the response are known at call time instead
+        self._stream_model = None if model.startswith("response.") else self.model
+        self.extract_chunk = stream_extractor
+        if stream is not None and stream_extractor is None:
+            self.extract_chunk = self._compile_extractor(chunk_model, chunk_usage or "usage")
+
+    @staticmethod
+    def _compile_usage_reader(input_tokens, output_tokens, details, input_includes) -> UsageReader:
+        get_input = _count_getter(input_tokens)
+        get_output = _count_getter(output_tokens)
+
+        if details is None:
+            if output_tokens is None:
+                def read_input(usage):
+                    return get_input(usage), 0, _NO_DETAILS
+                return read_input
+
+            def read(usage):
+                return get_input(usage), get_output(usage), _NO_DETAILS
+            return read
+
+        if callable(details):
+            get_details = details
+        else:
+            fields = tuple((name, _count_getter(path)) for name, path in details.items())
+
+            def get_details(usage):
+                counts = {}
+                for name, get in fields:
+                    n = get(usage)
+                    if n:
+                        counts[name] = n
+                return counts
+
+        includes = tuple(input_includes)
+
+        def read_detailed(usage):
+            counts = get_details(usage)
+            input_count = get_input(usage)
+            for name in includes:
+                input_count += counts.get(name, 0)
+            return input_count, get_output(usage), counts
+        return read_detailed
+
+    def _compile_tracker(self, usage_path: str) -> Callable[..., None]:
+        provider = self.provider
+        get_usage = self.usage
+        # Usage is nearly always a plain attribute; read it without a call
+        usage_attr = usage_path if usage_path and "." not in usage_path else None
+        get_model = self.model
+        read_usage = self.read_usage
+
+        def track(instance, kwargs, response, latency_ns: int, before_call_ns: int, returned_ns: int):
+            """Read usage from a response and send the metric."""
+            try:
+                usage = getattr(response, usage_attr, None) if usage_attr else get_usage(response)
+                if not usage:
+                    logger.debug(f"No usage found in {provider} response")
+                    return
+                input_tokens, output_tokens, details = read_usage(usage)
+                if details:
+                    send_metric(
+                        provider=provider,
+                        model=get_model(instance, kwargs, response),
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                        latency_ms=latency_ns / 1e6,
+                        returned_ns=returned_ns,
+                        before_call_ns=before_call_ns,
+                        **details
+                    )
+                else:
+                    send_metric(
+                        provider=provider,
+                        model=get_model(instance, kwargs, response),
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                        latency_ms=latency_ns / 1e6,
+                        returned_ns=returned_ns,
+                        before_call_ns=before_call_ns,
+                    )
+            except Exception as e:
+                # Never crash user code
+                logger.error(f"Error extracting {provider} metrics: {e}", exc_info=True)
+        return track
+
+    def _compile_extractor(self, chunk_model: Optional[str], chunk_usage: str) -> Extractor:
+        get_model = _path_getter(chunk_model) if chunk_model else None
+        get_usage = _path_getter(chunk_usage)
+        read_usage = self.read_usage
+
+        def extract(chunk, usage: StreamUsage):
+            if get_model is not None and usage.model is None:
+                usage.model = get_model(chunk)
+            chunk_usage_obj = get_usage(chunk)
+            if chunk_usage_obj:
+                usage.input_tokens, usage.output_tokens, usage.details = read_usage(chunk_usage_obj)
+        return extract
+
+    def wrap(self, original: Callable, is_async: bool = False) -> Callable:
+        """
+        Generate the instrumented version of a method.
+
+        Endpoints without streaming or a prepare hook get a wrapper that
+        only times the call and tracks the response.
+
+        Args:
+            original: Method being replaced
+            is_async: Whether ``original`` is a coroutine or async
+                generator function
+
+        Returns:
+            Wrapper with the same signature as ``original``
+        """
+        if is_async and inspect.isasyncgenfunction(original):
+            return _async_generator_wrapper(self, original)
+        if is_async:
+            return _async_wrapper(self, original)
+        return _sync_wrapper(self, original)
+
+
+def _sync_wrapper(adapter: Adapter, original: Callable) -> Callable:
+    track = adapter.track
+    perf_counter_ns = time.perf_counter_ns
+
+    if adapter.stream is None and adapter.prepare is None:
+        @wraps(original)
+        def timed_wrapper(instance, *args, **kwargs):
+            # Time only the provider call itself
+            started = perf_counter_ns()
+            response = original(instance, *args, **kwargs)
+            returned = perf_counter_ns()
+            track(instance, kwargs, response, returned - started, 0, returned)
+            return response
+        return timed_wrapper
+
+    prepare = adapter.prepare
+    streams = adapter.stream is not None
+    always = adapter.stream == STREAM_ALWAYS
+
+    @wraps(original)
+    def wrapper(instance, *args, **kwargs):
+        entered = perf_counter_ns()
+        hide = prepare(kwargs) if prepare is not None else None
+        started = perf_counter_ns()
+        response = original(instance, *args, **kwargs)
+        returned = perf_counter_ns()
+        if streams and (always or kwargs.get("stream")):
+            return _track_stream(TrackedStream, response, adapter, instance, kwargs,
+                                 started, started - entered, hide)
+        track(instance, kwargs, response, returned - started, started - entered, returned)
+        return response
+    return wrapper
+
+
+def _async_wrapper(adapter: Adapter, original: Callable) -> Callable:
+    track = adapter.track
+    perf_counter_ns = time.perf_counter_ns
+
+    if adapter.stream is None and adapter.prepare is None:
+        @wraps(original)
+        async def timed_wrapper(instance, *args, **kwargs):
+            started = perf_counter_ns()
+            response = await original(instance, *args, **kwargs)
+            returned = perf_counter_ns()
+            track(instance, kwargs, response, returned - started, 0, returned)
+            return response
+        return timed_wrapper
+
+    prepare = adapter.prepare
+    streams = adapter.stream is not None
+    always = adapter.stream == STREAM_ALWAYS
+
+    @wraps(original)
+    async def wrapper(instance, *args, **kwargs):
+        entered = perf_counter_ns()
+        hide = prepare(kwargs) if prepare is not None else None
+        started = perf_counter_ns()
+        response = await original(instance, *args, **kwargs)
+        returned = perf_counter_ns()
+        if streams and (always or kwargs.get("stream")):
+            return _track_stream(AsyncTrackedStream, response, adapter, instance, kwargs,
+                                 started, started - entered, hide)
+        track(instance, kwargs, response, returned - started, started - entered, returned)
+        return response
+    return wrapper
+
+
+def _async_generator_wrapper(adapter: Adapter, original: Callable) -> Callable:
+    """Wrapper for async generator methods, which stream without being awaited."""
+    prepare = adapter.prepare
+    perf_counter_ns = time.perf_counter_ns
+
+    @wraps(original)
+    def wrapper(instance, *args, **kwargs):
+        entered = perf_counter_ns()
+        hide = prepare(kwargs) if prepare is not None else None
+        started = perf_counter_ns()
+        stream = original(instance, *args, **kwargs)
+        return _track_stream(AsyncTrackedStream, stream, adapter, instance, kwargs,
+                             started, started - entered, hide)
+    return wrapper
+
+
+def _track_stream(stream_type, response, adapter: Adapter, instance, kwargs: Dict[str, Any],
+                  started: int, overhead_ns: int, hide: Optional[ChunkFilter]):
+    """
+    Wrap a streamed response so its usage is recorded when it ends.
+
+    Responses that can't be iterated (e.g. ``with_raw_response`` results)
+    are returned untouched, and so is the response if wrapping fails:
+    instrumentation never breaks the call.
+
+    Args:
+        stream_type: ``TrackedStream`` or ``AsyncTrackedStream``
+        response: What the provider method returned
+        adapter: Adapter of the wrapped endpoint
+        instance: Provider resource the method was called on
+        kwargs: Call keyword arguments
+        started: ``perf_counter_ns()`` reading when the call was made
+        overhead_ns: Wrapper time spent before the call
+        hide: Chunk filter returned by the adapter's prepare hook
+
+    Returns:
+        The wrapped stream, or ``response`` itself
+    """
+    if not hasattr(response, "__aiter__" if stream_type is AsyncTrackedStream else "__iter__"):
+        return response
+    try:
+        stream_model = adapter._stream_model
+        model = stream_model(instance, kwargs, None) if stream_model is not None else None
+        return stream_type(response, adapter.provider, adapter.extract_chunk, started,
+                           overhead_ns, model, hide)
+    except Exception as e:
+        logger.error(f"Error tracking {adapter.provider} stream: {e}", exc_info=True)
+        return response
+
+
+# Provider name -> (display name, adapters)
+_providers: Dict[str, Tuple[str, Tuple[Adapter, ...]]] = {}
+
+# Provider name -> (class, attribute, original) for every patched method
+_patched: Dict[str, List[Tuple[Any, str, Any]]] = {}
+
+
+def register_provider(name: str, label: str, adapters: Sequence[Adapter]):
+    """
+    Register a provider's adapters so it can be patched by name.
+
+    Args:
+        name: Provider name, as used by ``patch_provider``
+        label: Display name for log messages (e.g. "OpenAI")
+        adapters: Adapters for the provider's endpoints
+    """
+    _providers[name] = (label, tuple(adapters))
+
+
+def is_patched(name: str) -> bool:
+    """Whether a provider's methods are currently patched."""
+    return name in _patched
+
+
+def patch_provider(name: str):
+    """
+    Patch every endpoint of a registered provider.
+
+    Endpoints whose module, class or method is missing from the installed
+    SDK version are skipped; the provider is skipped with a warning only
+    if none of its modules can be imported.
+
+    Args:
+        name: Provider name given to ``register_provider``
+    """
+    label, adapters = _providers[name]
+    if name in _patched:
+        logger.debug(f"{label} already patched")
+        return
+
+    patched: List[Tuple[Any, str, Any]] = []
+    imported = False
+    try:
+        for adapter in adapters:
+            module = _import_first(adapter.modules)
+            if module is None:
+                logger.debug(f"{' or '.join(adapter.modules)} not available, skipping")
+                continue
+            imported = True
+            targets = [(target, False) for target in adapter.methods]
+            targets += [(target, True) for target in adapter.async_methods]
+            for target, is_async in targets:
+                class_name, _, method_name = target.partition(".")
+                owner = getattr(module, class_name, None)
+                original = getattr(owner, method_name, None) if owner is not None else None
+                if original is None:
+                    logger.debug(f"{module.__name__}.{target} not available, skipping")
+                    continue
+                setattr(owner, method_name, adapter.wrap(original, is_async))
+                patched.append((owner, method_name, original))
+    except Exception as e:
+        logger.error(f"Failed to patch {label}: {e}", exc_info=True)
+        _restore(patched)
+        return
+
+    if not imported:
+        logger.warning(f"{label} library not installed, skipping patch")
+        return
+    _patched[name] = patched
+    logger.info(f"Successfully patched {label}")
+
+
+def _import_first(names: Sequence[str]) -> Optional[ModuleType]:
+    """Import the first of several module names that exists."""
+    for name in names:
+        try:
+            return import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+def _restore(patched: List[Tuple[Any, str, Any]]):
+    """Put original methods back, most recently patched first."""
+    while patched:
+        owner, method_name, original = patched.pop()
+        setattr(owner, method_name, original)
+
+
+def unpatch_provider(name: str):
+    """
+    Restore a provider's original methods.
+
+    Args:
+        name: Provider name given to ``register_provider``
+    """
+    patched = _patched.pop(name, None)
+    if patched is None:
+        return
+    label = _providers[name][0]
+    try:
+        _restore(patched)
+        logger.info(f"{label} unpatched")
+    except Exception as e:
+        logger.error(f"Error unpatching {label}: {e}", exc_info=True)
@@ -0,0 +1,206 @@
+"""Pass-through stream wrappers that record usage when a stream finishes."""
+import logging
+import time
+from typing import Any, Callable, Mapping, Optional
+
+from .base import send_metric
+
+logger = logging.getLogger(__name__)
+
+
+class StreamUsage:
+    """Usage accumulated from stream chunks by a provider's extractor."""
+
+    __slots__ = ("model", "input_tokens", "output_tokens", "details")
+
+    def __init__(self):
+        self.model: Optional[str] = None
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        # Usage breakdown (cached, audio, ... tokens) sent with the metric
+        self.details: Optional[Mapping[str, int]] = None
+
+
+# Called with (chunk, usage) for every chunk; updates usage in place
+Extractor = Callable[[Any, StreamUsage], None]
+
+# True for chunks to read for usage but not pass on to the caller
+ChunkFilter = Callable[[Any], bool]
+
+
+class _StreamTracker:
+    """Shared bookkeeping for the sync and async stream wrappers."""
+
+    __slots__ = ("_stream", "_provider", "_extract", "_started_ns", "_overhead_ns",
+                 "_usage", "_first_token_ns", "_finished", "_hide")
+
+    def __init__(self, stream, provider: str, extract: Extractor, started_ns: int,
+                 overhead_ns: int = 0, model: Optional[str] = None,
+                 hide: Optional[ChunkFilter] = None):
+        """
+        Args:
+            stream: Provider stream to wrap
+            provider: Provider name for the metric
+            extract: Reads model and usage from each chunk
+            started_ns: ``perf_counter_ns()`` reading when the call was made
+            overhead_ns: Wrapper time already spent before the call
+            model: Model name, for providers whose chunks don't carry it
+            hide: Chunks the SDK asked for on the caller's behalf (e.g. a
+                usage-only chunk), read for usage but not passed on
+        """
+        self._stream = stream
+        self._provider = provider
+        self._extract = extract
+        self._started_ns = started_ns
+        self._overhead_ns = overhead_ns
+        self._usage = StreamUsage()
+        self._usage.model = model
+        self._first_token_ns: Optional[int] = None
+        self._finished = False
+        self._hide = hide
+
+    def _on_chunk(self, chunk):
+        """Record time-to-first-token and let the extractor read usage."""
+        received = time.perf_counter_ns()
+        if self._first_token_ns is None:
+            self._first_token_ns = received
+        try:
+            self._extract(chunk, self._usage)
+        except Exception as e:
+            logger.debug(f"Error reading {self._provider} stream chunk usage: {e}")
+        self._overhead_ns += time.perf_counter_ns() - received
+
+    def _finish(self):
+        """Send the metric once, when the stream ends or is closed."""
+        if self._finished:
+            return
+        self._finished = True
+
+        try:
+            ended = time.perf_counter_ns()
+            usage = self._usage
+            if usage.model is None or usage.input_tokens is None:
+                logger.debug(f"No usage reported in {self._provider} stream")
+                return
+
+            first_token_ns = self._first_token_ns if self._first_token_ns is not None else ended
+            output_tokens = usage.output_tokens or 0
+            generation_ns = ended - first_token_ns
+            tokens_per_second = (
+                round(output_tokens * 1e9 / generation_ns, 2) if generation_ns > 0 else None
+            )
+
+            send_metric(
+                provider=self._provider,
+                model=usage.model,
+                input_tokens=usage.input_tokens,
+                output_tokens=output_tokens,
+                latency_ms=(ended - self._started_ns) / 1e6,
+                returned_ns=ended,
+                before_call_ns=self._overhead_ns,
+                stream=True,
+                time_to_first_token_ms=round((first_token_ns - self._started_ns) / 1e6, 3),
+                tokens_per_second=tokens_per_second,
+                **(usage.details or {})
+            )
+        except Exception as e:
+            logger.error(f"Error sending {self._provider} stream metrics: {e}", exc_info=True)
+
+    def __getattr__(self, name):
+        # Expose the wrapped stream's own API (response, close helpers, ...)
+        return getattr(self._stream, name)
+
+
+class TrackedStream(_StreamTracker):
+    """
+    Wraps a sync provider stream, forwarding every chunk unchanged.
+
+    Nothing is buffered or copied; each chunk is handed to the provider's
+    extractor and returned as-is. The metric is sent when the stream is
+    exhausted, closed or exits its ``with`` block.
+    """
+
+    __slots__ = ("_iterator",)
+
+    def __init__(self, stream, provider: str, extract: Extractor, started_ns: int,
+                 overhead_ns: int = 0, model: Optional[str] = None,
+                 hide: Optional[ChunkFilter] = None):
+        super().__init__(stream, provider, extract, started_ns, overhead_ns, model, hide)
+        self._iterator = iter(stream)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            try:
+                chunk = next(self._iterator)
+            except StopIteration:
+                self._finish()
+                raise
+            except Exception:
+                self._finish()
+                raise
+            self._on_chunk(chunk)
+            if self._hide is None or not self._hide(chunk):
+                return chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying stream and record whatever usage was seen."""
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._finish()
+
+
+class AsyncTrackedStream(_StreamTracker):
+    """Async counterpart of ``TrackedStream`` for async provider clients."""
+
+    __slots__ = ("_iterator",)
+
+    def __init__(self, stream, provider: str, extract: Extractor, started_ns: int,
+                 overhead_ns: int = 0, model: Optional[str] = None,
+                 hide: Optional[ChunkFilter] = None):
+        super().__init__(stream, provider, extract, started_ns, overhead_ns, model, hide)
+        self._iterator = stream.__aiter__()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            try:
+                chunk = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                self._finish()
+                raise
+            except Exception:
+                self._finish()
+                raise
+            self._on_chunk(chunk)
+            if self._hide is None or not self._hide(chunk):
+                return chunk
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying stream and record whatever usage was seen."""
+        try:
+            # Provider streams have close(); async generators only aclose()
+            close = getattr(self._stream, "close", None) or getattr(self._stream, "aclose", None)
+            if close is not None:
+                await close()
+        finally:
+            self._finish()
@@ -0,0 +1,157 @@
+"""Compile pricing table entries into fast cost evaluators."""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Usage breakdown fields understood by rate cards. Token fields are parts
+# of input_tokens (cached, cache write, audio, image) or of output_tokens
+# (audio output); "batch" marks a discounted batch-API request.
+USAGE_FIELDS = (
+    "cached_input_tokens",
+    "cache_write_tokens",
+    "image_input_tokens",
+    "audio_input_tokens",
+    "audio_output_tokens",
+    "batch",
+)
+
+# Discount applied to batch-API requests when a rate card doesn't set one
+DEFAULT_BATCH_DISCOUNT = 0.5
+
+# (input_tokens, output_tokens, usage breakdown or None) -> cost in USD
+Evaluator = Callable[[int, int, Optional[Dict[str, Any]]], float]
+
+
+def _zero(input_tokens: int, output_tokens: int, usage: Optional[Dict[str, Any]] = None) -> float:
+    return 0.0
+
+
+def _rates(card: Dict[str, Any], base: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Per-token rates for one tier, defaulting special rates to the plain ones."""
+    base = base or {}
+    input_rate = card.get("input", base.get("input", 0.0)) / 1000
+    output_rate = card.get("output", base.get("output", 0.0)) / 1000
+
+    def rate(name, default):
+        value = card.get(name, base.get(name))
+        return value / 1000 if value is not None else default
+
+    return {
+        "input": input_rate,
+        "output": output_rate,
+        "cached_input": rate("cached_input", input_rate),
+        "cache_write": rate("cache_write", input_rate),
+        "image_input": rate("image_input", input_rate),
+        "audio_input": rate("audio_input", input_rate),
+        "audio_output": rate("audio_output", output_rate),
+    }
+
+
+def compile_rate_card(card: Optional[Dict[str, Any]]) -> Evaluator:
+    """
+    Turn a pricing table entry into a cost function.
+
+    A rate card holds per-1K-token rates. Besides ``input`` and ``output``
+    it may set ``cached_input`` (prompt-cache reads), ``cache_write``
+    (prompt-cache writes), ``image_input``, ``audio_input`` and
+    ``audio_output``; unset special rates cost the same as plain tokens.
+    ``batch_discount`` (default 0.5) applies to batch-API requests, and
+    ``tiers`` lists long-context rates as ``{"above": 128000, "input": ...,
+    "output": ...}``, used for the whole request when its input tokens
+    exceed ``above``.
+
+    Cards with only ``input`` and ``output`` compile to a two-multiply
+    function; the breakdown logic is only paid for by cards that use it.
+
+    Args:
+        card: Pricing table entry, or None for an unknown model
+
+    Returns:
+        Function of (input_tokens, output_tokens, usage) returning USD
+    """
+    if not card:
+        return _zero
+
+    base = _rates(card)
+    discount = 1.0 - card.get("batch_discount", DEFAULT_BATCH_DISCOUNT)
+    tiers = sorted(
+        ((tier["above"], _rates(tier, card)) for tier in card.get("tiers", ())),
+        key=lambda tier: tier[0],
+        reverse=True,
+    )
+    input_rate, output_rate = base["input"], base["output"]
+
+    def flat(input_tokens: int, output_tokens: int, usage: Optional[Dict[str, Any]] = None) -> float:
+        if usage:
+            return detailed(input_tokens, output_tokens, usage)
+        return round(input_tokens * input_rate + output_tokens * output_rate, 6)
+
+    def detailed(input_tokens: int, output_tokens: int, usage: Optional[Dict[str, Any]] = None) -> float:
+        rates = base
+        for above, tier_rates in tiers:
+            if input_tokens > above:
+                rates = tier_rates
+                break
+
+        usage = usage or {}
+        cached = usage.get("cached_input_tokens") or 0
+        cache_write = usage.get("cache_write_tokens") or 0
+        image = usage.get("image_input_tokens") or 0
+        audio_in = usage.get("audio_input_tokens") or 0
+        audio_out = usage.get("audio_output_tokens") or 0
+        text_in = max(input_tokens - cached - cache_write - image - audio_in, 0)
+        text_out = max(output_tokens - audio_out, 0)
+
+        cost = (
+            text_in * rates["input"]
+            + cached * rates["cached_input"]
+            + cache_write * rates["cache_write"]
+            + image * rates["image_input"]
+            + audio_in * rates["audio_input"]
+            + text_out * rates["output"]
+            + audio_out * rates["audio_output"]
+        )
+        if usage.get("batch"):
+            cost *= discount
+        return round(cost, 6)
+
+    return detailed if tiers else flat
+
+
+def rate_schedule(card: Optional[Dict[str, Any]]) -> Tuple[float, float, List[Tuple[int, float, float]]]:
+    """
+    Per-token input and output rates of a card, for column-wise pricing.
+
+    Args:
+        card: Pricing table entry, or None for an unknown model
+
+    Returns:
+        Tuple of (input rate, output rate, tiers), where tiers are
+        ``(above, input rate, output rate)`` sorted highest threshold first
+    """
+    if not card:
+        return 0.0, 0.0, []
+    base = _rates(card)
+    tiers = sorted(
+        (
+            (tier["above"], tier_rates["input"], tier_rates["output"])
+            for tier in card.get("tiers", ())
+            for tier_rates in (_rates(tier, card),)
+        ),
+        reverse=True,
+    )
+    return base["input"], base["output"], tiers
+
+
+def usage_breakdown(extra_fields: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Pick the usage breakdown out of a metric's extra fields.
+
+    Args:
+        extra_fields: Extra fields recorded with the metric
+
+    Returns:
+        Dict of the ``USAGE_FIELDS`` present, or None
+    """
+    if not extra_fields:
+        return None
+    usage = {name: extra_fields[name] for name in USAGE_FIELDS if name in extra_fields}
+    return usage or None
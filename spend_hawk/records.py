@@ -0,0 +1,169 @@
+"""Raw metric records captured on the caller's thread."""
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import config
+from .pricing import get_pricing_snapshot
+from .rates import usage_breakdown
+from .utils import calculate_cost
+
+# Offset that turns a time.monotonic() reading into a Unix timestamp
+_WALL_CLOCK_OFFSET = time.time() - time.monotonic()
+
+
+class MetricRecord:
+    """
+    Usage for one tracked call, as cheaply as it can be captured.
+
+    The hot path only stores the raw values, a monotonic timestamp and a
+    reference to the current context. Pricing, context enrichment and
+    timestamp formatting happen later in ``to_dict()``, on the export
+    pipeline rather than on the thread that made the LLM call.
+
+    Records can sit on the queue in large numbers, so they use ``__slots__``
+    (no per-instance dict), intern the provider and model strings, keep the
+    timestamp as a float and skip the extra-fields dict when it is empty.
+    """
+
+    __slots__ = (
+        "provider",
+        "model",
+        "input_tokens",
+        "output_tokens",
+        "latency_ms",
+        "captured_at",
+        "context",
+        "extra_fields",
+        "spool_segment",
+        "sdk_overhead_us",
+    )
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_ms: float,
+        context: Tuple[Optional[str], Optional[str], Dict[str, Any]],
+        extra_fields: Optional[Dict[str, Any]] = None,
+        sdk_overhead_us: Optional[int] = None
+    ):
+        self.provider = sys.intern(provider)
+        self.model = sys.intern(model)
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.latency_ms = latency_ms
+        self.captured_at = time.monotonic()
+        self.context = context
+        self.extra_fields = extra_fields or None
+        self.spool_segment: Optional[int] = None
+        self.sdk_overhead_us = sdk_overhead_us
+
+    @property
+    def timed(self) -> bool:
+        """Whether ``latency_ms`` was measured; batch results report none."""
+        return not (self.extra_fields and self.extra_fields.get("batch"))
+
+    def wall_time(self) -> float:
+        """Unix time at which the record was captured."""
+        return _WALL_CLOCK_OFFSET + self.captured_at
+
+    def timestamp(self) -> str:
+        """UTC ISO timestamp of when the record was captured."""
+        return datetime.fromtimestamp(self.wall_time(), timezone.utc).isoformat()
+
+    def to_raw(self) -> List[Any]:
+        """
+        Compact, unpriced form used by the on-disk spool and the collector.
+
+        Returns:
+            List of raw fields, readable by ``from_raw``
+        """
+        project_id, agent, tags = self.context
+        return [
+            self.provider,
+            self.model,
+            self.input_tokens,
+            self.output_tokens,
+            self.latency_ms,
+            self.wall_time(),
+            project_id,
+            agent,
+            self.extra_fields,
+            self.sdk_overhead_us,
+            tags or None,
+        ]
+
+    @classmethod
+    def from_raw(cls, raw: List[Any]) -> "MetricRecord":
+        """
+        Rebuild a record from ``to_raw`` output, possibly from another process.
+
+        Args:
+            raw: List produced by ``to_raw``
+
+        Returns:
+            Record with its original capture time
+        """
+        provider, model, input_tokens, output_tokens, latency_ms, wall, project_id, agent, extra = raw[:9]
+        record = cls(
+            provider,
+            model,
+            input_tokens,
+            output_tokens,
+            latency_ms,
+            (project_id, agent, (raw[10] if len(raw) > 10 else None) or {}),
+            extra,
+            raw[9] if len(raw) > 9 else None
+        )
+        record.captured_at = wall - _WALL_CLOCK_OFFSET
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Price and enrich the record into the backend's metric payload.
+
+        Returns:
+            Metric dict in the same shape ``send_metric`` always produced
+        """
+        project_id, agent, _ = self.context
+        pricing = get_pricing_snapshot()
+        metric = {
+            "provider": self.provider,
+            "model": self.model,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": calculate_cost(
+                self.provider, self.model, self.input_tokens, self.output_tokens,
+                usage_breakdown(self.extra_fields), pricing
+            ),
+            "pricing_version": pricing.version,
+            "latency_ms": int(self.latency_ms),
+            "latency_us": round(self.latency_ms * 1000),
+            "timestamp": self.timestamp(),
+            "project_id": project_id or config.project_id,
+            "agent": agent or config.agent,
+        }
+        if self.sdk_overhead_us is not None:
+            metric["sdk_overhead_us"] = self.sdk_overhead_us
+        if self.extra_fields:
+            metric.update(self.extra_fields)
+        return metric
+
+
+def as_payload(metric) -> Dict[str, Any]:
+    """
+    Convert a queued item into its JSON payload.
+
+    Args:
+        metric: A MetricRecord or an already-built metric dict
+
+    Returns:
+        Metric dict ready to serialize
+    """
+    if isinstance(metric, dict):
+        return metric
+    return metric.to_dict()
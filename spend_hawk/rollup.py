@@ -0,0 +1,185 @@
+"""Client-side pre-aggregation of metrics into per-window rollups."""
+import json
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import config
+from .pricing import PricingSnapshot, get_pricing_snapshot
+from .rates import usage_breakdown
+from .records import MetricRecord
+from .utils import calculate_cost
+
+# Upper bounds (inclusive, in ms) of the latency histogram buckets; one
+# extra overflow bucket counts everything slower than the last bound
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+def _tags_key(tags: Dict[str, Any]) -> str:
+    """Hashable, order-independent key for a custom tags dict."""
+    if not tags:
+        return ""
+    return json.dumps(tags, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class Rollup:
+    """Running totals for one (window, provider, model, project, agent, tags, pricing) key."""
+
+    __slots__ = (
+        "window_start", "provider", "model", "project_id", "agent", "custom_tags",
+        "pricing", "count", "input_tokens", "output_tokens", "cost",
+        "latency_ms_sum", "latency_ms_min", "latency_ms_max", "latency_buckets",
+        "segments",
+    )
+
+    def __init__(self, window_start: float, record: MetricRecord, project_id, agent, tags,
+                 pricing: PricingSnapshot):
+        self.window_start = window_start
+        self.provider = record.provider
+        self.model = record.model
+        self.project_id = project_id
+        self.agent = agent
+        self.custom_tags = tags
+        # Every record in the rollup is costed with this snapshot
+        self.pricing = pricing
+        self.count = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+        self.latency_ms_sum = 0.0
+        self.latency_ms_min: Optional[float] = None
+        self.latency_ms_max: Optional[float] = None
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        # Spool segment -> records of this rollup written to it
+        self.segments: Dict[int, int] = {}
+
+    def add(self, record: MetricRecord):
+        """Fold one record into the totals."""
+        self.count += 1
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cost += calculate_cost(
+            record.provider, record.model, record.input_tokens, record.output_tokens,
+            usage_breakdown(record.extra_fields), self.pricing
+        )
+        # Batch results have no latency; the histogram counts only timed calls
+        if record.timed:
+            latency = record.latency_ms
+            self.latency_ms_sum += latency
+            if self.latency_ms_min is None or latency < self.latency_ms_min:
+                self.latency_ms_min = latency
+            if self.latency_ms_max is None or latency > self.latency_ms_max:
+                self.latency_ms_max = latency
+            self.latency_buckets[bisect_left(LATENCY_BUCKETS_MS, latency)] += 1
+        if record.spool_segment is not None:
+            self.segments[record.spool_segment] = self.segments.get(record.spool_segment, 0) + 1
+
+    def to_dict(self, window_s: float) -> Dict[str, Any]:
+        """
+        Build the rollup payload sent in place of the individual metrics.
+
+        Args:
+            window_s: Window length in seconds
+
+        Returns:
+            Rollup dict, marked with ``"type": "rollup"``
+        """
+        return {
+            "type": "rollup",
+            "provider": self.provider,
+            "model": self.model,
+            "project_id": self.project_id,
+            "agent": self.agent,
+            "custom_tags": self.custom_tags,
+            "window_start": datetime.fromtimestamp(self.window_start, timezone.utc).isoformat(),
+            "window_seconds": window_s,
+            "count": self.count,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": round(self.cost, 6),
+            "pricing_version": self.pricing.version,
+            "latency_ms_sum": round(self.latency_ms_sum, 3),
+            "latency_ms_min": self.latency_ms_min,
+            "latency_ms_max": self.latency_ms_max,
+            "latency_histogram": {
+                "bounds_ms": list(LATENCY_BUCKETS_MS),
+                "counts": list(self.latency_buckets),
+            },
+        }
+
+    def spool_segments(self) -> List[int]:
+        """Segment of every spooled record in the rollup, for acknowledging."""
+        return [segment for segment, n in self.segments.items() for _ in range(n)]
+
+
+class Aggregator:
+    """
+    Rolls metrics up into fixed, wall-clock-aligned windows.
+
+    Records are bucketed by the window they were captured in and keyed by
+    provider, model, project, agent, custom tags and pricing version, so a
+    price change mid-window starts a new rollup rather than mixing tables. A window is released
+    by ``drain`` once it has closed, as one rollup per key.
+    """
+
+    def __init__(self, window_s: float):
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self._rollups: Dict[Tuple, Rollup] = {}
+
+    def add(self, record: MetricRecord):
+        """
+        Fold a record into its window's rollup.
+
+        Args:
+            record: Record that would otherwise be sent on its own
+        """
+        project_id, agent, tags = record.context
+        project_id = project_id or config.project_id
+        agent = agent or config.agent
+        wall = record.wall_time()
+        window_start = wall - wall % self.window_s
+        pricing = get_pricing_snapshot()
+        key = (
+            window_start, record.provider, record.model, project_id, agent, _tags_key(tags),
+            pricing.version
+        )
+
+        with self._lock:
+            rollup = self._rollups.get(key)
+            if rollup is None:
+                rollup = self._rollups[key] = Rollup(
+                    window_start, record, project_id, agent, dict(tags) or None, pricing
+                )
+            rollup.add(record)
+
+    def drain(self, now: float, force: bool = False) -> List[Rollup]:
+        """
+        Remove and return rollups whose window has closed.
+
+        Args:
+            now: Current Unix time
+            force: Release every rollup, including the open window
+
+        Returns:
+            Closed rollups, oldest window first
+        """
+        with self._lock:
+            closed = [
+                key for key in self._rollups
+                if force or key[0] + self.window_s <= now
+            ]
+            closed.sort(key=lambda key: key[0])
+            return [self._rollups.pop(key) for key in closed]
+
+    def next_close(self) -> Optional[float]:
+        """Unix time at which the oldest open window closes, if any."""
+        with self._lock:
+            if not self._rollups:
+                return None
+            return min(key[0] for key in self._rollups) + self.window_s
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rollups)
@@ -0,0 +1,297 @@
+"""Mergeable latency quantile sketches kept in-process per model and context."""
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import config
+
+# Default relative accuracy: any reported quantile is within 1% of the true value
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Quantiles reported by default
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# (provider, model, project_id, agent)
+SketchKey = Tuple[str, str, Optional[str], Optional[str]]
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees (DDSketch).
+
+    Positive values land in logarithmic bins of ratio ``gamma``, so every
+    quantile is reported within ``relative_accuracy`` of the true value
+    regardless of the distribution. Values <= 0 are counted separately.
+    Sketches with the same accuracy merge exactly by adding bin counts,
+    which is what makes them cheap to aggregate across processes.
+    """
+
+    __slots__ = ("relative_accuracy", "gamma", "_inv_log_gamma", "bins",
+                 "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float):
+        """Record one value."""
+        if value > 0:
+            index = math.ceil(math.log(value) * self._inv_log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch"):
+        """
+        Add another sketch's values into this one.
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, n in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1 (0.99 for p99)
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        low, high = self.min, self.max
+        if self.count == 0 or low is None or high is None:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return min(max(0.0, low), high)
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, low), high)
+        return high
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Compact, JSON-friendly form for export.
+
+        Bins are sent as one dense list of counts starting at ``offset``.
+        """
+        if self.bins:
+            low, high = min(self.bins), max(self.bins)
+            counts = [self.bins.get(index, 0) for index in range(low, high + 1)]
+        else:
+            low, counts = 0, []
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "zero_count": self.zero_count,
+            "offset": low,
+            "bins": counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DDSketch":
+        """Rebuild a sketch from ``to_dict`` output."""
+        sketch = cls(data["relative_accuracy"])
+        offset = data["offset"]
+        sketch.bins = {offset + i: n for i, n in enumerate(data["bins"]) if n}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
+
+
+class LatencySketches:
+    """
+    Latency sketches per (provider, model, project, agent).
+
+    Each key has a cumulative sketch read through ``quantiles`` and an
+    interval sketch that is exported and then merged into the cumulative
+    one, so local percentiles cover everything since start (or ``reset``)
+    while the backend receives only what is new.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._lock = threading.Lock()
+        self._totals: Dict[SketchKey, DDSketch] = {}
+        self._interval: Dict[SketchKey, DDSketch] = {}
+        self._interval_start = time.time()
+
+    def add(self, key: SketchKey, latency_ms: float):
+        """
+        Record one call's latency.
+
+        Args:
+            key: (provider, model, project_id, agent)
+            latency_ms: Call latency in milliseconds
+        """
+        with self._lock:
+            sketch = self._interval.get(key)
+            if sketch is None:
+                sketch = self._interval[key] = DDSketch(self.relative_accuracy)
+            sketch.add(latency_ms)
+
+    def add_records(self, records: Iterable[Any]):
+        """
+        Record the latency of queued metric records.
+
+        Args:
+            records: MetricRecords (metric dicts and batch results, which
+                have no latency, are skipped)
+        """
+        for record in records:
+            context = getattr(record, "context", None)
+            if context is None or not record.timed:
+                continue
+            key = (
+                record.provider,
+                record.model,
+                context[0] or config.project_id,
+                context[1] or config.agent,
+            )
+            self.add(key, record.latency_ms)
+
+    def _merged(self) -> Dict[SketchKey, DDSketch]:
+        """Cumulative plus interval sketches per key. Lock held."""
+        merged: Dict[SketchKey, DDSketch] = {}
+        for source in (self._totals, self._interval):
+            for key, sketch in source.items():
+                combined = merged.get(key)
+                if combined is None:
+                    combined = merged[key] = DDSketch(self.relative_accuracy)
+                combined.merge(sketch)
+        return merged
+
+    def quantiles(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> List[Dict[str, Any]]:
+        """
+        Read latency quantiles for every key seen so far.
+
+        Args:
+            qs: Quantiles to report
+
+        Returns:
+            One dict per key with provider, model, project_id, agent,
+            count and ``p50``-style entries in milliseconds
+        """
+        qs = tuple(qs)
+        with self._lock:
+            merged = self._merged()
+
+        results = []
+        for (provider, model, project_id, agent), sketch in merged.items():
+            entry: Dict[str, Any] = {
+                "provider": provider,
+                "model": model,
+                "project_id": project_id,
+                "agent": agent,
+                "count": sketch.count,
+            }
+            for q in qs:
+                entry[f"p{q * 100:g}"] = sketch.quantile(q)
+            results.append(entry)
+        return results
+
+    def take_interval(self) -> List[Dict[str, Any]]:
+        """
+        Export sketches recorded since the last call.
+
+        Interval sketches are merged into the cumulative ones and cleared.
+
+        Returns:
+            Sketch payloads marked with ``"type": "latency_sketch"``
+        """
+        now = time.time()
+        with self._lock:
+            interval, self._interval = self._interval, {}
+            start, self._interval_start = self._interval_start, now
+            for key, sketch in interval.items():
+                total = self._totals.get(key)
+                if total is None:
+                    total = self._totals[key] = DDSketch(self.relative_accuracy)
+                total.merge(sketch)
+
+        window_start = datetime.fromtimestamp(start, timezone.utc).isoformat()
+        return [
+            {
+                "type": "latency_sketch",
+                "provider": provider,
+                "model": model,
+                "project_id": project_id,
+                "agent": agent,
+                "window_start": window_start,
+                "window_seconds": round(now - start, 3),
+                "sketch": sketch.to_dict(),
+            }
+            for (provider, model, project_id, agent), sketch in interval.items()
+        ]
+
+    def reset(self):
+        """Forget every recorded latency."""
+        with self._lock:
+            self._totals.clear()
+            self._interval.clear()
+            self._interval_start = time.time()
+
+
+# Global sketches fed by the export pipeline
+latency_sketches = LatencySketches()
+
+
+def _reset_lock_after_fork():
+    """The parent's worker may hold the lock at fork time and would never release it."""
+    latency_sketches._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_lock_after_fork)
+
+
+def get_latency_quantiles(qs: Iterable[float] = DEFAULT_QUANTILES) -> List[Dict[str, Any]]:
+    """
+    Get local latency percentiles per provider, model and context.
+
+    Args:
+        qs: Quantiles to report (default p50, p95, p99)
+
+    Returns:
+        List of dicts such as ``{"provider": "openai", "model": "gpt-4o",
+        "project_id": ..., "agent": ..., "count": 1200, "p50": 812.4,
+        "p95": 2210.0, "p99": 4630.7}``
+    """
+    return latency_sketches.quantiles(qs)
@@ -0,0 +1,242 @@
+"""Durable on-disk spool (write-ahead log) for queued metrics."""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .records import MetricRecord
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".wal"
+
+# Reused encoder; json.dumps with custom separators builds a new one per call
+# Custom tag values that aren't JSON types are sent as strings
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with this pid is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Spool:
+    """
+    Append-only, segment-rotated log of metric records.
+
+    Every record is appended (buffered) before it is queued for export and
+    acknowledged once the backend has accepted it. A segment file is
+    deleted as soon as it is no longer being written and every record in
+    it has been acknowledged. Total size is capped at ``max_bytes`` by
+    discarding the oldest segments.
+
+    Segments are named ``<pid>-<start>-<n>.wal`` so processes sharing a
+    directory (or a restarted container reusing the same pid) never write
+    to the same file. On startup, segments left behind by processes that
+    are no longer running are replayed.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int, max_bytes: int):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._prefix = f"{self._pid}-{time.time_ns():x}-"
+        self._file: Optional[BinaryIO] = None
+        self._segment: Optional[int] = None
+        self._segment_size = 0
+        self._next_segment = 0
+        # segment number -> [records appended, records acknowledged, bytes]
+        self._segments: Dict[int, List[int]] = {}
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{self._prefix}{segment}{SEGMENT_SUFFIX}"
+
+    def _rotate(self) -> Tuple[BinaryIO, int]:
+        """
+        Close the active segment and open the next one. Lock held.
+
+        Returns:
+            The new segment's file and number
+        """
+        if self._file is not None:
+            self._file.close()
+            previous = self._segment
+            self._file = None
+            self._maybe_delete(previous)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segment = self._segment = self._next_segment
+        self._next_segment += 1
+        self._segment_size = 0
+        self._segments[segment] = [0, 0, 0]
+        file = self._file = open(self._segment_path(segment), "ab", buffering=64 * 1024)
+        self._enforce_cap()
+        return file, segment
+
+    def _maybe_delete(self, segment: Optional[int]):
+        """Delete a closed segment once every record is acknowledged. Lock held."""
+        if segment is None or segment == self._segment:
+            return
+        counts = self._segments.get(segment)
+        if counts is not None and counts[1] >= counts[0]:
+            del self._segments[segment]
+            try:
+                self._segment_path(segment).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _enforce_cap(self):
+        """Discard the oldest closed segments while over max_bytes. Lock held."""
+        total = sum(counts[2] for counts in self._segments.values())
+        for segment in sorted(self._segments):
+            if total <= self.max_bytes or segment == self._segment:
+                break
+            appended, acked, size = self._segments.pop(segment)
+            logger.warning(
+                f"Spool over {self.max_bytes} bytes, discarding {appended - acked} metric(s)"
+            )
+            total -= size
+            try:
+                self._segment_path(segment).unlink()
+            except FileNotFoundError:
+                pass
+
+    def append(self, record: MetricRecord):
+        """
+        Append a record and tag it with its segment for later ack.
+
+        Args:
+            record: Record about to be queued for export
+        """
+        line = (_encode(record.to_raw()) + "\n").encode("utf-8")
+        with self._lock:
+            file, segment = self._file, self._segment
+            if file is None or segment is None or self._segment_size >= self.segment_bytes:
+                file, segment = self._rotate()
+            file.write(line)
+            self._segment_size += len(line)
+            counts = self._segments[segment]
+            counts[0] += 1
+            counts[2] += len(line)
+            record.spool_segment = segment
+
+    def ack(self, segments: Iterable[Optional[int]]):
+        """
+        Acknowledge records that no longer need to survive a crash.
+
+        Args:
+            segments: ``spool_segment`` of each acknowledged record
+        """
+        with self._lock:
+            touched = set()
+            for segment in segments:
+                counts = self._segments.get(segment) if segment is not None else None
+                if counts is not None:
+                    counts[1] += 1
+                    touched.add(segment)
+            for segment in touched:
+                self._maybe_delete(segment)
+
+    def flush(self):
+        """Push buffered appends to the OS."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Flush and close the active segment."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            closed, self._segment = self._segment, None
+            self._maybe_delete(closed)
+
+    def orphaned_segments(self) -> List[Path]:
+        """
+        Segments owned by processes that are no longer running.
+
+        A segment is owned by the pid in its name, or by the replaying
+        process once claimed (``<name>.wal.replay-<pid>-<start>-``). A
+        segment with this process's pid but another start time belongs to
+        an earlier process that had the same pid.
+        """
+        if not self.directory.exists():
+            return []
+        orphans = []
+        for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}*")):
+            name = path.name
+            if name.startswith(self._prefix):
+                continue
+            try:
+                if ".replay-" in name:
+                    pid = int(name.rsplit(".replay-", 1)[1].split("-", 1)[0])
+                else:
+                    pid = int(name.split("-", 1)[0])
+            except ValueError:
+                continue
+            if pid == self._pid:
+                if name.endswith(f".replay-{self._prefix}"):
+                    continue  # Being replayed by this process right now
+                orphans.append(path)
+            elif not _pid_alive(pid):
+                orphans.append(path)
+        return orphans
+
+    def replay(self, put: Callable[[MetricRecord], None]) -> int:
+        """
+        Re-queue records from segments left by dead processes.
+
+        Each orphaned segment is claimed with an atomic rename so only one
+        process replays it, then its records are re-appended to this
+        process's spool and passed to ``put``. Delivery is at-least-once: a
+        crash mid-replay can resend some records.
+
+        Args:
+            put: Callback that queues a replayed record
+
+        Returns:
+            Number of records replayed
+        """
+        replayed = 0
+        for path in self.orphaned_segments():
+            base = path.name.split(".replay-", 1)[0]
+            claimed = path.with_name(f"{base}.replay-{self._prefix}")
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # Another process claimed it first
+
+            try:
+                with open(claimed, "rb") as f:
+                    for line in f:
+                        try:
+                            record = MetricRecord.from_raw(json.loads(line))
+                        except (ValueError, TypeError, IndexError):
+                            continue  # Torn write from the crash
+                        self.append(record)
+                        put(record)
+                        replayed += 1
+                claimed.unlink()
+            except Exception as e:
+                logger.error(f"Error replaying spool segment {path.name}: {e}", exc_info=True)
+
+        if replayed:
+            logger.info(f"Replayed {replayed} metric(s) from spool")
+        return replayed
+
+    def size_bytes(self) -> int:
+        """Bytes currently held in this process's segments."""
+        with self._lock:
+            return sum(counts[2] for counts in self._segments.values())
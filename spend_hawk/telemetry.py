@@ -0,0 +1,345 @@
+"""Self-instrumentation: how much work the SDK itself is doing."""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Summary:
+    """
+    Count, sum and max of observed values.
+
+    ``observe`` runs on caller threads for every tracked call, so it only
+    appends to a pending list (atomic under the GIL, no lock). Pending
+    values are folded into the totals once enough accumulate or when the
+    summary is read.
+    """
+
+    __slots__ = ("_lock", "_pending", "count", "sum", "max")
+
+    # Fold pending values into the totals after this many observations
+    FOLD_EVERY = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: List[float] = []
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one value."""
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= self.FOLD_EVERY:
+            self._fold()
+
+    def _fold(self):
+        """Move pending values into the totals."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                self.count += len(pending)
+                self.sum += sum(pending)
+                self.max = max(self.max, max(pending))
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current count, sum, max and mean."""
+        self._fold()
+        with self._lock:
+            count, total, peak = self.count, self.sum, self.max
+        return {
+            "count": count,
+            "sum": total,
+            "max": peak,
+            "mean": total / count if count else 0.0,
+        }
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    __slots__ = ("_lock", "bounds", "buckets", "count", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one value."""
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, sum, mean and per-bucket counts (not cumulative)."""
+        with self._lock:
+            buckets, count, total = list(self.buckets), self.count, self.sum
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "bounds": list(self.bounds),
+            "buckets": buckets,
+        }
+
+
+# Time send_metric spends on the caller's thread
+send_metric_seconds = Summary()
+
+# Time the provider wrappers spend around each call (sdk_overhead_us)
+wrapper_overhead_seconds = Summary()
+
+# Metrics per upload and how long each upload takes
+batch_sizes = Histogram((1, 5, 10, 25, 50, 100, 250, 500, 1000))
+export_seconds = Histogram((0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+
+# Counters at the previous get_telemetry() call, for rates
+_rate_lock = threading.Lock()
+_last_rates: Tuple[float, int, int] = (time.monotonic(), 0, 0)
+
+
+def _reset_locks_after_fork():
+    """Locks held by the parent's worker or callers at fork time would never be released."""
+    global _rate_lock
+    
+    for metric in (send_metric_seconds, wrapper_overhead_seconds, batch_sizes, export_seconds):
+        metric._lock = threading.Lock()
+    _rate_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def _client_stats() -> Dict[str, Any]:
+    """Counters of the background client plus every event-loop client."""
+    from .async_client import _clients
+    from .client import get_client
+
+    stats = get_client().stats()
+    for async_client in list(_clients.values()):
+        async_stats = async_client.stats()
+        for name in ("queue_depth", "enqueued", "dropped", "sent", "failed", "retries"):
+            stats[name] += async_stats[name]
+    return stats
+
+
+def get_telemetry() -> Dict[str, Any]:
+    """
+    Get the SDK's own health and overhead figures.
+
+    Rates are averaged over the time since the previous call (or since
+    import, on the first call).
+
+    Returns:
+        Dict with ``client`` (queue depth and counters, as ``get_stats``),
+        ``rates``, ``batch_size``, ``export_seconds``,
+        ``send_metric_seconds``, ``wrapper_overhead_seconds`` and
+        ``pricing`` (source, version, model count and age of the table)
+    """
+    global _last_rates
+    from .pricing import pricing_status
+
+    stats = _client_stats()
+    now = time.monotonic()
+    with _rate_lock:
+        since, enqueued, sent = _last_rates
+        _last_rates = (now, stats["enqueued"], stats["sent"])
+    elapsed = max(now - since, 1e-9)
+
+    return {
+        "client": stats,
+        "rates": {
+            "enqueued_per_second": (stats["enqueued"] - enqueued) / elapsed,
+            "sent_per_second": (stats["sent"] - sent) / elapsed,
+        },
+        "batch_size": batch_sizes.snapshot(),
+        "export_seconds": export_seconds.snapshot(),
+        "send_metric_seconds": send_metric_seconds.snapshot(),
+        "wrapper_overhead_seconds": wrapper_overhead_seconds.snapshot(),
+        "pricing": pricing_status(),
+    }
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _render_histogram(lines: List[str], name: str, help_text: str, snapshot: Dict[str, Any]):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    cumulative = 0
+    for bound, n in zip(snapshot["bounds"], snapshot["buckets"]):
+        cumulative += n
+        lines.append(f'{name}_bucket{{le="{_format_value(float(bound))}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {snapshot["count"]}')
+    lines.append(f"{name}_sum {_format_value(snapshot['sum'])}")
+    lines.append(f"{name}_count {snapshot['count']}")
+
+
+def _render_summary(lines: List[str], name: str, help_text: str, snapshot: Dict[str, float]):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} summary")
+    lines.append(f"{name}_sum {_format_value(snapshot['sum'])}")
+    lines.append(f"{name}_count {snapshot['count']}")
+    lines.append(f"# HELP {name}_max Largest observed value.")
+    lines.append(f"# TYPE {name}_max gauge")
+    lines.append(f"{name}_max {_format_value(snapshot['max'])}")
+
+
+# (stats key, metric name, type, help)
+_CLIENT_METRICS = (
+    ("queue_depth", "spend_hawk_queue_depth", "gauge", "Metrics waiting to be exported."),
+    ("queue_max_size", "spend_hawk_queue_max_size", "gauge", "Capacity of the metrics queue."),
+    ("enqueued", "spend_hawk_metrics_enqueued_total", "counter", "Metrics accepted for export."),
+    ("sent", "spend_hawk_metrics_sent_total", "counter", "Metrics accepted by the backend."),
+    ("failed", "spend_hawk_metrics_failed_total", "counter", "Metrics that could not be exported."),
+    ("dropped", "spend_hawk_metrics_dropped_total", "counter", "Metrics dropped by backpressure."),
+    ("spilled", "spend_hawk_metrics_spilled_total", "counter", "Metrics spilled to disk on overflow."),
+    ("retries", "spend_hawk_retries_total", "counter", "Upload retries scheduled."),
+    ("retry_pending", "spend_hawk_retry_pending", "gauge", "Batches waiting to be retried."),
+    ("rolled_up", "spend_hawk_metrics_rolled_up_total", "counter", "Metrics folded into rollups."),
+    ("spool_bytes", "spend_hawk_spool_bytes", "gauge", "Bytes held in the durable spool."),
+)
+
+
+def render_prometheus() -> str:
+    """
+    Render the SDK's telemetry in the Prometheus text exposition format.
+
+    Returns:
+        Metrics text, as served by ``start_metrics_server``
+    """
+    from .pricing import pricing_status
+
+    stats = _client_stats()
+    lines: List[str] = []
+    for key, name, kind, help_text in _CLIENT_METRICS:
+        if key not in stats:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {stats[key]}")
+
+    lines.append("# HELP spend_hawk_circuit_open Whether the export circuit breaker is open.")
+    lines.append("# TYPE spend_hawk_circuit_open gauge")
+    lines.append(f"spend_hawk_circuit_open {1 if stats['circuit_state'] == 'open' else 0}")
+
+    _render_histogram(lines, "spend_hawk_batch_size", "Metrics per upload.", batch_sizes.snapshot())
+    _render_histogram(lines, "spend_hawk_export_duration_seconds", "Duration of each upload.",
+                      export_seconds.snapshot())
+    _render_summary(lines, "spend_hawk_send_metric_duration_seconds",
+                    "Time send_metric spends on the caller's thread.", send_metric_seconds.snapshot())
+    _render_summary(lines, "spend_hawk_wrapper_overhead_seconds",
+                    "Time provider wrappers spend around each call.", wrapper_overhead_seconds.snapshot())
+
+    pricing = pricing_status()
+    lines.append("# HELP spend_hawk_pricing_models Models in the pricing table.")
+    lines.append("# TYPE spend_hawk_pricing_models gauge")
+    lines.append(
+        f'spend_hawk_pricing_models{{source="{pricing["source"] or "none"}",'
+        f'version="{pricing["version"] or "none"}"}} {pricing["models"]}'
+    )
+    if pricing["age_seconds"] is not None:
+        lines.append("# HELP spend_hawk_pricing_age_seconds Age of the pricing data.")
+        lines.append("# TYPE spend_hawk_pricing_age_seconds gauge")
+        lines.append(f"spend_hawk_pricing_age_seconds {pricing['age_seconds']:.3f}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _metrics_handler():
+    """
+    Build the request handler serving ``render_prometheus()`` on /metrics.
+
+    Defined on first use so ``http.server`` is only imported by processes
+    that actually expose the endpoint.
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            try:
+                body = render_prometheus().encode("utf-8")
+            except Exception as e:
+                logger.error(f"Error rendering telemetry: {e}", exc_info=True)
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"Metrics endpoint: {format % args}")
+
+    return _MetricsHandler
+
+
+_server: Optional["ThreadingHTTPServer"] = None
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1") -> Optional["ThreadingHTTPServer"]:
+    """
+    Serve SDK telemetry for Prometheus scraping on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind; loopback by default
+
+    Returns:
+        The running server, or None if it couldn't be started
+    """
+    global _server
+
+    if _server is not None:
+        return _server
+
+    from http.server import ThreadingHTTPServer
+
+    try:
+        server = ThreadingHTTPServer((host, port), _metrics_handler())
+    except OSError as e:
+        logger.warning(f"Could not start Spend Hawk metrics endpoint on {host}:{port}: {e}")
+        return None
+
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever,
+        name="spend-hawk-metrics-endpoint",
+        daemon=True
+    ).start()
+    _server = server
+    logger.info(f"Spend Hawk metrics endpoint on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def stop_metrics_server():
+    """Stop the metrics endpoint, if running."""
+    global _server
+
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
@@ -0,0 +1,225 @@
+"""Shared HTTP transport for talking to the Spend Hawk backend."""
+import gzip
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from .config import config
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "spend-hawk-sdk/0.1.2"
+
+# Bodies smaller than this are sent uncompressed even when gzip is enabled
+GZIP_MIN_BYTES = 1024
+
+
+class TransportError(Exception):
+    """Network-level failure (timeout, connection error) worth retrying."""
+
+
+def _encode(payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize a payload into a request body and headers.
+
+    Args:
+        payload: JSON-serializable body
+
+    Returns:
+        Tuple of (body bytes, headers), gzipped when enabled and large enough
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    headers = {
+        "Authorization": f"Bearer {config.api_key}",
+        "Content-Type": "application/json",
+    }
+    if config.gzip and len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+class Transport:
+    """
+    Keep-alive HTTP transport shared by the metrics client and pricing.
+
+    A single ``requests.Session`` is created lazily and reused, so repeated
+    sends to the same host reuse pooled TCP/TLS connections instead of
+    opening a new one per request. ``requests`` itself is imported with
+    the first session, keeping it out of the SDK's import time.
+    """
+
+    def __init__(self):
+        self._session: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """Get the shared session, creating it on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> "requests.Session":
+        """Build a session with a connection pool sized from config."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_size,
+            pool_maxsize=config.pool_size,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: float = 5.0
+    ) -> "requests.Response":
+        """
+        POST a JSON payload to the configured backend.
+
+        Args:
+            path: Backend path (e.g. "/api/v1/metrics")
+            payload: JSON-serializable body
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response
+        """
+        body, headers = _encode(payload)
+        return self.session.post(
+            f"{config.api_endpoint}{path}",
+            data=body,
+            headers=headers,
+            timeout=timeout
+        )
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5.0
+    ) -> "requests.Response":
+        """
+        GET an absolute URL over the shared session.
+
+        Args:
+            url: Full URL to fetch
+            headers: Extra request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response
+        """
+        return self.session.get(url, headers=headers, timeout=timeout)
+
+    def reset_after_fork(self):
+        """
+        Forget the parent's session in a forked child.
+
+        Pooled sockets are shared with the parent after fork, so the child
+        must not reuse them. The session is dropped rather than closed and
+        a new one is created on next use.
+        """
+        self._lock = threading.Lock()
+        self._session = None
+
+    def close(self):
+        """Close pooled connections. A new session is created on next use."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# Global transport instance
+transport = Transport()
+
+
+class AsyncTransport:
+    """
+    Non-blocking transport for use on an asyncio event loop.
+
+    Uses ``httpx.AsyncClient`` when httpx is installed. Otherwise each POST
+    runs on the shared keep-alive ``transport`` in the loop's default
+    executor, so the event loop itself never blocks on network I/O.
+
+    One instance belongs to one event loop.
+    """
+
+    def __init__(self):
+        self._client = None
+        try:
+            import httpx
+            self._httpx = httpx
+        except ImportError:
+            self._httpx = None
+
+    async def post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: float = 5.0
+    ):
+        """
+        POST a JSON payload to the configured backend without blocking.
+
+        Args:
+            path: Backend path (e.g. "/api/v1/metrics/batch")
+            payload: JSON-serializable body
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response (exposes ``status_code`` and ``headers``)
+
+        Raises:
+            TransportError: On timeouts and connection failures
+        """
+        if self._httpx is None:
+            import asyncio
+            from requests.exceptions import RequestException
+
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(
+                    None, transport.post, path, payload, timeout
+                )
+            except RequestException as e:
+                raise TransportError(str(e)) from e
+
+        if self._client is None:
+            self._client = self._httpx.AsyncClient(
+                limits=self._httpx.Limits(
+                    max_connections=config.pool_size,
+                    max_keepalive_connections=config.pool_size,
+                ),
+                headers={"User-Agent": USER_AGENT},
+            )
+        body, headers = _encode(payload)
+        try:
+            return await self._client.post(
+                f"{config.api_endpoint}{path}",
+                content=body,
+                headers=headers,
+                timeout=timeout
+            )
+        except self._httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
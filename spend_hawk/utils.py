@@ -11,7 +11,9 @@ def calculate_cost(
     provider: str, 
     model: str, 
     input_tokens: int, 
-    output_tokens: int
+    output_tokens: int,
+    usage: Optional[Dict[str, Any]] = None,
+    snapshot=None
 ) -> float:
     """
     Calculate cost for an API call.
@@ -21,12 +23,14 @@ def calculate_cost(
         model: Model name
         input_tokens: Number of input tokens
         output_tokens: Number of output tokens
+        usage: Optional usage breakdown (cached, audio, image tokens, batch)
+        snapshot: Pricing snapshot to use (defaults to the current one)
         
     Returns:
         Cost in USD
     """
     # Use dynamic pricing module (provider parameter kept for backward compatibility)
-    return _calculate_cost(model, input_tokens, output_tokens)
+    return _calculate_cost(model, input_tokens, output_tokens, usage, snapshot)
 
 
 def get_timestamp() -> str:
@@ -35,24 +39,55 @@ def get_timestamp() -> str:
 
 
 class Timer:
-    """Simple timer for measuring latency."""
+    """
+    Monotonic, nanosecond-resolution timer for measuring latency.
+    
+    Provider wrappers read ``time.perf_counter_ns()`` directly rather than
+    allocating a Timer per call; this class remains for callers timing
+    their own code.
+    """
+    
+    __slots__ = ("start_ns", "end_ns")
     
     def __init__(self):
-        self.start_time = None
-        self.end_time = None
+        self.start_ns: Optional[int] = None
+        self.end_ns: Optional[int] = None
     
     def start(self):
         """Start the timer."""
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
+    
+    def stop_us(self) -> int:
+        """
+        Stop the timer and return elapsed time in microseconds.
+        
+        Returns:
+            Elapsed time in microseconds
+        """
+        self.end_ns = time.perf_counter_ns()
+        if self.start_ns is None:
+            return 0
+        return (self.end_ns - self.start_ns) // 1000
     
     def stop(self) -> int:
         """
         Stop the timer and return elapsed time in milliseconds.
         
         Returns:
-            Elapsed time in milliseconds
+            Elapsed time in whole milliseconds
         """
-        self.end_time = time.time()
-        if self.start_time is None:
-            return 0
-        return int((self.end_time - self.start_time) * 1000)
+        return self.stop_us() // 1000
+
+
+def overhead_us(before_call_ns: int, returned_ns: int) -> int:
+    """
+    Time spent in an SDK wrapper around a provider call.
+    
+    Args:
+        before_call_ns: Nanoseconds the wrapper spent before calling the provider
+        returned_ns: ``perf_counter_ns()`` reading when the provider call returned
+        
+    Returns:
+        Wrapper time before the call plus time since it returned, in microseconds
+    """
+    return (before_call_ns + time.perf_counter_ns() - returned_ns) // 1000
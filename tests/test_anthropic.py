@@ -64,3 +64,47 @@ def test_patched_anthropic_handles_errors():
         from spend_hawk.providers.anthropic import _patched_create
         with pytest.raises(Exception, match="API Error"):
             _patched_create(None)
+
+
+def test_patched_async_anthropic_extracts_metrics():
+    """Test that the AsyncAnthropic wrapper awaits the original and extracts metrics."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from spend_hawk.providers import anthropic as anthropic_provider
+    
+    mock_response = Mock()
+    mock_response.model = "claude-3-5-haiku-20241022"
+    mock_response.usage.input_tokens = 100
+    mock_response.usage.output_tokens = 50
+    
+    original = AsyncMock(return_value=mock_response)
+    create = anthropic_provider.MESSAGES.wrap(original, is_async=True)
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        result = asyncio.run(create(None))
+    
+    assert result is mock_response
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['provider'] == 'anthropic'
+    assert call_kwargs['model'] == 'claude-3-5-haiku-20241022'
+    assert call_kwargs['input_tokens'] == 100
+
+
+def test_anthropic_prompt_cache_tokens():
+    """Test that cache reads and writes are counted as input and broken out."""
+    from types import SimpleNamespace
+    from spend_hawk.providers.anthropic import MESSAGES
+    
+    response = SimpleNamespace(
+        model="claude-3-5-sonnet-20241022",
+        usage=SimpleNamespace(
+            input_tokens=10, output_tokens=5,
+            cache_read_input_tokens=900, cache_creation_input_tokens=100
+        )
+    )
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        MESSAGES.track(None, {}, response, 1_000_000, 0, 0)
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['input_tokens'] == 1010
+    assert call_kwargs['cached_input_tokens'] == 900
+    assert call_kwargs['cache_write_tokens'] == 100
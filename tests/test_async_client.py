@@ -0,0 +1,143 @@
+"""Tests for the asyncio metrics client."""
+import asyncio
+from unittest.mock import patch, Mock, AsyncMock
+
+from spend_hawk.async_client import _prune_closed_loops, get_async_client
+from spend_hawk.client import client
+from spend_hawk.config import config
+
+
+def _ok_response():
+    response = Mock()
+    response.status_code = 200
+    return response
+
+
+def test_no_client_without_running_loop():
+    """Test that the async client is only used on a running loop."""
+    assert get_async_client() is None
+
+
+def test_one_client_per_loop():
+    """Test that the same loop always gets the same client."""
+    async def main():
+        return get_async_client(), get_async_client()
+    
+    first, second = asyncio.run(main())
+    assert first is second
+    assert asyncio.run(main())[0] is not first
+
+
+def test_flushes_full_batch():
+    """Test that a full batch is sent in one non-blocking POST."""
+    async def main():
+        async_client = get_async_client()
+        async_client.transport.post = AsyncMock(return_value=_ok_response())
+        for i in range(3):
+            async_client.send({"n": i})
+        await async_client.flush()
+        return async_client
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'batch_size', 3):
+        async_client = asyncio.run(main())
+    
+    post = async_client.transport.post
+    assert post.await_count == 1
+    assert post.await_args[0][1] == {"metrics": [{"n": 0}, {"n": 1}, {"n": 2}]}
+    assert async_client.stats()['sent'] == 3
+
+
+def test_flushes_after_linger():
+    """Test that a partial batch is sent once linger_ms expires."""
+    async def main():
+        async_client = get_async_client()
+        async_client.transport.post = AsyncMock(return_value=_ok_response())
+        async_client.send({"n": 0})
+        await asyncio.sleep(0.05)
+        await async_client.flush()
+        return async_client
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'linger_ms', 10):
+        async_client = asyncio.run(main())
+    
+    assert async_client.transport.post.await_count == 1
+    assert async_client.stats()['sent'] == 1
+
+
+def test_send_metric_uses_loop_client():
+    """Test that send_metric routes to the async client inside a loop."""
+    from spend_hawk.providers.base import send_metric
+    
+    async def main():
+        async_client = get_async_client()
+        send_metric("openai", "gpt-4", 10, 5, 100)
+        return async_client
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'async_transport', True), \
+            patch.object(client, 'send_async') as mock_send_async:
+        async_client = asyncio.run(main())
+    
+    assert not mock_send_async.called
+    assert async_client.stats()['enqueued'] == 1
+
+
+def test_metric_from_short_lived_loop_is_sent_by_default():
+    """Test that a tracked call inside asyncio.run reaches the background thread."""
+    from spend_hawk.providers.base import send_metric
+    
+    async def main():
+        send_metric("anthropic", "claude-3-5-sonnet-20241022", 10, 5, 100)
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(client, 'send_async') as mock_send_async:
+        asyncio.run(main())
+    
+    assert mock_send_async.call_count == 1
+    assert mock_send_async.call_args[0][0].provider == "anthropic"
+
+
+def test_unflushed_metrics_of_closed_loop_are_handed_off():
+    """Test that metrics left buffered when a loop ends are not dropped."""
+    from spend_hawk.providers.base import send_metric
+    
+    async def main():
+        send_metric("anthropic", "claude-3-5-sonnet-20241022", 10, 5, 100)
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'async_transport', True), \
+            patch.object(config, 'linger_ms', 60_000), \
+            patch.object(client, 'send_async') as mock_send_async:
+        # Leave no closed loops from earlier tests behind
+        _prune_closed_loops()
+        mock_send_async.reset_mock()
+        
+        asyncio.run(main())
+        assert not mock_send_async.called
+        # The next loop's client prunes the closed one
+        asyncio.run(main())
+    
+    assert mock_send_async.call_count == 1
+    assert mock_send_async.call_args[0][0].provider == "anthropic"
+
+
+def test_clients_of_finished_loops_are_collected():
+    """Test that a loop's client doesn't keep the loop alive after asyncio.run."""
+    import gc
+    from spend_hawk import async_client as async_client_module
+    
+    async def main():
+        async_client = get_async_client()
+        async_client.transport.post = AsyncMock(return_value=_ok_response())
+        async_client.send({"n": 0})
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'linger_ms', 60_000), \
+            patch.object(client, 'send_async'):
+        for _ in range(50):
+            asyncio.run(main())
+    gc.collect()
+    
+    assert len(async_client_module._clients) <= 1
@@ -0,0 +1,139 @@
+"""Tests for batch result ingestion."""
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+
+from spend_hawk import batches, pricing
+
+
+def _openai_line(custom_id, model="gpt-4o", prompt=1000, completion=200, cached=0, status=200):
+    return {
+        "id": f"batch_req_{custom_id}",
+        "custom_id": custom_id,
+        "response": {
+            "status_code": status,
+            "request_id": "req_1",
+            "body": {
+                "model": model,
+                "choices": [{"message": {"role": "assistant", "content": "Hi"}}],
+                "usage": {
+                    "prompt_tokens": prompt,
+                    "completion_tokens": completion,
+                    "total_tokens": prompt + completion,
+                    "prompt_tokens_details": {"cached_tokens": cached, "audio_tokens": 0},
+                },
+            },
+        },
+        "error": None,
+    }
+
+
+def _anthropic_line(custom_id, result_type="succeeded"):
+    result = {"type": result_type}
+    if result_type == "succeeded":
+        result["message"] = {
+            "model": "claude-3-haiku-20240307",
+            "content": [{"type": "text", "text": "Hi"}],
+            "usage": {
+                "input_tokens": 100,
+                "output_tokens": 50,
+                "cache_read_input_tokens": 400,
+                "cache_creation_input_tokens": 0,
+            },
+        }
+    return {"custom_id": custom_id, "result": result}
+
+
+@pytest.fixture(autouse=True)
+def fallback_table():
+    snapshot = pricing.PricingSnapshot(pricing._fallback_pricing(), "fallback")
+    with patch.object(pricing, "_snapshot", snapshot):
+        yield
+
+
+@pytest.fixture
+def client():
+    client = Mock()
+    with patch.object(batches, "get_client", return_value=client):
+        yield client
+
+
+def _sent(client):
+    return [record for call in client.send_many.call_args_list for record in call[0][0]]
+
+
+def test_ingests_openai_file_at_batch_discount(tmp_path, client):
+    """Test that OpenAI output lines become batch-priced metrics."""
+    path = tmp_path / "output.jsonl"
+    lines = [_openai_line("a"), _openai_line("b", cached=512), _openai_line("c", status=500)]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    
+    stats = batches.ingest_batch_results(path, batch_id="batch_123")
+    
+    assert stats["lines"] == 3
+    assert stats["tracked"] == 2
+    assert stats["failed"] == 1
+    assert stats["input_tokens"] == 2000
+    
+    records = _sent(client)
+    assert [record.extra_fields["custom_id"] for record in records] == ["a", "b"]
+    assert records[1].extra_fields["cached_input_tokens"] == 512
+    assert all(record.extra_fields["batch"] for record in records)
+    assert records[0].extra_fields["batch_id"] == "batch_123"
+    
+    full_price = pricing.calculate_cost("gpt-4o", 1000, 200)
+    cached = pricing.calculate_cost("gpt-4o", 1000, 200, {"cached_input_tokens": 512, "batch": True})
+    assert stats["cost"] == pytest.approx(full_price * 0.5 + cached)
+
+
+def test_ingests_anthropic_results(client):
+    """Test Anthropic results, cache tokens included and unbilled results skipped."""
+    lines = [
+        json.dumps(_anthropic_line("a")).encode(),
+        b"",
+        json.dumps(_anthropic_line("b", "errored")).encode(),
+        json.dumps(_anthropic_line("c", "expired")).encode(),
+        b"{not json",
+    ]
+    
+    stats = batches.ingest_batch_results(lines)
+    
+    assert stats["tracked"] == 1
+    assert stats["failed"] == 2
+    assert stats["invalid"] == 1
+    (record,) = _sent(client)
+    assert record.provider == "anthropic"
+    assert record.input_tokens == 500
+    assert record.extra_fields["cached_input_tokens"] == 400
+
+
+def test_sends_in_chunks(client):
+    """Test that records are handed to the client in bounded chunks."""
+    lines = [_openai_line(str(i)) for i in range(5)]
+    with patch.object(batches, "CHUNK_SIZE", 2):
+        batches.ingest_batch_results(lines)
+    
+    assert [len(call[0][0]) for call in client.send_many.call_args_list] == [2, 2, 1]
+
+
+def test_batch_records_leave_latency_alone(client):
+    """Test that batch results skip latency sketches and rollup histograms."""
+    from spend_hawk.rollup import Rollup
+    from spend_hawk.sketch import LatencySketches
+    
+    batches.ingest_batch_results([_openai_line(str(i)) for i in range(3)])
+    records = _sent(client)
+    assert not any(record.timed for record in records)
+    
+    sketches = LatencySketches()
+    sketches.add_records(records)
+    assert sketches.quantiles() == []
+    
+    rollup = Rollup(0, records[0], "proj", "agent", {}, pricing.get_pricing_snapshot())
+    for record in records:
+        rollup.add(record)
+    payload = rollup.to_dict(10)
+    assert payload["count"] == 3
+    assert payload["latency_ms_min"] is None
+    assert sum(payload["latency_histogram"]["counts"]) == 0
@@ -0,0 +1,77 @@
+"""Tests for column-wise cost calculation."""
+import pytest
+from unittest.mock import patch
+
+from spend_hawk import bulk, pricing
+
+ROWS = [
+    ("gpt-4o", 1000, 500),
+    ("gpt-4o-2024-08-06", 2000, 0),
+    ("claude-3-5-haiku-20241022", 10, 10),
+    ("gemini-1.5-pro", 200000, 1000),
+    ("gemini-1.5-pro", 1000, 1000),
+    ("unknown-model", 1000, 1000),
+    (None, 1000, 1000),
+]
+
+
+@pytest.fixture(autouse=True)
+def fallback_table():
+    snapshot = pricing.PricingSnapshot(pricing._fallback_pricing(), "fallback")
+    with patch.object(pricing, "_snapshot", snapshot):
+        yield
+
+
+def _columns(rows):
+    models, inputs, outputs = zip(*rows)
+    return list(models), list(inputs), list(outputs)
+
+
+def _scalar(rows):
+    return [pricing.calculate_cost(model, i, o) for model, i, o in rows]
+
+
+def test_matches_scalar_costs():
+    """Test that bulk costs equal calculate_cost row by row, tiers included."""
+    expected = _scalar(ROWS)
+    assert expected[3] > expected[4] > 0  # Long-context tier applies
+    assert list(bulk.calculate_costs(*_columns(ROWS))) == pytest.approx(expected)
+
+
+def test_pure_python_fallback():
+    """Test the path used when NumPy isn't installed."""
+    with patch.object(bulk, "_numpy", return_value=None):
+        costs = bulk.calculate_costs(*_columns(ROWS))
+    assert isinstance(costs, list)
+    assert costs == pytest.approx(_scalar(ROWS))
+
+
+def test_resolves_each_model_once():
+    """Test that distinct model strings are looked up once, not per row."""
+    rows = ROWS * 100
+    index = pricing.get_pricing_snapshot().index
+    with patch.object(index, "lookup", wraps=index.lookup) as lookup:
+        bulk.calculate_costs(*_columns(rows))
+    assert lookup.call_count == len({model for model, _, _ in ROWS if model is not None})
+
+
+def test_length_mismatch():
+    """Test that ragged columns are rejected."""
+    with pytest.raises(ValueError):
+        bulk.calculate_costs(["gpt-4o"], [1, 2], [1])
+
+
+def test_numpy_and_arrow_columns():
+    """Test NumPy and PyArrow inputs, when those libraries are installed."""
+    np = pytest.importorskip("numpy")
+    models, inputs, outputs = _columns(ROWS)
+    expected = _scalar(ROWS)
+    
+    costs = bulk.calculate_costs(np.array(models, dtype=object), np.array(inputs), np.array(outputs))
+    assert costs.tolist() == pytest.approx(expected)
+    
+    pa = pytest.importorskip("pyarrow")
+    costs = bulk.calculate_costs(
+        pa.chunked_array([models[:3], models[3:]]), pa.array(inputs), pa.array(outputs)
+    )
+    assert costs.tolist() == pytest.approx(expected)
@@ -1,4 +1,6 @@
 """Tests for metrics client."""
+import time
+
 import pytest
 from unittest.mock import patch, Mock
 import requests
@@ -21,12 +23,13 @@ class TestMetricsClient:
         """Test that metrics are queued when configured."""
         client = MetricsClient()
         
-        with patch.object(config, 'is_configured', return_value=True):
+        with patch.object(config, 'is_configured', return_value=True), \
+                patch.object(client, 'start_worker'):
             metric = {"test": "metric"}
             client.send_async(metric)
             assert client.queue.qsize() == 1
     
-    @patch('spend_hawk.client.requests.post')
+    @patch('spend_hawk.client.transport.post')
     def test_send_with_retry_success(self, mock_post):
         """Test successful metric send."""
         mock_response = Mock()
@@ -36,28 +39,37 @@ class TestMetricsClient:
         client = MetricsClient()
         metric = {"provider": "openai", "model": "gpt-4"}
         
-        with patch.object(config, 'api_key', 'test_key'):
-            with patch.object(config, 'api_endpoint', 'https://test.com'):
-                client._send_with_retry(metric, max_retries=1)
+        with patch.object(config, 'batch_size', 1):
+            client._attempt([metric], 0)
         
-        assert mock_post.called
         assert mock_post.call_count == 1
+        assert mock_post.call_args[0][0] == '/api/v1/metrics'
+        assert client.stats()['sent'] == 1
     
-    @patch('spend_hawk.client.requests.post')
+    @patch('spend_hawk.client.transport.post')
     def test_send_with_retry_failure(self, mock_post):
-        """Test metric send with retries on failure."""
+        """Test that failures are retried from the delay queue, not inline."""
         mock_post.side_effect = requests.exceptions.Timeout()
         
         client = MetricsClient()
         metric = {"provider": "openai", "model": "gpt-4"}
         
-        with patch.object(config, 'api_key', 'test_key'):
-            with patch.object(config, 'api_endpoint', 'https://test.com'):
-                client._send_with_retry(metric, max_retries=2)
+        with patch.object(config, 'max_retries', 2):
+            client._attempt([metric], 0)
+            
+            # First failure is parked instead of sleeping in the worker
+            assert mock_post.call_count == 1
+            assert client.stats()['retry_pending'] == 1
+            
+            _, seq, attempt, batch, segments = client._retry_heap[0]
+            client._retry_heap[0] = (0.0, seq, attempt, batch, segments)
+            client._run_due_retries()
         
         assert mock_post.call_count == 2  # Should retry
+        assert client.stats()['retry_pending'] == 0
+        assert client.stats()['failed'] == 1
     
-    @patch('spend_hawk.client.requests.post')
+    @patch('spend_hawk.client.transport.post')
     def test_send_with_retry_auth_error_no_retry(self, mock_post):
         """Test that 401 errors don't trigger retries."""
         mock_response = Mock()
@@ -67,8 +79,258 @@ class TestMetricsClient:
         client = MetricsClient()
         metric = {"provider": "openai", "model": "gpt-4"}
         
-        with patch.object(config, 'api_key', 'bad_key'):
-            with patch.object(config, 'api_endpoint', 'https://test.com'):
-                client._send_with_retry(metric, max_retries=3)
+        client._attempt([metric], 0)
         
         assert mock_post.call_count == 1  # Should not retry auth errors
+        assert client.stats()['retry_pending'] == 0
+    
+    @patch('spend_hawk.client.transport.post')
+    def test_retry_after_is_honored(self, mock_post):
+        """Test that Retry-After on 429 sets the retry delay."""
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "120"}
+        mock_post.return_value = mock_response
+        
+        client = MetricsClient()
+        client._attempt([{"model": "gpt-4"}], 0)
+        
+        due = client._retry_heap[0][0]
+        assert 110 < due - time.monotonic() <= 120
+    
+    @patch('spend_hawk.client.transport.post')
+    def test_circuit_breaker_stops_sends(self, mock_post):
+        """Test that an open breaker parks batches without sending."""
+        mock_post.side_effect = requests.exceptions.ConnectionError()
+        
+        with patch.object(config, 'circuit_failure_threshold', 2):
+            client = MetricsClient()
+        
+        with patch.object(config, 'max_retries', 10):
+            client._attempt([{"n": 0}], 0)
+            client._attempt([{"n": 1}], 0)
+            assert client.stats()['circuit_state'] == 'open'
+            
+            client._attempt([{"n": 2}], 0)
+        
+        assert mock_post.call_count == 2
+        assert client.stats()['retry_pending'] == 3
+    
+    def test_drain_batch_respects_batch_size(self):
+        """Test that a batch stops growing at batch_size."""
+        client = MetricsClient()
+        for i in range(10):
+            client.queue.put({"n": i})
+        
+        with patch.object(config, 'batch_size', 4):
+            batch = client._drain_batch(client.queue.get())
+        
+        assert [m["n"] for m in batch] == [0, 1, 2, 3]
+        assert client.queue.qsize() == 6
+    
+    def test_drain_batch_respects_linger(self):
+        """Test that a partial batch is released once linger_ms expires."""
+        client = MetricsClient()
+        
+        with patch.object(config, 'batch_size', 100):
+            with patch.object(config, 'linger_ms', 10):
+                batch = client._drain_batch({"n": 0})
+        
+        assert batch == [{"n": 0}]
+    
+    @patch('spend_hawk.client.transport.post')
+    def test_batch_sent_to_bulk_endpoint(self, mock_post):
+        """Test that batches are posted once to the bulk endpoint."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_post.return_value = mock_response
+        
+        client = MetricsClient()
+        batch = [{"model": "gpt-4"}, {"model": "gpt-4o"}]
+        
+        with patch.object(config, 'batch_size', 100):
+            client._attempt(batch, 0)
+        
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[0][0] == '/api/v1/metrics/batch'
+        assert mock_post.call_args[0][1] == {"metrics": batch}
+
+
+class TestBackpressure:
+    
+    def _client(self, max_size):
+        with patch.object(config, 'max_queue_size', max_size):
+            client = MetricsClient()
+        client.start_worker = Mock()
+        return client
+    
+    def test_drop_newest(self):
+        """Test that new metrics are dropped when the queue is full."""
+        client = self._client(2)
+        
+        with patch.object(config, 'is_configured', return_value=True):
+            with patch.object(config, 'overflow_policy', 'drop_newest'):
+                for i in range(5):
+                    client.send_async({"n": i})
+        
+        stats = client.stats()
+        assert stats['queue_depth'] == 2
+        assert stats['enqueued'] == 2
+        assert stats['dropped'] == 3
+        assert client.queue.get_nowait() == {"n": 0}
+    
+    def test_drop_oldest(self):
+        """Test that the oldest metrics are evicted when the queue is full."""
+        client = self._client(2)
+        
+        with patch.object(config, 'is_configured', return_value=True):
+            with patch.object(config, 'overflow_policy', 'drop_oldest'):
+                for i in range(5):
+                    client.send_async({"n": i})
+        
+        assert client.stats()['dropped'] == 3
+        assert [client.queue.get_nowait()["n"] for _ in range(2)] == [3, 4]
+    
+    def test_block_times_out(self):
+        """Test that the block policy gives up after block_timeout_ms."""
+        client = self._client(1)
+        
+        with patch.object(config, 'is_configured', return_value=True):
+            with patch.object(config, 'overflow_policy', 'block'):
+                with patch.object(config, 'block_timeout_ms', 10):
+                    client.send_async({"n": 0})
+                    client.send_async({"n": 1})
+        
+        assert client.stats()['dropped'] == 1
+    
+    def test_send_many_waits_instead_of_dropping(self):
+        """Test that send_many blocks for room rather than applying the overflow policy."""
+        import threading
+        client = self._client(2)
+        received = []
+        
+        def drain():
+            while len(received) < 5:
+                received.append(client.queue.get(timeout=1)["n"])
+        
+        consumer = threading.Thread(target=drain)
+        consumer.start()
+        with patch.object(config, 'is_configured', return_value=True):
+            with patch.object(config, 'overflow_policy', 'drop_newest'):
+                client.send_many([{"n": i} for i in range(5)])
+        consumer.join(timeout=2)
+        
+        assert received == [0, 1, 2, 3, 4]
+        assert client.stats()['enqueued'] == 5
+        assert client.stats()['dropped'] == 0
+    
+    def test_spill_and_reload(self, tmp_path):
+        """Test that overflow spills to disk and is reloaded when there is room."""
+        client = self._client(2)
+        
+        with patch.object(config, 'is_configured', return_value=True), \
+                patch.object(config, 'overflow_policy', 'spill'), \
+                patch.object(config, 'spill_dir', str(tmp_path)):
+            for i in range(5):
+                client.send_async({"n": i})
+            
+            assert client.stats()['spilled'] == 3
+            assert client.stats()['spill_pending'] == 3
+            
+            client.queue.get_nowait()
+            client.queue.get_nowait()
+            client._reload_spill()
+        
+        assert client.stats()['spill_pending'] == 1
+        assert [client.queue.get_nowait()["n"] for _ in range(2)] == [2, 3]
+    
+    def test_restart_adopts_orphaned_spill_files(self, tmp_path):
+        """Test that spill files of exited processes are reloaded, but not a live sibling's."""
+        orphan = tmp_path / "spill-999999999-dead.jsonl"
+        orphan.write_text('{"n":0}\n{"n":1}\n{"n":2}\n{"n":')
+        
+        with patch.object(config, 'is_configured', return_value=True), \
+                patch.object(config, 'overflow_policy', 'spill'), \
+                patch.object(config, 'spill_dir', str(tmp_path)):
+            sibling = self._client(1)
+            sibling.send_async({"n": "sibling"})
+            sibling.send_async({"n": "sibling"})
+            assert sibling.stats()['spill_pending'] == 1
+            
+            client = self._client(10)
+            client._adopt_spill()
+            assert client.stats()['spill_pending'] == 3
+            assert not orphan.exists()
+            assert sibling._spill_path().exists()
+            
+            client._reload_spill()
+        
+        assert [client.queue.get_nowait()["n"] for _ in range(3)] == [0, 1, 2]
+        assert client.stats()['spill_pending'] == 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == [sibling._spill_path().name]
+
+
+def test_record_is_priced_when_sent():
+    """Test that send_metric defers costing to the worker's payload build."""
+    from spend_hawk.providers.base import send_metric
+    from spend_hawk.records import MetricRecord
+    from spend_hawk.context import context
+    
+    client = MetricsClient()
+    client.start_worker = Mock()
+    
+    with patch('spend_hawk.providers.base.get_client', return_value=client), \
+            patch.object(config, 'is_configured', return_value=True), \
+            patch('spend_hawk.records.calculate_cost', return_value=0.5) as mock_cost:
+        with context(project_id="deferred", agent="worker"):
+            send_metric("openai", "gpt-4", 1000, 500, 120, stream=True)
+        
+        record = client.queue.get_nowait()
+        assert isinstance(record, MetricRecord)
+        assert not mock_cost.called
+        
+        payload = client._to_payload(record)
+    
+    assert mock_cost.called
+    assert payload["cost"] == 0.5
+    assert payload["project_id"] == "deferred"
+    assert payload["agent"] == "worker"
+    assert payload["stream"] is True
+    assert payload["timestamp"].endswith("+00:00")
+
+
+def test_metric_record_is_compact():
+    """Test that records carry no per-instance dict or empty extras."""
+    from spend_hawk.records import MetricRecord
+    
+    record = MetricRecord("openai", "gpt-4o", 10, 5, 100, (None, None, {}), {})
+    
+    assert not hasattr(record, '__dict__')
+    assert record.extra_fields is None
+    assert "stream" not in record.to_dict()
+
+
+def test_payload_has_microsecond_latency_and_overhead():
+    """Test that fractional latency is exported in ms and µs with SDK overhead."""
+    from spend_hawk.records import MetricRecord
+    
+    record = MetricRecord("openai", "gpt-4o", 10, 5, 812.3456, (None, None, {}), None, 37)
+    
+    with patch('spend_hawk.records.calculate_cost', return_value=0.0):
+        payload = record.to_dict()
+    
+    assert payload["latency_ms"] == 812
+    assert payload["latency_us"] == 812346
+    assert payload["sdk_overhead_us"] == 37
+    assert MetricRecord.from_raw(record.to_raw()).sdk_overhead_us == 37
+
+
+def test_timer_uses_monotonic_clock():
+    """Test that Timer is unaffected by wall-clock jumps."""
+    from spend_hawk.utils import Timer
+    
+    timer = Timer()
+    with patch('time.time', return_value=0):
+        timer.start()
+        time.sleep(0.002)
+        assert timer.stop_us() >= 2000
@@ -0,0 +1,119 @@
+"""Tests for the local collector and fork safety."""
+import os
+import tempfile
+import threading
+
+import pytest
+from unittest.mock import patch, Mock
+
+from spend_hawk.client import MetricsClient
+from spend_hawk.collector import Collector, CollectorSender
+from spend_hawk.config import config
+from spend_hawk.records import MetricRecord
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 bytes, so avoid pytest's tmp_path
+    directory = tempfile.mkdtemp(prefix="sh-")
+    yield os.path.join(directory, "collector.sock")
+
+
+def _record():
+    return MetricRecord(
+        "openai", "gpt-4o", 10, 5, 100, ("proj", None, {"team": "search", "tier": 2}), {"stream": True}
+    )
+
+
+def test_records_round_trip_through_collector(socket_path):
+    """Test that a datagram from a sender is queued by the collector."""
+    collector = Collector(socket_path)
+    collector.client.start_worker = Mock()
+    collector.bind()
+    thread = threading.Thread(target=collector.serve_forever, daemon=True)
+    
+    with patch.object(config, 'is_configured', return_value=True):
+        thread.start()
+        assert CollectorSender(socket_path).send(_record())
+        
+        record = collector.client.queue.get(timeout=2)
+        collector._stopping.set()
+        thread.join(timeout=2)
+    
+    assert collector.received == 1
+    assert record.model == "gpt-4o"
+    assert record.context[0] == "proj"
+    assert record.context[2] == {"team": "search", "tier": 2}
+    assert record.extra_fields == {"stream": True}
+
+
+def test_send_async_forwards_to_collector(socket_path):
+    """Test that the client hands records to the collector instead of queueing."""
+    collector = Collector(socket_path)
+    collector.bind()
+    client = MetricsClient()
+    client.start_worker = Mock()
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'collector_socket', socket_path):
+        client.send_async(_record())
+    
+    assert client.queue.qsize() == 0
+    assert client.stats()['enqueued'] == 1
+    assert not client.start_worker.called
+    collector._sock.close()
+
+
+def test_send_async_falls_back_without_collector(socket_path):
+    """Test that metrics are exported in-process when no collector is listening."""
+    client = MetricsClient()
+    client.start_worker = Mock()
+    
+    with patch.object(config, 'is_configured', return_value=True), \
+            patch.object(config, 'collector_socket', socket_path):
+        client.send_async(_record())
+    
+    assert client.queue.qsize() == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_child_starts_with_fresh_state():
+    """Test that a forked child drops the parent's queue, worker and session."""
+    from spend_hawk.client import client
+    from spend_hawk.transport import transport
+    
+    transport.session  # Create the parent's pooled session
+    parent_queue = client.queue
+    
+    pid = os.fork()
+    if pid == 0:
+        ok = (
+            client.queue is not parent_queue
+            and client.worker_thread is None
+            and client.stats()['enqueued'] == 0
+            and transport._session is None
+        )
+        os._exit(0 if ok else 1)
+    
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_child_does_not_inherit_held_telemetry_locks():
+    """Test that sketch and telemetry locks held at fork time are usable in the child."""
+    from spend_hawk import telemetry
+    from spend_hawk.sketch import latency_sketches
+    
+    with latency_sketches._lock, telemetry.export_seconds._lock, telemetry._rate_lock:
+        pid = os.fork()
+        if pid == 0:
+            ok = (
+                latency_sketches._lock.acquire(timeout=1)
+                and telemetry.export_seconds._lock.acquire(timeout=1)
+                and telemetry._rate_lock.acquire(timeout=1)
+            )
+            os._exit(0 if ok else 1)
+    
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
@@ -160,3 +160,74 @@ def test_google_integration_with_patch_all():
             with patch('spend_hawk.patch.unpatch_google') as mock_unpatch_google:
                 unpatch_all()
                 assert mock_unpatch_google.called
+
+
+def test_patched_google_async_extracts_metrics():
+    """Test that generate_content_async is awaited and metrics extracted."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from spend_hawk.providers import google as google_provider
+    
+    mock_response = Mock()
+    mock_response.usage_metadata.prompt_token_count = 100
+    mock_response.usage_metadata.candidates_token_count = 50
+    mock_self = Mock()
+    mock_self.model_name = "gemini-1.5-flash"
+    
+    original = AsyncMock(return_value=mock_response)
+    generate = google_provider.GENERATE_CONTENT.wrap(original, is_async=True)
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        result = asyncio.run(generate(mock_self))
+    
+    assert result is mock_response
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['provider'] == 'google'
+    assert call_kwargs['model'] == 'gemini-1.5-flash'
+    assert call_kwargs['output_tokens'] == 50
+
+
+def test_google_usage_details_from_proto_messages():
+    """Test modality counts are read from proto-plus repeated fields, not just lists."""
+    proto = pytest.importorskip("proto")
+    from spend_hawk.providers.google import GENERATE_CONTENT
+    
+    # Mirrors generativelanguage v1beta UsageMetadata; the installed
+    # google-ai-generativelanguage may predate the modality fields
+    class Modality(proto.Enum):
+        MODALITY_UNSPECIFIED = 0
+        TEXT = 1
+        IMAGE = 2
+        AUDIO = 4
+    
+    class ModalityTokenCount(proto.Message):
+        modality = proto.Field(Modality, number=1)
+        token_count = proto.Field(proto.INT32, number=2)
+    
+    class UsageMetadata(proto.Message):
+        prompt_token_count = proto.Field(proto.INT32, number=1)
+        candidates_token_count = proto.Field(proto.INT32, number=2)
+        cached_content_token_count = proto.Field(proto.INT32, number=4)
+        prompt_tokens_details = proto.RepeatedField(ModalityTokenCount, number=9)
+        candidates_tokens_details = proto.RepeatedField(ModalityTokenCount, number=12)
+    
+    usage = UsageMetadata(
+        prompt_token_count=1300,
+        candidates_token_count=400,
+        cached_content_token_count=256,
+        prompt_tokens_details=[
+            ModalityTokenCount(modality=Modality.TEXT, token_count=300),
+            ModalityTokenCount(modality=Modality.IMAGE, token_count=258),
+            ModalityTokenCount(modality=Modality.AUDIO, token_count=742),
+        ],
+        candidates_tokens_details=[
+            ModalityTokenCount(modality=Modality.AUDIO, token_count=400),
+        ],
+    )
+    assert not isinstance(usage.prompt_tokens_details, (list, tuple))
+    
+    assert GENERATE_CONTENT.read_usage(usage) == (1300, 400, {
+        "cached_input_tokens": 256,
+        "image_input_tokens": 258,
+        "audio_input_tokens": 742,
+        "audio_output_tokens": 400,
+    })
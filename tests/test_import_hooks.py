@@ -0,0 +1,115 @@
+"""Tests for patching providers when their SDK is imported."""
+import importlib
+import sys
+
+import pytest
+from unittest.mock import Mock, patch
+
+from spend_hawk import import_hooks
+from spend_hawk import patch as patch_module
+
+
+@pytest.fixture
+def fake_packages(tmp_path, monkeypatch):
+    """Make throwaway packages importable and forget them afterwards."""
+    created = []
+    
+    def make(name, body="LOADED = True\n"):
+        package = tmp_path.joinpath(*name.split("."))
+        package.mkdir(parents=True, exist_ok=True)
+        (package / "__init__.py").write_text(body)
+        created.append(name)
+    
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    yield make
+    
+    import_hooks.clear_import_hooks()
+    for name in list(sys.modules):
+        if any(name == root or name.startswith(root + ".") for root in created):
+            del sys.modules[name]
+
+
+def test_hook_runs_after_module_executes(fake_packages):
+    """Test that the callback runs once, after the module body ran."""
+    fake_packages("sh_fake_sdk")
+    seen = []
+    
+    import_hooks.when_imported("sh_fake_sdk", lambda: seen.append(sys.modules["sh_fake_sdk"].LOADED))
+    assert "sh_fake_sdk" not in sys.modules
+    assert seen == []
+    
+    module = importlib.import_module("sh_fake_sdk")
+    importlib.reload(module)
+    
+    assert seen == [True]
+    assert import_hooks.pending_imports() == []
+    assert type(module.__loader__).__name__ != "_Loader"
+
+
+def test_hook_runs_now_if_already_imported(fake_packages):
+    """Test that an already-loaded module triggers the callback immediately."""
+    fake_packages("sh_fake_loaded")
+    importlib.import_module("sh_fake_loaded")
+    callback = Mock()
+    
+    import_hooks.when_imported("sh_fake_loaded", callback)
+    
+    assert callback.called
+    assert import_hooks.pending_imports() == []
+
+
+def test_hook_for_submodule(fake_packages):
+    """Test watching a dotted name such as google.generativeai."""
+    fake_packages("sh_fake_ns.genai")
+    callback = Mock()
+    
+    import_hooks.when_imported("sh_fake_ns.genai", callback)
+    importlib.import_module("sh_fake_ns")
+    assert not callback.called
+    
+    importlib.import_module("sh_fake_ns.genai")
+    assert callback.called
+
+
+def test_failing_hook_does_not_break_import(fake_packages):
+    """Test that an error in a hook never reaches the user's import."""
+    fake_packages("sh_fake_broken")
+    import_hooks.when_imported("sh_fake_broken", Mock(side_effect=RuntimeError("boom")))
+    
+    assert importlib.import_module("sh_fake_broken").LOADED
+
+
+def test_lazy_patch_all_patches_on_import(fake_packages, monkeypatch):
+    """Test that lazy patch_all patches only SDKs the application imports."""
+    if "openai" in sys.modules:
+        pytest.skip("the real openai SDK is already imported in this process")
+    monkeypatch.setattr(patch_module, "_patched", False)
+    fake_packages("openai")
+    
+    sdks = {"openai", "anthropic", "google.generativeai", "mistralai", "cohere"}
+    with patch.object(patch_module, "patch_openai") as patch_openai, \
+            patch.object(patch_module, "patch_anthropic") as patch_anthropic, \
+            patch.object(patch_module, "patch_google") as patch_google, \
+            patch.object(patch_module, "patch_mistral"), \
+            patch.object(patch_module, "patch_cohere"):
+        patch_module.patch_all(lazy=True)
+        
+        assert not patch_openai.called
+        # SDKs other tests already imported are patched at once instead
+        assert set(import_hooks.pending_imports()) == {name for name in sdks if name not in sys.modules}
+        
+        importlib.import_module("openai")
+        
+        assert patch_openai.called
+        assert not patch_anthropic.called and not patch_google.called
+    
+    with patch.object(patch_module, "unpatch_openai"), \
+            patch.object(patch_module, "unpatch_anthropic"), \
+            patch.object(patch_module, "unpatch_google"), \
+            patch.object(patch_module, "unpatch_mistral"), \
+            patch.object(patch_module, "unpatch_cohere"):
+        patch_module.unpatch_all()
+    
+    assert import_hooks.pending_imports() == []
+    assert import_hooks._finder not in sys.meta_path
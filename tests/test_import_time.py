@@ -0,0 +1,69 @@
+"""Tests that importing the SDK stays cheap."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import spend_hawk
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Regression budget for ``import spend_hawk`` (cumulative, per -X importtime).
+# It takes a few ms today; the budget leaves room for slow CI machines while
+# still catching an eager import of the HTTP stack or provider modules.
+IMPORT_BUDGET_US = 25_000
+
+# Loaded on first send, first patch or first use of the metrics endpoint
+DEFERRED_MODULES = (
+    "requests",
+    "urllib3",
+    "asyncio",
+    "http.server",
+    "spend_hawk.client",
+    "spend_hawk.transport",
+    "spend_hawk.pricing",
+    "spend_hawk.providers",
+)
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def test_import_time_budget():
+    """Test that ``import spend_hawk`` stays within its import-time budget."""
+    result = _run("import spend_hawk", "-X", "importtime")
+    
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "spend_hawk":
+            cumulative = int(parts[1])
+    
+    assert cumulative is not None, result.stderr
+    assert cumulative < IMPORT_BUDGET_US, f"import spend_hawk took {cumulative} us"
+
+
+def test_import_defers_heavy_modules():
+    """Test that the HTTP stack, pricing and providers aren't loaded at import."""
+    result = _run(
+        "import sys, spend_hawk; "
+        "print('\\n'.join(m for m in sys.modules if not m.startswith('_')))"
+    )
+    loaded = set(result.stdout.split())
+    
+    assert not loaded & set(DEFERRED_MODULES)
+
+
+def test_lazy_exports_resolve():
+    """Test that every public name is importable from the package."""
+    for name in spend_hawk.__all__:
+        assert getattr(spend_hawk, name) is not None
+    
+    assert spend_hawk.calculate_cost is spend_hawk.pricing.calculate_cost
+    assert set(spend_hawk.__all__) <= set(dir(spend_hawk))
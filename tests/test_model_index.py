@@ -0,0 +1,70 @@
+"""Tests for model-name resolution."""
+import pytest
+
+from spend_hawk import pricing
+from spend_hawk.model_index import ModelIndex, normalize_model_name
+
+TABLE = {
+    "gpt-4": {"input": 0.03, "output": 0.06},
+    "gpt-4o": {"input": 0.005, "output": 0.015},
+    "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},
+    "claude-3-5-sonnet-20240620": {"input": 0.003, "output": 0.015},
+    "claude-3-5-sonnet-20241022": {"input": 0.003, "output": 0.015},
+    "claude-3-haiku-20240307": {"input": 0.00025, "output": 0.00125},
+    "gemini-1.5-pro": {"input": 0.00075, "output": 0.003},
+}
+
+
+@pytest.mark.parametrize("reported, expected", [
+    ("gpt-4o", "gpt-4o"),
+    ("GPT-4o", "gpt-4o"),
+    ("gpt-4o-2024-08-06", "gpt-4o"),
+    ("gpt-4o-mini-2024-07-18", "gpt-4o-mini"),
+    ("gpt-4-0613", "gpt-4"),
+    ("models/gemini-1.5-pro-002", "gemini-1.5-pro"),
+    ("claude-3-5-sonnet-latest", "claude-3-5-sonnet-20241022"),
+    ("claude-3-5-sonnet@20240620", "claude-3-5-sonnet-20240620"),
+    ("anthropic.claude-3-haiku-20240307-v1:0", "claude-3-haiku-20240307"),
+    ("ft:gpt-4o-mini-2024-07-18:acme::abc123", "gpt-4o-mini"),
+    ("gpt-4o-audio-preview", "gpt-4o"),
+    ("llama-3-70b", None),
+])
+def test_resolution(reported, expected):
+    """Test exact, normalized, suffix-stripped and prefix resolution."""
+    assert ModelIndex(TABLE).resolve(reported) == expected
+
+
+def test_prefix_match_respects_boundaries():
+    """Test that a key only matches as a prefix at a separator."""
+    index = ModelIndex({"gpt-4": {}})
+    assert index.resolve("gpt-4-32k") == "gpt-4"
+    assert index.resolve("gpt-4o") is None
+
+
+def test_results_are_memoized():
+    """Test that repeated lookups hit the LRU cache."""
+    index = ModelIndex(TABLE, cache_size=2)
+    index.resolve("gpt-4o-2024-08-06")
+    index.resolve("gpt-4o-2024-08-06")
+    info = index.resolve.cache_info()
+    assert info.hits == 1 and info.maxsize == 2
+
+
+def test_normalize_model_name():
+    """Test path, vendor and version-tag normalization."""
+    assert normalize_model_name(" Models/Gemini-1.5-Pro ") == "gemini-1.5-pro"
+    assert normalize_model_name("meta.llama3-70b-instruct-v1:0") == "llama3-70b-instruct"
+
+
+def test_calculate_cost_resolves_dated_names(monkeypatch):
+    """Test that a dated model id is no longer priced at zero."""
+    monkeypatch.setattr(pricing, '_snapshot', pricing.PricingSnapshot(TABLE, "backend"))
+    
+    assert pricing.calculate_cost("gpt-4o-2024-08-06", 1000, 1000) == 0.02
+    assert pricing.calculate_cost(None, 1000, 1000) == 0.0
+    
+    # A swapped-in table gets a fresh index
+    monkeypatch.setattr(
+        pricing, '_snapshot', pricing.PricingSnapshot({"gpt-4o": {"input": 1.0, "output": 0.0}}, "backend")
+    )
+    assert pricing.calculate_cost("gpt-4o-2024-08-06", 1000, 0) == 1.0
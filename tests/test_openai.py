@@ -73,3 +73,126 @@ def test_patched_openai_handles_errors():
         from spend_hawk.providers.openai import _patched_create
         with pytest.raises(Exception, match="API Error"):
             _patched_create(None)
+
+
+def test_patched_async_openai_extracts_metrics():
+    """Test that the AsyncOpenAI wrapper awaits the original and extracts metrics."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from spend_hawk.providers import openai as openai_provider
+    
+    mock_response = Mock()
+    mock_response.model = "gpt-4o"
+    mock_response.usage.prompt_tokens = 100
+    mock_response.usage.completion_tokens = 50
+    
+    original = AsyncMock(return_value=mock_response)
+    create = openai_provider.CHAT.wrap(original, is_async=True)
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        result = asyncio.run(create(None, model="gpt-4o"))
+    
+    assert result is mock_response
+    original.assert_awaited_once_with(None, model="gpt-4o")
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['provider'] == 'openai'
+    assert call_kwargs['input_tokens'] == 100
+    assert call_kwargs['output_tokens'] == 50
+
+
+def test_openai_usage_details():
+    """Test extraction of cached and audio token counts."""
+    from types import SimpleNamespace
+    from spend_hawk.providers.openai import CHAT
+    
+    usage = SimpleNamespace(
+        prompt_tokens=1000,
+        completion_tokens=200,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=512, audio_tokens=0),
+        completion_tokens_details=SimpleNamespace(audio_tokens=150),
+    )
+    assert CHAT.read_usage(usage) == (
+        1000, 200, {"cached_input_tokens": 512, "audio_output_tokens": 150}
+    )
+    
+    # Mocked or older SDK usage objects without details report nothing
+    assert CHAT.read_usage(Mock())[2] == {}
+
+
+def test_embeddings_wrapper_sends_input_tokens():
+    """Test the embeddings wrapper records prompt tokens and no output tokens."""
+    import asyncio
+    from types import SimpleNamespace
+    from spend_hawk.providers import openai as openai_provider
+    
+    response = SimpleNamespace(
+        model="text-embedding-3-small",
+        usage=SimpleNamespace(prompt_tokens=64, total_tokens=64),
+    )
+    
+    async def original_async(self, *args, **kwargs):
+        return response
+    
+    sync_create = openai_provider.EMBEDDINGS.wrap(lambda self, **kwargs: response)
+    async_create = openai_provider.EMBEDDINGS.wrap(original_async, is_async=True)
+    
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        assert sync_create(None, input="hello") is response
+        assert asyncio.run(async_create(None, input="hello")) is response
+    
+    assert mock_send.call_count == 2
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['model'] == "text-embedding-3-small"
+    assert call_kwargs['input_tokens'] == 64
+    assert call_kwargs['output_tokens'] == 0
+
+
+def test_responses_wrapper_extracts_usage():
+    """Test Responses API usage, including cached and reasoning tokens."""
+    from types import SimpleNamespace
+    from spend_hawk.providers import openai as openai_provider
+    
+    response = SimpleNamespace(
+        model="gpt-4o",
+        usage=SimpleNamespace(
+            input_tokens=1000,
+            output_tokens=300,
+            input_tokens_details=SimpleNamespace(cached_tokens=400),
+            output_tokens_details=SimpleNamespace(reasoning_tokens=120),
+        ),
+    )
+    create = openai_provider.RESPONSES.wrap(lambda self, **kwargs: response)
+    
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        assert create(None, model="gpt-4o", input="hi") is response
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['model'] == 'gpt-4o'
+    assert call_kwargs['input_tokens'] == 1000
+    assert call_kwargs['output_tokens'] == 300
+    assert call_kwargs['cached_input_tokens'] == 400
+    assert call_kwargs['reasoning_tokens'] == 120
+
+
+def test_responses_stream_reads_completed_event():
+    """Test that a streamed Responses call is recorded from its terminal event."""
+    from types import SimpleNamespace
+    from spend_hawk.providers import openai as openai_provider
+    
+    events = [
+        SimpleNamespace(type="response.created", response=SimpleNamespace(model="gpt-4o", usage=None)),
+        SimpleNamespace(type="response.output_text.delta", delta="Hi"),
+        SimpleNamespace(type="response.completed", response=SimpleNamespace(
+            model="gpt-4o",
+            usage=SimpleNamespace(input_tokens=20, output_tokens=5),
+        )),
+    ]
+    create = openai_provider.RESPONSES.wrap(lambda self, **kwargs: iter(events))
+    
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        assert list(create(None, stream=True)) == events
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['model'] == 'gpt-4o'
+    assert call_kwargs['input_tokens'] == 20
+    assert call_kwargs['output_tokens'] == 5
+
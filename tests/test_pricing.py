@@ -0,0 +1,189 @@
+"""Tests for dynamic pricing."""
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from spend_hawk import pricing
+
+
+def _backend(table, etag=None):
+    return pricing.PricingSnapshot(table, "backend", time.time(), etag)
+
+
+def _response(status_code, body=None, etag=None):
+    response = Mock(status_code=status_code, headers={"ETag": etag} if etag else {})
+    response.json.return_value = body
+    return response
+
+
+@pytest.fixture(autouse=True)
+def fresh_pricing(tmp_path, monkeypatch):
+    """Reset pricing state and point the cache at a temp directory."""
+    monkeypatch.setattr(pricing, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(pricing, 'CACHE_FILE', tmp_path / "pricing.bin")
+    monkeypatch.setattr(pricing, 'LEGACY_CACHE_FILE', tmp_path / "pricing.json")
+    monkeypatch.setattr(pricing, '_snapshot', None)
+    monkeypatch.setattr(pricing, '_refresh_thread', None)
+    yield tmp_path
+    if pricing._refresh_thread is not None:
+        pricing._refresh_thread.join(timeout=5)
+
+
+def test_first_lookup_does_not_wait_for_backend():
+    """Test that a slow backend never delays the first get_pricing()."""
+    release = threading.Event()
+    
+    def slow_fetch(current=None):
+        release.wait(5)
+        return _backend({"gpt-4": {"input": 1.0, "output": 1.0}})
+    
+    with patch.object(pricing, '_fetch_pricing_from_backend', side_effect=slow_fetch):
+        start = time.perf_counter()
+        table = pricing.get_pricing()
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 0.5
+        assert table["gpt-4"] == {"input": 0.03, "output": 0.06}  # Fallback
+        
+        release.set()
+        pricing._refresh_thread.join(timeout=5)
+    
+    # Fresh table swapped in by the background refresh
+    assert pricing.get_pricing()["gpt-4"] == {"input": 1.0, "output": 1.0}
+
+
+def test_fresh_cache_is_used_and_checked_in_background(fresh_pricing):
+    """Test that a fresh cache serves lookups at once and is still revalidated by ETag."""
+    cache = {"pricing": {"my-model": {"input": 0.1, "output": 0.2}}, "cached_at": time.time(),
+             "etag": '"v1"'}
+    (fresh_pricing / "pricing.json").write_text(json.dumps(cache))
+    
+    with patch.object(pricing.transport, 'get', return_value=_response(304)) as mock_get:
+        assert pricing.calculate_cost("my-model", 1000, 1000) == 0.3
+        pricing._refresh_thread.join(timeout=5)
+    
+    assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+    assert pricing.get_pricing_snapshot().source == "backend"
+    assert "my-model" in pricing.get_pricing()
+
+
+def test_stale_disk_cache_used_while_refreshing(fresh_pricing):
+    """Test that a stale cache serves lookups while a refresh runs."""
+    cache = {"pricing": {"my-model": {"input": 0.1, "output": 0.2}}, "cached_at": 0}
+    (fresh_pricing / "pricing.json").write_text(json.dumps(cache))
+    
+    with patch.object(pricing, '_fetch_pricing_from_backend', return_value=None) as mock_fetch:
+        assert "my-model" in pricing.get_pricing()
+        pricing._refresh_thread.join(timeout=5)
+    
+    assert mock_fetch.called
+
+
+def test_blocking_init_fetches_first():
+    """Test that init_pricing(background=False) keeps the old fetch-first order."""
+    fetched = {"gpt-4": {"input": 2.0, "output": 2.0}}
+    
+    with patch.object(pricing, '_fetch_pricing_from_backend', return_value=_backend(fetched)):
+        pricing.init_pricing(background=False)
+    
+    assert pricing.get_pricing() == fetched
+
+
+def test_concurrent_blocking_init_fetches_once():
+    """Test that threads racing through startup share a single fetch."""
+    calls = []
+    
+    def slow_fetch(current=None):
+        calls.append(current)
+        time.sleep(0.1)
+        return _backend({"gpt-4": {"input": 2.0, "output": 2.0}})
+    
+    with patch.object(pricing, '_fetch_pricing_from_backend', side_effect=slow_fetch):
+        threads = [threading.Thread(target=pricing.init_pricing, args=(False,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    assert len(calls) == 1
+    assert pricing.get_pricing()["gpt-4"]["input"] == 2.0
+
+
+def test_snapshot_is_immutable():
+    """Test that neither the snapshot nor its table can be modified in place."""
+    table = {"gpt-4": {"input": 2.0, "output": 2.0, "tiers": [{"above": 1, "input": 3.0}]}}
+    snapshot = _backend(table)
+    table["gpt-4"]["input"] = 0.0  # The snapshot holds its own copy
+    
+    with pytest.raises(AttributeError):
+        snapshot.version = "other"
+    with pytest.raises(TypeError):
+        snapshot.table["gpt-4"]["input"] = 0.0
+    assert snapshot.table["gpt-4"]["input"] == 2.0
+    assert snapshot.version == _backend(snapshot.table).version  # Content-addressed
+
+
+def test_metrics_carry_pricing_version():
+    """Test that each metric reports the version of the table it was costed with."""
+    from spend_hawk.records import MetricRecord
+    
+    pricing._install(_backend({"gpt-4": {"input": 1.0, "output": 1.0}}))
+    record = MetricRecord("openai", "gpt-4", 1000, 0, 10, (None, None, {}), None)
+    payload = record.to_dict()
+    
+    assert payload["cost"] == 1.0
+    assert payload["pricing_version"] == pricing.get_pricing_snapshot().version
+
+
+def test_conditional_and_delta_refresh():
+    """Test ETag revalidation: 304 keeps the table, 226 applies a delta."""
+    table = {"gpt-4": {"input": 1.0, "output": 1.0}, "old-model": {"input": 1.0, "output": 1.0}}
+    
+    with patch.object(pricing.transport, 'get', return_value=_response(200, table, '"v1"')) as mock_get:
+        assert pricing.refresh_pricing()
+    first = pricing.get_pricing_snapshot()
+    assert first.etag == '"v1"'
+    assert mock_get.call_args[1]["headers"] is None
+    
+    with patch.object(pricing.transport, 'get', return_value=_response(304)) as mock_get:
+        assert pricing.refresh_pricing()
+    assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+    assert pricing.get_pricing_snapshot().table is first.table
+    
+    delta = {"changed": {"gpt-4": {"input": 3.0, "output": 3.0}}, "removed": ["old-model"]}
+    with patch.object(pricing.transport, 'get', return_value=_response(226, delta, '"v2"')):
+        assert pricing.refresh_pricing()
+    snapshot = pricing.get_pricing_snapshot()
+    assert dict(snapshot.table) == {"gpt-4": {"input": 3.0, "output": 3.0}}
+    assert snapshot.etag == '"v2"' and snapshot.version != first.version
+
+
+def test_binary_cache_round_trip(fresh_pricing):
+    """Test that the cache is written atomically and reloaded with its ETag."""
+    pricing._save_pricing_to_cache(_backend({"my-model": {"input": 0.1, "output": 0.2}}, '"v1"'))
+    
+    assert sorted(p.name for p in fresh_pricing.iterdir()) == ["pricing.bin"]
+    assert (fresh_pricing / "pricing.bin").read_bytes().startswith(b"SHPC")
+    
+    with patch.object(pricing, '_fetch_pricing_from_backend') as mock_fetch:
+        snapshot = pricing.get_pricing_snapshot()
+    
+    assert not mock_fetch.called
+    assert snapshot.source == "cache"
+    assert snapshot.etag == '"v1"'
+    assert pricing.calculate_cost("my-model", 1000, 1000) == pytest.approx(0.3)
+
+
+def test_background_refresh_adopts_cache_from_other_process(fresh_pricing):
+    """Test that a stale worker reuses a cache another worker just refreshed."""
+    pricing._install(pricing.PricingSnapshot({"gpt-4": {"input": 1.0, "output": 1.0}}, "cache", 0))
+    pricing._save_pricing_to_cache(_backend({"gpt-4": {"input": 5.0, "output": 5.0}}))
+    
+    with patch.object(pricing, '_fetch_pricing_from_backend') as mock_fetch:
+        pricing._background_refresh()
+    
+    assert not mock_fetch.called
+    assert pricing.get_pricing()["gpt-4"]["input"] == 5.0
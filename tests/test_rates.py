@@ -0,0 +1,58 @@
+"""Tests for rate-card evaluation."""
+import pytest
+
+from spend_hawk.rates import compile_rate_card, usage_breakdown
+
+CARD = {
+    "input": 0.003,
+    "output": 0.015,
+    "cached_input": 0.0003,
+    "cache_write": 0.00375,
+    "audio_input": 0.1,
+    "audio_output": 0.2,
+    "tiers": [{"above": 128000, "input": 0.006, "output": 0.03}],
+}
+
+
+def test_unknown_model_costs_nothing():
+    """Test that a missing card evaluates to zero."""
+    assert compile_rate_card(None)(1000, 1000, None) == 0.0
+
+
+def test_flat_card():
+    """Test the plain input/output fast path."""
+    evaluate = compile_rate_card({"input": 0.01, "output": 0.03})
+    assert evaluate(1000, 500, None) == pytest.approx(0.025)
+
+
+def test_flat_card_still_applies_batch_discount():
+    """Test that a plain card falls back to the detailed path for usage."""
+    evaluate = compile_rate_card({"input": 0.01, "output": 0.03})
+    assert evaluate(1000, 500, {"batch": True}) == pytest.approx(0.0125)
+
+
+@pytest.mark.parametrize("input_tokens, output_tokens, usage, expected", [
+    (1000, 1000, None, 0.003 + 0.015),
+    (1000, 0, {"cached_input_tokens": 800}, 0.2 * 0.003 + 0.8 * 0.0003),
+    (1000, 0, {"cache_write_tokens": 1000}, 0.00375),
+    (1000, 1000, {"audio_input_tokens": 1000, "audio_output_tokens": 500}, 0.1 + 0.5 * 0.015 + 0.5 * 0.2),
+    (1000, 1000, {"batch": True}, (0.003 + 0.015) / 2),
+    (200000, 1000, None, 200 * 0.006 + 0.03),
+    (200000, 0, {"cached_input_tokens": 100000}, 100 * 0.006 + 100 * 0.0003),
+])
+def test_detailed_card(input_tokens, output_tokens, usage, expected):
+    """Test cached, cache-write, audio, batch and long-context pricing."""
+    assert compile_rate_card(CARD)(input_tokens, output_tokens, usage) == pytest.approx(expected)
+
+
+def test_custom_batch_discount():
+    """Test that a card can override the batch discount."""
+    evaluate = compile_rate_card({"input": 0.01, "output": 0.0, "batch_discount": 0.25})
+    assert evaluate(1000, 0, {"batch": True}) == pytest.approx(0.0075)
+
+
+def test_usage_breakdown_picks_rate_fields():
+    """Test that only rate-card fields are taken from extra fields."""
+    assert usage_breakdown({"cached_input_tokens": 5, "stream": True}) == {"cached_input_tokens": 5}
+    assert usage_breakdown({"stream": True}) is None
+    assert usage_breakdown(None) is None
@@ -0,0 +1,194 @@
+"""Tests for the declarative provider adapter registry."""
+import asyncio
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch
+
+from spend_hawk.providers import registry
+from spend_hawk.providers.registry import STREAM_ALWAYS, Adapter
+
+
+@pytest.fixture
+def fake_sdk():
+    """Install a fake SDK module with a sync and an async client class."""
+    async def acreate(self, **kwargs):
+        return SimpleNamespace(model="fake-model", usage=SimpleNamespace(input_tokens=3, output_tokens=4))
+    
+    module = types.ModuleType("sh_fake_sdk")
+    module.Client = type("Client", (), {"create": lambda self, **kwargs: None})
+    module.AsyncClient = type("AsyncClient", (), {"create": acreate})
+    with patch.dict(sys.modules, {"sh_fake_sdk": module}):
+        yield module
+    registry._providers.pop("fake", None)
+    registry._patched.pop("fake", None)
+
+
+def test_patch_and_unpatch_provider(fake_sdk):
+    """Test that registered methods are wrapped and restored; missing ones are skipped."""
+    originals = (fake_sdk.Client.create, fake_sdk.AsyncClient.create)
+    registry.register_provider("fake", "Fake", (
+        Adapter("fake", "sh_fake_sdk", methods=("Client.create", "Missing.create"),
+                async_methods=("AsyncClient.create",)),
+        Adapter("fake", "sh_fake_sdk_not_installed", methods=("Client.create",)),
+    ))
+    
+    registry.patch_provider("fake")
+    assert registry.is_patched("fake")
+    assert fake_sdk.Client.create is not originals[0]
+    
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        asyncio.run(fake_sdk.AsyncClient().create(model="fake-model"))
+    assert mock_send.call_args[1]['input_tokens'] == 3
+    
+    registry.unpatch_provider("fake")
+    assert not registry.is_patched("fake")
+    assert (fake_sdk.Client.create, fake_sdk.AsyncClient.create) == originals
+
+
+def test_module_alternatives(fake_sdk):
+    """Test that the first importable of several module paths is patched."""
+    original = fake_sdk.Client.create
+    registry.register_provider("fake", "Fake", (
+        Adapter("fake", ("sh_fake_sdk_old_layout", "sh_fake_sdk"), methods=("Client.create",)),
+    ))
+    
+    registry.patch_provider("fake")
+    assert registry.is_patched("fake")
+    assert fake_sdk.Client.create is not original
+    registry.unpatch_provider("fake")
+
+
+def test_provider_not_installed_is_skipped():
+    """Test that a provider whose modules can't be imported is left unpatched."""
+    registry.register_provider("fake", "Fake", (
+        Adapter("fake", "sh_fake_sdk_not_installed", methods=("Client.create",)),
+    ))
+    try:
+        registry.patch_provider("fake")
+        assert not registry.is_patched("fake")
+    finally:
+        registry._providers.pop("fake")
+
+
+def test_missing_usage_is_not_recorded():
+    """Test that responses without usage or token fields never raise."""
+    adapter = Adapter("fake", "sh_fake_sdk", details={"cached_input_tokens": "details.cached"})
+    create = adapter.wrap(lambda self: SimpleNamespace(model="m"))
+    partial = adapter.wrap(lambda self: SimpleNamespace(model="m", usage=SimpleNamespace(input_tokens=5)))
+    
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        create(None)
+        assert not mock_send.called
+        partial(None)
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['input_tokens'] == 5
+    assert call_kwargs['output_tokens'] == 0
+    assert 'cached_input_tokens' not in call_kwargs
+
+
+def test_model_paths():
+    """Test model names read from the client resource and from call kwargs."""
+    assert registry._model_getter("self.model_name")(SimpleNamespace(model_name="a"), {}, None) == "a"
+    assert registry._model_getter("kwargs.model")(None, {"model": "b"}, None) == "b"
+    assert registry._model_getter("kwargs.model")(None, {}, None) is None
+    with pytest.raises(ValueError):
+        registry._model_getter("model")
+
+
+def test_mistral_chat():
+    """Test the Mistral chat adapter."""
+    from spend_hawk.providers import mistral
+    
+    response = SimpleNamespace(
+        model="mistral-large-latest",
+        usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30, total_tokens=150),
+    )
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        mistral.CHAT.wrap(lambda self, **kwargs: response)(None, model="mistral-large-latest")
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['provider'] == 'mistral'
+    assert call_kwargs['model'] == 'mistral-large-latest'
+    assert (call_kwargs['input_tokens'], call_kwargs['output_tokens']) == (120, 30)
+
+
+def test_mistral_stream():
+    """Test that Mistral stream events are passed through and usage read from the last."""
+    from spend_hawk.providers import mistral
+    
+    events = [
+        SimpleNamespace(data=SimpleNamespace(model="mistral-small-latest", usage=None)),
+        SimpleNamespace(data=SimpleNamespace(
+            model="mistral-small-latest",
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=7),
+        )),
+    ]
+    stream = mistral.CHAT_STREAM.wrap(lambda self, **kwargs: iter(events))
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        assert list(stream(None, model="mistral-small-latest")) == events
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['model'] == 'mistral-small-latest'
+    assert call_kwargs['output_tokens'] == 7
+
+
+def test_cohere_chat_uses_billed_units():
+    """Test the Cohere adapter takes the model from the call and tokens from billed units."""
+    cohere_sdk = pytest.importorskip("cohere")
+    from spend_hawk.providers import cohere
+    
+    # Real response types: billed units are typed as floats
+    response = cohere_sdk.V2ChatResponse(
+        id="chat-1",
+        finish_reason="COMPLETE",
+        message=cohere_sdk.AssistantMessageResponse(role="assistant", content=[]),
+        usage=cohere_sdk.Usage(
+            billed_units=cohere_sdk.UsageBilledUnits(input_tokens=50, output_tokens=20),
+            tokens=cohere_sdk.UsageTokens(input_tokens=250, output_tokens=20),
+        ),
+    )
+    assert cohere.CHAT.read_usage(response.usage)[:2] == (50, 20)
+    with patch('spend_hawk.providers.registry.send_metric') as mock_send:
+        cohere.CHAT.wrap(lambda self, **kwargs: response)(None, model="command-r", messages=[])
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['provider'] == 'cohere'
+    assert call_kwargs['model'] == 'command-r'
+    assert (call_kwargs['input_tokens'], call_kwargs['output_tokens']) == (50, 20)
+    assert type(call_kwargs['input_tokens']) is int
+
+
+def test_token_counts_accept_integral_floats():
+    """Test that float counts are read when integral and ignored otherwise."""
+    count = registry._count_getter("billed_units.input_tokens")
+    assert count(SimpleNamespace(billed_units=SimpleNamespace(input_tokens=10.0))) == 10
+    assert count(SimpleNamespace(billed_units=SimpleNamespace(input_tokens=1.5))) == 0
+    assert count(SimpleNamespace(billed_units=SimpleNamespace(input_tokens=True))) == 0
+
+
+def test_cohere_async_stream_generator():
+    """Test that an async generator method is wrapped without being awaited."""
+    from spend_hawk.providers import cohere
+    
+    async def chat_stream(self, **kwargs):
+        yield SimpleNamespace(type="content-delta", delta=SimpleNamespace(message="Hi"))
+        yield SimpleNamespace(type="message-end", delta=SimpleNamespace(usage=SimpleNamespace(
+            billed_units=SimpleNamespace(input_tokens=8, output_tokens=2),
+        )))
+    
+    stream = cohere.CHAT_STREAM.wrap(chat_stream, is_async=True)
+    assert cohere.CHAT_STREAM.stream == STREAM_ALWAYS
+    
+    async def consume():
+        return [event async for event in stream(None, model="command-r-plus")]
+    
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        assert len(asyncio.run(consume())) == 2
+    
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['model'] == 'command-r-plus'
+    assert (call_kwargs['input_tokens'], call_kwargs['output_tokens']) == (8, 2)
@@ -0,0 +1,89 @@
+"""Tests for client-side rollups."""
+from unittest.mock import patch, Mock
+
+from spend_hawk.client import MetricsClient
+from spend_hawk.config import config
+from spend_hawk.records import MetricRecord
+from spend_hawk.rollup import Aggregator, LATENCY_BUCKETS_MS
+
+
+def _record(model="text-embedding-3-small", latency_ms=40, project="bulk", tags=None):
+    return MetricRecord("openai", model, 100, 0, latency_ms, (project, "embedder", tags or {}))
+
+
+def test_rollup_sums_by_key():
+    """Test that records in one window and key fold into a single rollup."""
+    aggregator = Aggregator(10)
+    
+    with patch('spend_hawk.rollup.calculate_cost', return_value=0.001):
+        for latency in (5, 40, 40, 2000):
+            aggregator.add(_record(latency_ms=latency))
+        aggregator.add(_record(model="gpt-4o-mini"))
+        aggregator.add(_record(tags={"team": "search"}))
+    
+    rollups = aggregator.drain(0, force=True)
+    assert len(rollups) == 3
+    
+    payload = next(r for r in rollups if r.count == 4).to_dict(10)
+    assert payload["type"] == "rollup"
+    assert payload["input_tokens"] == 400
+    assert payload["cost"] == 0.004
+    assert payload["latency_ms_min"] == 5
+    assert payload["latency_ms_max"] == 2000
+    assert payload["latency_ms_sum"] == 2085
+    counts = payload["latency_histogram"]["counts"]
+    assert len(counts) == len(LATENCY_BUCKETS_MS) + 1
+    assert counts[0] == 1 and counts[2] == 2 and sum(counts) == 4
+    assert len(aggregator) == 0
+
+
+def test_tags_survive_the_raw_form():
+    """Test that records sent through the collector or spool keep their rollup tags."""
+    import json
+    
+    aggregator = Aggregator(10)
+    with patch('spend_hawk.rollup.calculate_cost', return_value=0.0):
+        for tags in ({"team": "search"}, {"team": "ads"}, None):
+            raw = json.loads(json.dumps(_record(tags=tags).to_raw()))
+            aggregator.add(MetricRecord.from_raw(raw))
+    
+    rollups = aggregator.drain(0, force=True)
+    assert sorted(str(r.custom_tags) for r in rollups) == [
+        "None", "{'team': 'ads'}", "{'team': 'search'}"
+    ]
+
+
+def test_open_window_is_kept():
+    """Test that drain only releases windows that have closed."""
+    aggregator = Aggregator(10)
+    record = _record()
+    
+    with patch('spend_hawk.rollup.calculate_cost', return_value=0.0):
+        aggregator.add(record)
+    
+    assert aggregator.drain(record.wall_time()) == []
+    assert len(aggregator.drain(aggregator.next_close())) == 1
+
+
+@patch('spend_hawk.client.transport.post')
+def test_only_selected_projects_are_rolled_up(mock_post):
+    """Test that rollup mode applies per project and other metrics stay raw."""
+    mock_post.return_value = Mock(status_code=200)
+    client = MetricsClient()
+    records = [_record(), _record(), _record(project="chat")]
+    
+    with patch.object(config, 'rollup_projects', {"bulk"}), \
+            patch('spend_hawk.rollup.calculate_cost', return_value=0.0):
+        raw = client._roll_up(records)
+        
+        assert raw == [records[2]]
+        assert client.stats()['rolled_up'] == 2
+        
+        client._rollup_flush.set()
+        client._send_rollups()
+    
+    sent = mock_post.call_args[0][1]["metrics"]
+    assert len(sent) == 1
+    assert sent[0]["count"] == 2
+    assert sent[0]["project_id"] == "bulk"
+    assert client.stats()['rollup_pending'] == 0
@@ -0,0 +1,104 @@
+"""Tests for latency quantile sketches."""
+import random
+
+import pytest
+from unittest.mock import patch, Mock
+
+from spend_hawk.client import MetricsClient
+from spend_hawk.config import config
+from spend_hawk.records import MetricRecord
+from spend_hawk.sketch import DDSketch, LatencySketches
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    """Test that p50/p95/p99 are within 1% of the exact values."""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6.5, 0.8) for _ in range(20000)]
+    sketch = DDSketch(0.01)
+    for value in values:
+        sketch.add(value)
+    
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+
+def test_merge_matches_single_sketch():
+    """Test that merged sketches report the same quantiles as one sketch."""
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for i in range(1, 1001):
+        whole.add(i)
+        (left if i % 2 else right).add(i)
+    
+    left.merge(DDSketch.from_dict(right.to_dict()))
+    
+    assert left.count == whole.count
+    assert left.min == 1 and left.max == 1000
+    for q in (0.5, 0.95, 0.99):
+        assert left.quantile(q) == whole.quantile(q)
+
+
+def test_merge_rejects_different_accuracy():
+    """Test that sketches with different bin widths don't merge."""
+    with pytest.raises(ValueError):
+        DDSketch(0.01).merge(DDSketch(0.02))
+
+
+def test_zero_latency_and_empty_sketch():
+    """Test the zero bucket and the empty sketch."""
+    sketch = DDSketch()
+    assert sketch.quantile(0.5) is None
+    
+    sketch.add(0)
+    sketch.add(0)
+    sketch.add(100)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(100, rel=0.01)
+
+
+def test_quantiles_per_key_and_interval_export():
+    """Test that keys are tracked separately and export merges into totals."""
+    sketches = LatencySketches()
+    for latency in range(1, 101):
+        sketches.add(("openai", "gpt-4o", "proj", None), latency)
+    sketches.add(("anthropic", "claude-3-5-sonnet", "proj", None), 900)
+    
+    exported = sketches.take_interval()
+    assert {e["model"] for e in exported} == {"gpt-4o", "claude-3-5-sonnet"}
+    assert all(e["type"] == "latency_sketch" for e in exported)
+    assert sketches.take_interval() == []
+    
+    by_model = {q["model"]: q for q in sketches.quantiles()}
+    gpt = by_model["gpt-4o"]
+    assert gpt["count"] == 100
+    assert gpt["p50"] == pytest.approx(50, rel=0.02)
+    assert gpt["p99"] == pytest.approx(99, rel=0.02)
+    assert by_model["claude-3-5-sonnet"]["p95"] == pytest.approx(900, rel=0.01)
+
+
+@patch('spend_hawk.client.transport.post')
+def test_worker_exports_sketches(mock_post):
+    """Test that the client exports interval sketches when enabled."""
+    mock_post.return_value = Mock(status_code=200)
+    sketches = LatencySketches()
+    
+    with patch('spend_hawk.client.latency_sketches', sketches), \
+            patch.object(config, 'sketch_export_s', 60):
+        client = MetricsClient()
+        client._record_latency([
+            MetricRecord("openai", "gpt-4o", 1, 1, 250, (None, None, {}))
+        ])
+        client._send_sketches()
+        assert not mock_post.called  # Interval hasn't elapsed
+        
+        client._next_sketch_export = 0
+        client._send_sketches()
+    
+    payload = mock_post.call_args[0][1]["metrics"][0]
+    assert payload["type"] == "latency_sketch"
+    assert payload["sketch"]["count"] == 1
@@ -0,0 +1,114 @@
+"""Tests for the durable metrics spool."""
+from unittest.mock import patch, Mock
+
+from spend_hawk.client import MetricsClient
+from spend_hawk.config import config
+from spend_hawk.records import MetricRecord
+from spend_hawk.spool import Spool
+
+
+def _record(n: int = 0) -> MetricRecord:
+    return MetricRecord("openai", "gpt-4o", 100 + n, 20, 300, ("proj", "agent", {}), None)
+
+
+def test_acked_segments_are_compacted(tmp_path):
+    """Test that fully acknowledged segments are deleted after rotation."""
+    spool = Spool(str(tmp_path), segment_bytes=200, max_bytes=10_000)
+    records = [_record(i) for i in range(10)]
+    for record in records:
+        spool.append(record)
+    spool.flush()
+    
+    segments = sorted(tmp_path.glob("*.wal"))
+    assert len(segments) > 1
+    
+    spool.ack(record.spool_segment for record in records)
+    
+    # Only the active segment remains
+    assert len(list(tmp_path.glob("*.wal"))) == 1
+    spool.close()
+    assert list(tmp_path.glob("*.wal")) == []
+
+
+def test_disk_usage_is_capped(tmp_path):
+    """Test that the oldest segments are discarded beyond max_bytes."""
+    spool = Spool(str(tmp_path), segment_bytes=200, max_bytes=600)
+    for i in range(100):
+        spool.append(_record(i))
+    spool.flush()
+    
+    assert spool.size_bytes() <= 600 + 200 + 100
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.wal")) <= 600 + 200 + 100
+
+
+def test_replay_from_dead_process(tmp_path):
+    """Test that segments left by an exited process are replayed once."""
+    dead = Spool(str(tmp_path), segment_bytes=10_000, max_bytes=100_000)
+    dead._prefix = "999999999-dead-"
+    original = [_record(i) for i in range(3)]
+    for record in original:
+        dead.append(record)
+    dead._file.close()
+    dead._file = None
+    
+    spool = Spool(str(tmp_path), segment_bytes=10_000, max_bytes=100_000)
+    replayed = []
+    with patch('spend_hawk.spool._pid_alive', return_value=False):
+        assert spool.replay(replayed.append) == 3
+        assert spool.replay(replayed.append) == 0
+    
+    assert [r.input_tokens for r in replayed] == [100, 101, 102]
+    assert replayed[0].to_dict()["project_id"] == "proj"
+    assert abs(replayed[0].wall_time() - original[0].wall_time()) < 1e-3
+    assert all(not p.name.startswith("999999999") for p in tmp_path.iterdir())
+
+
+def test_client_acks_sent_metrics(tmp_path):
+    """Test that the client writes ahead and acks once the backend accepts."""
+    with patch.object(config, 'spool_enabled', True), \
+            patch.object(config, 'spool_dir', str(tmp_path)), \
+            patch('spend_hawk.client.atexit'):
+        client = MetricsClient()
+    client.start_worker = Mock()
+    
+    record = _record()
+    with patch.object(config, 'is_configured', return_value=True):
+        client.send_async(record)
+    assert record.spool_segment is not None
+    assert client.stats()['spool_bytes'] > 0
+    
+    ok = Mock(status_code=200)
+    with patch('spend_hawk.client.transport.post', return_value=ok):
+        queued = client.queue.get_nowait()
+        client._attempt([client._to_payload(queued)], 0, client._spool_segments([queued]))
+    
+    client.spool.close()
+    assert list(tmp_path.glob("*.wal")) == []
+
+
+def test_spool_is_used_on_running_loop(tmp_path):
+    """Test that calls made inside an event loop are still written ahead."""
+    import asyncio
+    from spend_hawk.async_client import get_async_client
+    from spend_hawk.providers.base import send_metric
+    
+    with patch.object(config, 'spool_enabled', True), \
+            patch.object(config, 'spool_dir', str(tmp_path)), \
+            patch('spend_hawk.client.atexit'):
+        client = MetricsClient()
+    client.start_worker = Mock()
+    
+    async def main():
+        send_metric("openai", "gpt-4o", 10, 5, 100)
+        return get_async_client()
+    
+    with patch.object(config, 'spool_enabled', True), \
+            patch.object(config, 'async_transport', True), \
+            patch.object(config, 'is_configured', return_value=True), \
+            patch('spend_hawk.providers.base.get_client', return_value=client):
+        async_client = asyncio.run(main())
+    
+    assert async_client.stats()['enqueued'] == 0
+    assert client.queue.get_nowait().spool_segment is not None
+    assert list(tmp_path.glob("*.wal"))
+    client.spool.close()
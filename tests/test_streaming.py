@@ -0,0 +1,202 @@
+"""Tests for streaming-response accounting."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, AsyncMock
+
+import pytest
+
+from spend_hawk.config import config
+from spend_hawk.providers import openai as openai_provider
+from spend_hawk.providers import anthropic as anthropic_provider
+from spend_hawk.providers.streaming import AsyncTrackedStream, TrackedStream
+
+
+def _openai_chunks():
+    return [
+        SimpleNamespace(model="gpt-4o", usage=None, text="Hel"),
+        SimpleNamespace(model="gpt-4o", usage=None, text="lo"),
+        SimpleNamespace(
+            model="gpt-4o",
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=2),
+        ),
+    ]
+
+
+def _anthropic_events():
+    message = SimpleNamespace(
+        model="claude-3-5-sonnet-20241022",
+        usage=SimpleNamespace(input_tokens=25, output_tokens=1),
+    )
+    return [
+        SimpleNamespace(type="message_start", message=message),
+        SimpleNamespace(type="content_block_delta"),
+        SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=40)),
+        SimpleNamespace(type="message_stop"),
+    ]
+
+
+def test_openai_stream_passes_chunks_through():
+    """Test that chunks are forwarded unchanged and usage recorded at the end."""
+    chunks = _openai_chunks()
+    
+    create = openai_provider.CHAT.wrap(Mock(return_value=iter(chunks)))
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        stream = create(None, stream=True, stream_options={"include_usage": True})
+        assert isinstance(stream, TrackedStream)
+        
+        received = []
+        for chunk in stream:
+            received.append(chunk)
+            assert not mock_send.called
+    
+    assert all(a is b for a, b in zip(received, chunks))
+    assert len(received) == 3
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['model'] == 'gpt-4o'
+    assert call_kwargs['input_tokens'] == 12
+    assert call_kwargs['output_tokens'] == 2
+    assert call_kwargs['stream'] is True
+    assert 'time_to_first_token_ms' in call_kwargs
+    assert 'tokens_per_second' in call_kwargs
+
+
+def test_anthropic_stream_records_usage_from_events():
+    """Test that message_start and message_delta usage is combined."""
+    create = anthropic_provider.MESSAGES.wrap(Mock(return_value=iter(_anthropic_events())))
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        with create(None, stream=True) as stream:
+            for _ in stream:
+                pass
+    
+    assert mock_send.call_count == 1
+    call_kwargs = mock_send.call_args[1]
+    assert call_kwargs['provider'] == 'anthropic'
+    assert call_kwargs['input_tokens'] == 25
+    assert call_kwargs['output_tokens'] == 40
+
+
+def test_async_stream_records_usage():
+    """Test the async wrapper forwards chunks and records usage."""
+    async def agen():
+        for chunk in _openai_chunks():
+            yield chunk
+    
+    create = openai_provider.CHAT.wrap(AsyncMock(return_value=agen()), is_async=True)
+    
+    async def consume():
+        stream = await create(None, stream=True)
+        return [chunk async for chunk in stream]
+    
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        received = asyncio.run(consume())
+    
+    # The usage chunk was requested by the SDK, so the caller doesn't see it
+    assert len(received) == 2
+    assert mock_send.call_args[1]['output_tokens'] == 2
+
+
+def test_openai_usage_requested_and_hidden_by_default():
+    """Test that include_usage is added to streams and its extra chunk never reaches the caller."""
+    chunks = _openai_chunks()
+    create_original = Mock(return_value=iter(chunks))
+    create = openai_provider.CHAT.wrap(create_original)
+    
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        received = list(create(None, stream=True, stream_options={"include_obfuscation": False}))
+    
+    assert create_original.call_args[1]['stream_options'] == {
+        "include_obfuscation": False, "include_usage": True
+    }
+    assert received == chunks[:2]
+    assert mock_send.call_args[1]['input_tokens'] == 12
+    
+    # A caller's own choice is left alone
+    create_original.return_value = iter(chunks)
+    create(None, stream=True, stream_options={"include_usage": False})
+    assert create_original.call_args[1]['stream_options'] == {"include_usage": False}
+    
+    # Turned off: the call goes through untouched
+    create_original.return_value = iter(chunks)
+    with patch.object(config, 'stream_include_usage', False):
+        create(None, stream=True)
+    assert 'stream_options' not in create_original.call_args[1]
+
+
+def test_stream_without_usage_sends_nothing():
+    """Test that a stream without a usage chunk doesn't send a bogus metric."""
+    chunks = _openai_chunks()[:2]
+    
+    create = openai_provider.CHAT.wrap(Mock(return_value=iter(chunks)))
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        list(create(None, stream=True))
+    
+    assert not mock_send.called
+
+
+def test_stream_reports_sdk_overhead_and_fractional_latency():
+    """Test that stream metrics carry microsecond timing and SDK overhead."""
+    create = openai_provider.CHAT.wrap(Mock(return_value=iter(_openai_chunks())))
+    with patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        for _ in create(None, stream=True):
+            pass
+    
+    call_kwargs = mock_send.call_args[1]
+    assert isinstance(call_kwargs['latency_ms'], float)
+    assert isinstance(call_kwargs['returned_ns'], int)
+    assert call_kwargs['before_call_ns'] >= 0
+
+
+def test_raw_response_stream_is_returned_untouched():
+    """Test that with_raw_response streams, which aren't iterable, are passed back as-is."""
+    openai = pytest.importorskip("openai")
+    httpx = pytest.importorskip("httpx")
+    from openai.resources.chat import completions
+    
+    def handler(request):
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=b"data: [DONE]\n\n"
+        )
+    
+    create = openai_provider.CHAT.wrap(completions.Completions.create)
+    with patch.object(completions.Completions, "create", create), \
+            patch('spend_hawk.providers.streaming.send_metric') as mock_send:
+        sdk = openai.OpenAI(
+            api_key="test", http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        raw = sdk.chat.completions.with_raw_response.create(
+            model="gpt-4o", messages=[{"role": "user", "content": "hi"}], stream=True
+        )
+    
+    assert not isinstance(raw, TrackedStream)
+    assert raw.http_response.status_code == 200
+    assert not mock_send.called
+
+
+def test_stream_tracking_failure_returns_original_stream():
+    """Test that a stream is handed back unwrapped if tracking it fails."""
+    chunks = iter(_openai_chunks())
+    create = openai_provider.CHAT.wrap(Mock(return_value=chunks))
+    
+    with patch('spend_hawk.providers.registry.TrackedStream', side_effect=RuntimeError("boom")):
+        assert create(None, stream=True) is chunks
+
+
+def test_async_generator_stream_is_closed():
+    """Test that async generator streams are closed with aclose() on exit."""
+    closed = []
+    
+    async def agen():
+        try:
+            for chunk in _openai_chunks():
+                yield chunk
+        finally:
+            closed.append(True)
+    
+    async def consume():
+        async with AsyncTrackedStream(agen(), "openai", openai_provider.CHAT.extract_chunk, 0) as stream:
+            await stream.__anext__()
+        # Closed on exit, not later by the loop's async generator cleanup
+        return list(closed)
+    
+    with patch('spend_hawk.providers.streaming.send_metric'):
+        assert asyncio.run(consume()) == [True]
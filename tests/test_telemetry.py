@@ -0,0 +1,97 @@
+"""Tests for SDK self-instrumentation."""
+import urllib.request
+
+from unittest.mock import patch, Mock
+
+from spend_hawk import telemetry
+from spend_hawk.client import MetricsClient
+from spend_hawk.telemetry import Histogram, Summary
+
+
+def test_histogram_and_summary():
+    """Test bucket placement and summary aggregates."""
+    histogram = Histogram((1, 10, 100))
+    for value in (1, 5, 50, 500):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == [1, 1, 1, 1]
+    assert snapshot["count"] == 4
+    
+    summary = Summary()
+    summary.observe(0.5)
+    summary.observe(1.5)
+    assert summary.snapshot() == {"count": 2, "sum": 2.0, "max": 1.5, "mean": 1.0}
+
+
+def test_send_metric_is_timed():
+    """Test that caller-side send_metric time and wrapper overhead are recorded."""
+    from spend_hawk.providers.base import send_metric
+    
+    before = telemetry.send_metric_seconds.snapshot()["count"]
+    overhead_before = telemetry.wrapper_overhead_seconds.snapshot()["count"]
+    
+    with patch('spend_hawk.providers.base.get_client') as get_client:
+        send_metric("openai", "gpt-4o", 1, 1, 10.0, sdk_overhead_us=12)
+    
+    assert get_client.return_value.send_async.called
+    assert telemetry.send_metric_seconds.snapshot()["count"] == before + 1
+    assert telemetry.wrapper_overhead_seconds.snapshot()["count"] == overhead_before + 1
+
+
+def test_overhead_includes_record_hand_off():
+    """Test that sdk_overhead_us is stamped after the record is built, just before enqueue."""
+    import time
+    from spend_hawk.providers.base import send_metric
+    
+    def slow_context():
+        time.sleep(0.005)
+        return (None, None, {})
+    
+    with patch('spend_hawk.providers.base.capture_context', side_effect=slow_context), \
+            patch('spend_hawk.providers.base.get_client') as get_client:
+        send_metric("openai", "gpt-4o", 1, 1, 10.0, returned_ns=time.perf_counter_ns(), before_call_ns=2000)
+    
+    (record,) = get_client.return_value.send_async.call_args[0]
+    assert record.sdk_overhead_us >= 5000 + 2
+
+
+@patch('spend_hawk.client.transport.post')
+def test_uploads_record_batch_size_and_latency(mock_post):
+    """Test that each upload is counted in the batch and export histograms."""
+    mock_post.return_value = Mock(status_code=200)
+    before = telemetry.export_seconds.snapshot()["count"]
+    
+    MetricsClient()._attempt([{"n": 0}, {"n": 1}], 0)
+    
+    assert telemetry.export_seconds.snapshot()["count"] == before + 1
+    assert telemetry.batch_sizes.snapshot()["sum"] >= 2
+
+
+def test_get_telemetry_shape():
+    """Test that the API reports client, rate, latency and pricing figures."""
+    data = telemetry.get_telemetry()
+    
+    assert set(data) == {
+        "client", "rates", "batch_size", "export_seconds",
+        "send_metric_seconds", "wrapper_overhead_seconds", "pricing",
+    }
+    assert "queue_depth" in data["client"]
+    assert "enqueued_per_second" in data["rates"]
+    assert "age_seconds" in data["pricing"]
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    """Test that the local endpoint serves the text exposition format."""
+    server = telemetry.start_metrics_server(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        telemetry.stop_metrics_server()
+    
+    assert content_type.startswith("text/plain")
+    assert "# TYPE spend_hawk_queue_depth gauge" in body
+    assert 'spend_hawk_export_duration_seconds_bucket{le="+Inf"}' in body
+    assert "spend_hawk_send_metric_duration_seconds_count" in body
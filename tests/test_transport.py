@@ -0,0 +1,46 @@
+"""Tests for the shared HTTP transport."""
+import gzip
+import json
+from unittest.mock import patch, Mock
+
+from spend_hawk.transport import Transport, GZIP_MIN_BYTES
+from spend_hawk.config import config
+
+
+def test_session_is_reused():
+    """Test that the same pooled session serves every request."""
+    transport = Transport()
+    assert transport.session is transport.session
+    
+    adapter = transport.session.get_adapter("https://api.spendhawk.com")
+    assert adapter._pool_maxsize == config.pool_size
+    transport.close()
+
+
+def test_post_plain_json():
+    """Test that small bodies are sent as compact uncompressed JSON."""
+    transport = Transport()
+    
+    with patch.object(transport.session, 'post', return_value=Mock(status_code=200)) as mock_post:
+        with patch.object(config, 'api_endpoint', 'https://test.com'):
+            transport.post("/api/v1/metrics", {"model": "gpt-4"})
+    
+    url = mock_post.call_args[0][0]
+    kwargs = mock_post.call_args[1]
+    assert url == "https://test.com/api/v1/metrics"
+    assert json.loads(kwargs['data']) == {"model": "gpt-4"}
+    assert "Content-Encoding" not in kwargs['headers']
+
+
+def test_post_gzip_large_body():
+    """Test that large bodies are gzipped when enabled."""
+    transport = Transport()
+    payload = {"metrics": [{"model": "gpt-4"}] * (GZIP_MIN_BYTES // 10)}
+    
+    with patch.object(transport.session, 'post', return_value=Mock(status_code=200)) as mock_post:
+        with patch.object(config, 'gzip', True):
+            transport.post("/api/v1/metrics/batch", payload)
+    
+    kwargs = mock_post.call_args[1]
+    assert kwargs['headers']['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(kwargs['data'])) == payload